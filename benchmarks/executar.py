@@ -0,0 +1,220 @@
+"""
+Benchmark por etapa das importações sobre planilhas sintéticas.
+
+    python -m benchmarks.executar --linhas 1000 100000 --tipos tarifas receitas [--formato csv]
+
+Para cada tamanho e tipo mede separadamente:
+- leitura: interpretação e limpeza (leitor.ler_*), sem caches; como na
+  aplicação, a primeira leitura interpreta todas as abas da planilha;
+- busca_contas: resolução das contas (contas bancárias num $in, ou carga
+  do índice de vínculos de contas pagas);
+- processamento: _processar_df com as contas já em cache, ou seja, sem o
+  custo do banco;
+- escrita: geração do txt no layout do Domínio.
+O banco (--banco: mongomock, memoria ou sqlite) é semeado com todas as
+contas e parâmetros usados pelas planilhas sintéticas. O resultado sai em JSON (tela e arquivo) para
+comparar execuções antes e depois de uma otimização.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.gerar_planilhas import PASTA_DADOS, TAMANHOS_PADRAO, contas_bancarias, fornecedores, obter_planilha
+from src.db import conexao
+from src.db.repositorios import (VARIAVEL_BANCO, repositorio_contas_bancarias, repositorio_contas_pagas,
+                                 repositorio_parametros)
+from src.readers.cache_disco import cache_disco
+from src.readers.formatos import motor_csv
+from src.readers.cache_planilhas import cache_planilhas
+from src.services.pendencias import ResolvedorLote
+from src.services.pipeline import obter_importacao
+
+PASTA_RESULTADOS = os.path.join("benchmarks", "resultados")
+
+# Tipo -> (método de leitura do leitor, método do parâmetro, coluna com o número da conta)
+CENARIOS = {
+    "tarifas": ("ler_tarifas", "_obter_conta_tarifas", "CONTA"),
+    "receitas": ("ler_receitas", "_obter_conta_transitoria_recebimento", "C/C"),
+    "apropriacoes": ("ler_apropriacoes", None, None),
+    "contas_pagas": ("ler_contas_pagas", "_obter_conta_transitoria_pagamento", None),
+}
+
+
+def preparar_banco(banco: str = "mongomock"):
+    """
+    Banco dos benchmarks com os cadastros das planilhas sintéticas:
+    mongomock no lugar do MongoDB, o backend em memória ou um SQLite novo
+    em benchmarks/dados.
+    """
+    if banco == "mongomock":
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit("O banco mongomock precisa do pacote: pip install mongomock")
+        os.environ[VARIAVEL_BANCO] = "mongo"
+        conexao.definir_client(mongomock.MongoClient())
+    elif banco == "sqlite":
+        from src.db.conexao_sqlite import VARIAVEL_CAMINHO_SQLITE, fechar_conexao
+        caminho = os.path.join(PASTA_DADOS, "benchmark.sqlite3")
+        fechar_conexao()
+        for sufixo in ("", "-wal", "-shm"):
+            if os.path.exists(caminho + sufixo):
+                os.remove(caminho + sufixo)
+        os.environ[VARIAVEL_CAMINHO_SQLITE] = caminho
+        os.environ[VARIAVEL_BANCO] = "sqlite"
+    else:
+        from src.db.repositorios_memoria import limpar_memoria
+        limpar_memoria()
+        os.environ[VARIAVEL_BANCO] = "memoria"
+
+    from src.db.interfaces import normalizar_texto
+    from src.services.indice_contas_pagas import montar_assinatura
+
+    parametros = repositorio_parametros()
+    for chave, valor in [("conta_tarifas_bancarias", "500"),
+                         ("conta_transitoria_recebimento", "600"),
+                         ("conta_transitoria_pagamento", "700")]:
+        parametros.definir_parametro(chave, valor)
+
+    repositorio_contas_bancarias().definir_muitas_contas_bancarias(
+        {numero: str(100 + i) for i, numero in enumerate(contas_bancarias())})
+
+    # Um vínculo padrão (sem tokens) por fornecedor
+    repositorio_contas_pagas().definir_muitas({
+        montar_assinatura(normalizar_texto(fornecedor), []): {
+            "conta_despesa": str(3000 + i),
+            "fornecedor_norm": normalizar_texto(fornecedor),
+            "tokens": [],
+            "origem": "benchmark",
+        }
+        for i, fornecedor in enumerate(fornecedores())
+    })
+
+
+def medir(tipo: str, caminho_planilha: str, caminho_saida: str) -> dict:
+    metodo_leitura, metodo_parametro, coluna_conta = CENARIOS[tipo]
+    classe_processador, _, classe_escritor, _ = obter_importacao(tipo)
+
+    processador = classe_processador(caminho_planilha, ResolvedorLote())
+    cache_planilhas.limpar()
+    etapas = {}
+
+    with _cronometro(etapas, "leitura"):
+        df = getattr(processador.leitor, metodo_leitura)()
+
+    argumentos = [df]
+    if metodo_parametro:
+        argumentos.append(getattr(processador, metodo_parametro)())
+
+    with _cronometro(etapas, "busca_contas"):
+        if coluna_conta:
+            processador._mesclar_contas_bancarias(pd.DataFrame({"numero_conta": df[coluna_conta]}))
+        elif tipo == "contas_pagas":
+            processador.indice.carregar()
+
+    with _cronometro(etapas, "processamento"):
+        resultado = processador._processar_df(*argumentos)
+        processador.confirmar()
+
+    if os.path.exists(caminho_saida):
+        os.remove(caminho_saida)
+    with _cronometro(etapas, "escrita"):
+        linhas_gravadas = classe_escritor().salvar_txt(resultado, caminho_saida)
+
+    return {"linhas_lidas": len(df), "linhas_gravadas": linhas_gravadas, "etapas": etapas}
+
+
+def executar(tamanhos, tipos, repeticoes: int = 1, semente: int = 0, banco: str = "mongomock",
+             formato: str = "xlsx") -> dict:
+    # Os caches de planilha esconderiam o custo da leitura
+    cache_disco.ativo = False
+    preparar_banco(banco)
+
+    resultados = []
+    for linhas in tamanhos:
+        for tipo in tipos:
+            # Em CSV cada aba é um arquivo, com os mesmos dados da planilha
+            caminho_planilha = obter_planilha(linhas, semente, formato, tipo)
+            caminho_saida = os.path.join(PASTA_RESULTADOS, f"saida_{tipo}.txt")
+            os.makedirs(PASTA_RESULTADOS, exist_ok=True)
+
+            medicoes = []
+            for _ in range(repeticoes):
+                # Os leitores exibem o início da aba; não interessa aqui
+                with contextlib.redirect_stdout(io.StringIO()):
+                    medicoes.append(medir(tipo, caminho_planilha, caminho_saida))
+            os.remove(caminho_saida)
+
+            # Melhor tempo de cada etapa entre as repetições
+            etapas = {etapa: min(m["etapas"][etapa] for m in medicoes) for etapa in medicoes[0]["etapas"]}
+            total = sum(etapas.values())
+            resultados.append({
+                "linhas": linhas,
+                "tipo": tipo,
+                "linhas_lidas": medicoes[0]["linhas_lidas"],
+                "linhas_gravadas": medicoes[0]["linhas_gravadas"],
+                "etapas": {etapa: round(segundos, 4) for etapa, segundos in etapas.items()},
+                "total": round(total, 4),
+                "linhas_por_segundo": round(linhas / total) if total else None,
+            })
+
+    return {"ambiente": _ambiente(), "banco": banco, "formato": formato,
+            "motor_csv": motor_csv() if formato == "csv" else None, "repeticoes": repeticoes,
+            "resultados": resultados}
+
+
+@contextlib.contextmanager
+def _cronometro(etapas, nome):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        etapas[nome] = time.perf_counter() - inicio
+
+
+def _ambiente():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "nucleos": os.cpu_count(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark por etapa das importações.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=list(TAMANHOS_PADRAO))
+    parser.add_argument("--tipos", nargs="+", choices=list(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--banco", choices=["mongomock", "memoria", "sqlite"], default="mongomock")
+    parser.add_argument("--formato", choices=["xlsx", "csv"], default="xlsx",
+                        help="Formato da entrada: a planilha ou um CSV por aba.")
+    parser.add_argument("--saida", help="Arquivo JSON do resultado (padrão: benchmarks/resultados/<data>.json).")
+    args = parser.parse_args()
+
+    relatorio = executar(args.linhas, args.tipos, args.repeticoes, args.semente, args.banco, args.formato)
+
+    caminho = args.saida or os.path.join(PASTA_RESULTADOS, datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+    print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+    print(f"\nResultado gravado em '{caminho}'.", file=sys.stderr)
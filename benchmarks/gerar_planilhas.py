@@ -0,0 +1,163 @@
+"""
+Gera planilhas sintéticas com o mesmo layout da planilha modelo, para os
+benchmarks. Cada aba recebe `linhas` linhas de dados.
+
+    python -m benchmarks.gerar_planilhas --linhas 1000 100000 1000000 [--formato csv]
+
+Em CSV, cada aba vira um arquivo (separador ;, vírgula decimal, cp1252,
+como o Excel em português salva) com os mesmos dados da planilha.
+"""
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+from openpyxl import Workbook
+
+PASTA_DADOS = os.path.join("benchmarks", "dados")
+
+# Quantidades de linhas usadas por padrão nos benchmarks
+TAMANHOS_PADRAO = (1_000, 100_000, 1_000_000)
+
+# Aba -> tipo de importação, que dá nome ao CSV da aba
+TIPOS_ABAS = {
+    "Tarifas bancárias": "tarifas",
+    "Receitas": "receitas",
+    "Apropriação": "apropriacoes",
+    "Contas pagas": "contas_pagas",
+}
+
+QUANTIDADE_CONTAS = 200
+QUANTIDADE_FORNECEDORES = 300
+
+EMPRESA = "GRUPO XYZ"
+BANCOS = ["BB", "CEF", "ITAU", "BRADESCO", "SANTANDER"]
+SERVICOS = [
+    "Conta de energia", "FGTS competência", "Aluguel sala", "Internet fibra",
+    "Honorários contábeis", "Material de escritório", "Manutenção predial",
+]
+
+
+def contas_bancarias() -> list[str]:
+    """Números de conta usados nas abas, no formato '1234-5'."""
+    return [f"{1000 + i}-{i % 10}" for i in range(QUANTIDADE_CONTAS)]
+
+
+def fornecedores() -> list[str]:
+    return [f"Fornecedor {i:03d} Ltda" for i in range(QUANTIDADE_FORNECEDORES)]
+
+
+def caminho_planilha(linhas: int, semente: int = 0, formato: str = "xlsx", tipo: str = None) -> str:
+    if formato == "csv":
+        return os.path.join(PASTA_DADOS, f"planilha_{linhas}_{semente}_{tipo}.csv")
+    return os.path.join(PASTA_DADOS, f"planilha_{linhas}_{semente}.xlsx")
+
+
+def gerar_abas(linhas: int, semente: int = 0):
+    """
+    (nome da aba, gerador de linhas) de cada aba, na ordem da planilha. Os
+    geradores compartilham o sorteio e devem ser consumidos nessa ordem.
+    A aba 'Tarifas bancárias' reproduz o título na primeira linha e os nomes
+    das colunas na segunda, como na planilha real.
+    """
+    aleatorio = random.Random(semente)
+    contas = contas_bancarias()
+    nomes_fornecedores = fornecedores()
+    inicio = datetime(2025, 9, 1)
+
+    def data():
+        return inicio + timedelta(days=aleatorio.randrange(30))
+
+    def valor():
+        return round(aleatorio.uniform(1, 5000), 2)
+
+    def tarifas():
+        yield ["TARIFAS BANCARIAS"]
+        yield ["EMPRESA", "BANCO", "AGENCIA", "CONTA", "DATA", "VALOR", "DESCRIÇÃO"]
+        for _ in range(linhas):
+            banco = aleatorio.choice(BANCOS)
+            yield [EMPRESA, banco, aleatorio.randrange(1000, 9999), aleatorio.choice(contas),
+                   data(), valor(), f"TARIFA - {banco}"]
+
+    def receitas():
+        yield ["DATA PAGAMENTO", "VALOR PAGO", "C/C", "EMPRESA", "CLIENTE", "MÊS FATURAMENTO",
+               "BRUTO", " LIQUIDO", "NF", "EMISSÃO NF"]
+        for i in range(linhas):
+            yield [data(), valor(), aleatorio.choice(contas), EMPRESA,
+                   f"CLIENTE {aleatorio.randrange(500):03d} LTDA", None, None, None, i + 1, None]
+
+    def apropriacoes():
+        yield ["DATA", "DEBITO", "CREDITO", "VALOR", "CD HIST", "HIST", "LOTE"]
+        for i in range(linhas):
+            yield [data(), aleatorio.randrange(10000, 49999), aleatorio.randrange(10000, 49999),
+                   valor(), 253, f"APROP. CONF NF {i + 1} FORNECEDOR {aleatorio.randrange(100)}", None]
+
+    def contas_pagas():
+        yield ["EMPRESA", "FORNECEDOR", "DESCRIÇÃO DO SERVICO", "VALOR PAGO", "DATA MOVIMENTO",
+               "CONTA DE DÉBITO", "DOCUMENTO"]
+        for i in range(linhas):
+            yield [EMPRESA, aleatorio.choice(nomes_fornecedores), aleatorio.choice(SERVICOS),
+                   valor(), data(), None, i + 1]
+
+    return [("Tarifas bancárias", tarifas()), ("Receitas", receitas()),
+            ("Apropriação", apropriacoes()), ("Contas pagas", contas_pagas())]
+
+
+def gerar_planilha(caminho: str, linhas: int, semente: int = 0):
+    """Grava a planilha em modo write_only (linha a linha, memória constante)."""
+    planilha = Workbook(write_only=True)
+    for nome, linhas_aba in gerar_abas(linhas, semente):
+        aba = planilha.create_sheet(nome)
+        for linha in linhas_aba:
+            aba.append(linha)
+
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    planilha.save(caminho)
+
+
+def gerar_csvs(linhas: int, semente: int = 0):
+    """Um CSV por aba, com os mesmos dados de gerar_planilha."""
+    os.makedirs(PASTA_DADOS, exist_ok=True)
+    for nome, linhas_aba in gerar_abas(linhas, semente):
+        caminho = caminho_planilha(linhas, semente, "csv", TIPOS_ABAS[nome])
+        with open(caminho, "w", encoding="cp1252", newline="") as arquivo:
+            escritor = csv.writer(arquivo, delimiter=";")
+            for linha in linhas_aba:
+                escritor.writerow([_texto_csv(valor) for valor in linha])
+
+
+def _texto_csv(valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return valor.strftime("%d/%m/%Y")
+    if isinstance(valor, float):
+        return f"{valor:.2f}".replace(".", ",")
+    return str(valor)
+
+
+def obter_planilha(linhas: int, semente: int = 0, formato: str = "xlsx", tipo: str = None) -> str:
+    """Caminho da planilha sintética (ou do CSV da aba do tipo), gerando-a só se ainda não existir."""
+    caminho = caminho_planilha(linhas, semente, formato, tipo)
+    if not os.path.exists(caminho):
+        if formato == "csv":
+            gerar_csvs(linhas, semente)
+        else:
+            gerar_planilha(caminho, linhas, semente)
+    return caminho
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera planilhas sintéticas para os benchmarks.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=list(TAMANHOS_PADRAO))
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--formato", choices=["xlsx", "csv"], default="xlsx")
+    args = parser.parse_args()
+
+    for linhas in args.linhas:
+        if args.formato == "csv":
+            for tipo in TIPOS_ABAS.values():
+                print(obter_planilha(linhas, args.semente, "csv", tipo))
+        else:
+            print(obter_planilha(linhas, args.semente))
@@ -0,0 +1,64 @@
+"""
+Orçamento de tempo de inicialização: quanto custa importar o main.py (o
+que toda execução do menu, da linha de comando e cada processo de
+importação paralela paga antes de fazer qualquer coisa).
+
+    python -m benchmarks.inicializacao --orcamento-ms 150
+
+Roda `python -X importtime -c "import main"` em processos novos, pega o
+tempo acumulado do módulo main (mediana das repetições) e confere que
+nenhum módulo pesado (pandas, numpy, openpyxl, pymongo) foi importado.
+Sai com código 1 se o orçamento estourar, para uso em CI; --detalhar
+mostra os módulos mais caros.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ORCAMENTO_MS_PADRAO = 150
+
+# Só podem ser importados quando a opção escolhida precisar deles
+MODULOS_PESADOS = ("pandas", "numpy", "openpyxl", "pymongo", "bson")
+
+
+def medir_importacao(modulo: str = "main") -> dict:
+    """Tempos (µs) de cada módulo importado por `import modulo` num processo novo."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                              capture_output=True, text=True, cwd=raiz, check=True)
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, acumulado, nome = linha.split("|")
+        if acumulado.strip().isdigit():
+            tempos[nome.strip()] = int(acumulado)
+    return tempos
+
+
+def verificar(orcamento_ms: float, repeticoes: int = 5, detalhar: int = 0) -> bool:
+    medicoes = [medir_importacao() for _ in range(repeticoes)]
+    total_ms = statistics.median(tempos["main"] for tempos in medicoes) / 1000
+    pesados = sorted({nome for nome in medicoes[0] if nome.split(".")[0] in MODULOS_PESADOS})
+
+    print(f"import main: {total_ms:.1f} ms (mediana de {repeticoes}; orçamento {orcamento_ms} ms)")
+    if detalhar:
+        for nome, micros in sorted(medicoes[-1].items(), key=lambda item: -item[1])[1:detalhar + 1]:
+            print(f"  {micros / 1000:8.1f} ms  {nome}")
+    if pesados:
+        print(f"Módulos pesados importados na inicialização: {', '.join(pesados)}")
+
+    return total_ms <= orcamento_ms and not pesados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confere o tempo de inicialização do main.py.")
+    parser.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_MS_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--detalhar", type=int, default=0, metavar="N",
+                        help="Mostra os N módulos com maior tempo acumulado.")
+    args = parser.parse_args()
+
+    sys.exit(0 if verificar(args.orcamento_ms, args.repeticoes, args.detalhar) else 1)
@@ -0,0 +1,115 @@
+"""
+Memória dos lançamentos entregues pelos processadores aos escritores:
+um dict por linha (to_dict("records"), como era) contra os registros
+tipados de src/models/lancamentos.py.
+
+    python -m benchmarks.memoria_lancamentos --linhas 100000 1000000
+
+Para cada tamanho e tipo monta o DataFrame que o processador produziria
+(mesmas colunas e tipos) e mede com tracemalloc o pico de memória alocada
+para converter o DataFrame em lançamentos em cada formato, e quanto fica
+retido pela lista pronta (o que o pipeline carrega por bloco). O DataFrame
+é criado antes da medição, então só entra o custo dos lançamentos.
+"""
+import argparse
+import gc
+import json
+import os
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.models.lancamentos import (LancamentoApropriacao, LancamentoContaPaga, LancamentoReceita,
+                                    LancamentoTarifa, registros)
+
+PASTA_RESULTADOS = os.path.join("benchmarks", "resultados")
+TAMANHOS_PADRAO = [100_000, 1_000_000]
+
+TIPOS = {
+    "tarifas": LancamentoTarifa,
+    "receitas": LancamentoReceita,
+    "apropriacoes": LancamentoApropriacao,
+    "contas_pagas": LancamentoContaPaga,
+}
+
+
+def _coluna(campo: str, linhas: int, gerador):
+    # Valores com a cara dos que os processadores produzem
+    if campo == "data":
+        return pd.Timestamp("2024-01-01") + pd.to_timedelta(gerador.integers(0, 365, linhas), unit="D")
+    if campo == "valor":
+        return gerador.integers(1, 1_000_000, linhas) / 100
+    if campo == "impressao":
+        return gerador.integers(0, 2**63 - 1, linhas, dtype=np.int64)
+    if campo in ("numero_conta", "documento", "nf", "cd_historico"):
+        return [str(numero) for numero in gerador.integers(1, 100_000, linhas)]
+    if campo in ("fornecedor", "cliente", "descricao", "historico"):
+        return [f"{campo.upper()} {numero}" for numero in gerador.integers(1, 5_000, linhas)]
+    # Contas contábeis: poucos valores distintos, como na prática
+    return [str(1000 + numero) for numero in gerador.integers(0, 50, linhas)]
+
+
+def montar_df(tipo, linhas: int) -> pd.DataFrame:
+    gerador = np.random.default_rng(42)
+    return pd.DataFrame({campo: _coluna(campo, linhas, gerador) for campo in tipo._fields})
+
+
+def _medir_conversao(funcao, df) -> tuple[int, int, int]:
+    """Memória retida e pico (bytes) de funcao(df), e o número de lançamentos."""
+    gc.collect()
+    tracemalloc.start()
+    lancamentos = funcao(df)
+    gc.collect()
+    retida, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    quantidade = len(lancamentos)
+    del lancamentos
+    return retida, pico, quantidade
+
+
+def _mb(tamanho: int) -> float:
+    return round(tamanho / 2**20, 1)
+
+
+def medir(linhas: int, tipos) -> dict:
+    resultado = {}
+    for nome in tipos:
+        tipo = TIPOS[nome]
+        df = montar_df(tipo, linhas)
+        retida_dicts, pico_dicts, _ = _medir_conversao(lambda df: df.to_dict("records"), df)
+        retida_registros, pico_registros, quantidade = _medir_conversao(lambda df: registros(tipo, df), df)
+        resultado[nome] = {
+            "lancamentos": quantidade,
+            "campos": len(tipo._fields),
+            "dicts": {"retida_mb": _mb(retida_dicts), "pico_mb": _mb(pico_dicts)},
+            "registros": {"retida_mb": _mb(retida_registros), "pico_mb": _mb(pico_registros)},
+            "reducao_retida": round(1 - retida_registros / retida_dicts, 3),
+        }
+        del df
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara a memória dos lançamentos em dicts e em registros.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=TAMANHOS_PADRAO)
+    parser.add_argument("--tipos", nargs="+", choices=list(TIPOS), default=list(TIPOS))
+    parser.add_argument("--saida", help="arquivo JSON do resultado (padrão: benchmarks/resultados/)")
+    args = parser.parse_args()
+
+    relatorio = {str(linhas): medir(linhas, args.tipos) for linhas in args.linhas}
+
+    for linhas, tipos in relatorio.items():
+        for nome, medida in tipos.items():
+            dicts, tuplas = medida["dicts"], medida["registros"]
+            print(f"{int(linhas):>9} {nome:<13} dicts {dicts['retida_mb']:>7.1f} MB (pico {dicts['pico_mb']:>7.1f}) | "
+                  f"registros {tuplas['retida_mb']:>7.1f} MB (pico {tuplas['pico_mb']:>7.1f}) | "
+                  f"-{medida['reducao_retida']:.0%}")
+
+    caminho = args.saida or os.path.join(
+        PASTA_RESULTADOS, "memoria_lancamentos_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultado salvo em {caminho}")
@@ -0,0 +1,43 @@
+"""
+Confere, com explain(), que as consultas quentes dos repositórios
+(CONSULTAS_CRITICAS em src/db/indices.py) usam índice no MongoDB.
+
+    python -m benchmarks.planos
+
+Reconcilia os índices antes (como a primeira consulta de um repositório
+faria) e lista o plano vencedor de cada consulta. Sai com código 1 se
+alguma varrer a coleção, para uso em CI. Precisa de um MongoDB de verdade:
+o mongomock não tem planos de execução.
+"""
+import argparse
+import sys
+
+from src.db.base_repositorio import NOME_BANCO
+from src.db.conexao import MONGO_URI
+
+
+def verificar(uri: str = MONGO_URI, banco: str = NOME_BANCO) -> bool:
+    from pymongo import MongoClient
+
+    from src.db.indices import reconciliar_indices, verificar_planos
+
+    db = MongoClient(uri)[banco]
+    reconciliar_indices(db)
+    planos = verificar_planos(db)
+    for plano in planos:
+        situacao = "ok" if plano["usa_indice"] else "VARREDURA"
+        print(f"{situacao:<10} {plano['colecao']:<17} {plano['filtro']}  ({' <- '.join(plano['estagios'])})")
+
+    sem_indice = [plano for plano in planos if not plano["usa_indice"]]
+    if sem_indice:
+        print(f"{len(sem_indice)} consulta(s) sem índice")
+    return not sem_indice
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confere os planos das consultas críticas no MongoDB.")
+    parser.add_argument("--uri", default=MONGO_URI)
+    parser.add_argument("--banco", default=NOME_BANCO)
+    args = parser.parse_args()
+
+    sys.exit(0 if verificar(args.uri, args.banco) else 1)
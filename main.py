@@ -1,77 +1,71 @@
-from src.services.processador_tarifas import ProcessadorTarifas
-from src.services.processador_receitas import ProcessadorReceitas
-from src.services.processador_apropriacoes import ProcessadorApropriacoes
-from src.writers.lancamentos_contabeis_tarifas import LancamentosContabeisTarifas
-from src.writers.lancamentos_contabeis_receitas import LancamentosContabeisReceitas
-from src.writers.lancamentos_contabeis_apropriacoes import LancamentosContabeisApropriacoes
-from src.menus.menu_contas_bancarias import MenuContasBancarias
+import argparse
+import json
+import os
+import sys
 
+# Só módulos leves no topo: pandas, openpyxl e pymongo são importados
+# dentro das opções que precisam deles (ver benchmarks/inicializacao.py)
+from src.services.pipeline import IMPORTACOES
+from src.readers.cache_disco import VARIAVEL_SEM_CACHE
+from src.instrumentacao import VARIAVEL_INSTRUMENTACAO, instrumentacao
+from src.db.repositorios import BACKENDS, VARIAVEL_BANCO
+from src.models.lancamentos import COLUNAS_CONSOLIDAVEIS
 
-# === TARIFAS ===
-def importar_tarifas():
-    print("\n=== Importação de Tarifas Bancárias ===")
-
-    processador = ProcessadorTarifas("data/input/MODELO DE PLANILHA.xlsx")
-    tarifas_processadas = processador.processar_tarifas()
 
-    print("\n=== Resultado do processamento ===")
-    for tarifa in tarifas_processadas:
-        print(tarifa)
+PLANILHA_MODELO = "data/input/MODELO DE PLANILHA.xlsx"
 
-    print("\n=== Gerando arquivo de lançamentos contábeis ===")
 
-    escritor = LancamentosContabeisTarifas()
-    escritor.salvar_txt(
-        tarifas_processadas,
-        "data/output/lancamentos_contabeis_tarifas.txt"
-    )
+def importar_em_fluxo(tipo, titulo):
+    """
+    Processa e grava em fluxo: cada lançamento é exibido e enviado ao
+    escritor assim que produzido, sem montar a lista completa antes.
+    Linhas da planilha que já foram exportadas não são lançadas de novo.
+    """
+    from src.services.controle_exportacao import ControleExportacao
+    from src.services.pipeline import importar
 
-    print("\nArquivo 'lancamentos_contabeis_tarifas.txt' gerado com sucesso.")
+    print(f"\n=== Importação de {titulo} ===")
 
+    caminho_saida = IMPORTACOES[tipo][3]
+    controle = ControleExportacao(nome_cliente(PLANILHA_MODELO), tipo)
 
-# === RECEITAS ===
-def importar_receitas():
-    print("\n=== Importação de Receitas ===")
-
-    processador = ProcessadorReceitas("data/input/MODELO DE PLANILHA.xlsx")
-    receitas_processadas = processador.processar_receitas()
+    print("\n=== Processando e gerando arquivo de lançamentos contábeis ===")
+    total = importar(tipo, PLANILHA_MODELO, caminho_saida, ao_lancar=print,
+                     controle_exportacao=controle)
+    controle.confirmar()
 
-    print("\n=== Resultado do processamento ===")
-    for receita in receitas_processadas:
-        print(receita)
+    if instrumentacao.ativo:
+        instrumentacao.exibir()
+        instrumentacao.reiniciar()
 
-    print("\n=== Gerando arquivo de lançamentos contábeis ===")
+    if controle.ignoradas:
+        print(f"\n{controle.ignoradas} linha(s) já exportada(s) anteriormente foram ignoradas.")
+    print(f"\nArquivo '{os.path.basename(caminho_saida)}' gerado com sucesso ({total} lançamentos).")
 
-    escritor = LancamentosContabeisReceitas()
-    escritor.salvar_txt(
-        receitas_processadas,
-        "data/output/lancamentos_contabeis_receitas.txt"
-    )
 
-    print("\nArquivo 'lancamentos_contabeis_receitas.txt' gerado com sucesso.")
+def nome_cliente(caminho_planilha):
+    """Cliente do controle de exportação: o nome da planilha, sem extensão."""
+    return os.path.splitext(os.path.basename(caminho_planilha))[0]
 
-# === APROPRIAÇÕES ===
 
+# === TARIFAS ===
+def importar_tarifas():
+    importar_em_fluxo("tarifas", "Tarifas Bancárias")
 
-def importar_apropriacoes():
-    print("\n=== Importação de Apropriações ===")
 
-    processador = ProcessadorApropriacoes("data/input/MODELO DE PLANILHA.xlsx")
-    apropriacoes_processadas = processador.processar_apropriacoes()
+# === RECEITAS ===
+def importar_receitas():
+    importar_em_fluxo("receitas", "Receitas")
 
-    print("\n=== Resultado do processamento ===")
-    for apropriacao in apropriacoes_processadas:
-        print(apropriacao)
 
-    print("\n=== Gerando arquivo de lançamentos contábeis ===")
+# === APROPRIAÇÕES ===
+def importar_apropriacoes():
+    importar_em_fluxo("apropriacoes", "Apropriações")
 
-    escritor = LancamentosContabeisApropriacoes()
-    escritor.salvar_txt(
-        apropriacoes_processadas,
-        "data/output/lancamentos_contabeis_apropriacoes.txt"
-    )
 
-    print("\nArquivo 'lancamentos_contabeis_apropriacoes.txt' gerado com sucesso.")
+# === CONTAS PAGAS ===
+def importar_contas_pagas():
+    importar_em_fluxo("contas_pagas", "Contas Pagas")
 
 
 # === MENU PRINCIPAL ===
@@ -81,8 +75,9 @@ def main():
         print("1. Importar Tarifas Bancárias")
         print("2. Importar Receitas")
         print("3. Importar Apropriações")
-        print("4. Gerenciar Contas Bancárias")
-        print("5. Sair")
+        print("4. Importar Contas Pagas")
+        print("5. Gerenciar Contas Bancárias")
+        print("6. Sair")
 
         opcao = input("Escolha uma opção: ")
 
@@ -93,14 +88,170 @@ def main():
         elif opcao == '3':
             importar_apropriacoes()
         elif opcao == '4':
+            importar_contas_pagas()
+        elif opcao == '5':
+            from src.menus.menu_contas_bancarias import MenuContasBancarias
             menu = MenuContasBancarias()
             menu.exibir_menu()
-        elif opcao == '5':
+        elif opcao == '6':
             print("Saindo do sistema...")
             break
         else:
             print("Opção inválida. Tente novamente.")
 
 
+# === LINHA DE COMANDO (sem usuário) ===
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Conversor de planilhas para o Domínio Sistemas.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    parser_importar = subcomandos.add_parser(
+        "importar", help="Importa uma aba sem perguntas; o que faltar vai para o relatório de pendências.")
+    parser_importar.add_argument("--tipo", required=True, choices=list(IMPORTACOES))
+    parser_importar.add_argument("--entrada", default=PLANILHA_MODELO, help="Planilha de entrada.")
+    parser_importar.add_argument("--saida", help="Arquivo txt de saída (padrão: data/output/...).")
+    parser_importar.add_argument("--pendencias", help="Relatório JSON de pendências (padrão: <saida>.pendencias.json).")
+    parser_importar.add_argument("--parcial", action="store_true",
+                                 help="Grava a saída mesmo com pendências, sem as linhas pendentes.")
+    parser_importar.add_argument("--contas-bancarias", help="CSV (numero_conta;conta_contabil_banco) carregado antes da importação.")
+    parser_importar.add_argument("--parametros", help="CSV (chave;valor) carregado antes da importação.")
+    parser_importar.add_argument("--cliente", help="Cliente no controle de exportação (padrão: nome da planilha).")
+    parser_importar.add_argument("--banco", choices=list(BACKENDS),
+                                 help="Backend dos cadastros (padrão: CONVERSOR_BANCO ou mongo).")
+    parser_importar.add_argument("--instrumentar", nargs="?", const="", metavar="RELATORIO_JSON",
+                                 help="Mede tempos, linhas e chamadas por etapa; exibe e, se informado, grava em JSON.")
+    parser_importar.add_argument("--memoria", action="store_true",
+                                 help="Com --instrumentar, mede também o pico de memória (tracemalloc; mais lento).")
+    parser_importar.add_argument("--sem-cache", action="store_true",
+                                 help="Interpreta a planilha de novo, sem usar o cache em disco das abas.")
+    parser_importar.add_argument("--reexportar", action="store_true",
+                                 help="Exporta todas as linhas, sem consultar nem registrar o controle de exportação.")
+    parser_importar.add_argument("--consolidar", nargs="*", choices=COLUNAS_CONSOLIDAVEIS, metavar="COLUNA",
+                                 help="Soma os lançamentos por data, débito e crédito (e pelas colunas informadas, "
+                                      "ex.: nf cliente) antes de gravar.")
+    parser_lote = subcomandos.add_parser(
+        "importar-lote", help="Importa várias planilhas (pasta ou glob) em paralelo, uma por processo.")
+    parser_lote.add_argument("--origem", required=True, help="Pasta com as planilhas ou padrão glob.")
+    parser_lote.add_argument("--saida-dir", default="data/output", help="Pasta base; cada planilha ganha uma subpasta.")
+    parser_lote.add_argument("--tipos", nargs="+", choices=list(IMPORTACOES),
+                             default=["tarifas", "receitas", "apropriacoes"])
+    parser_lote.add_argument("--processos", type=int, help="Quantidade de processos (padrão: núcleos da máquina).")
+    parser_lote.add_argument("--parcial", action="store_true",
+                             help="Grava a saída mesmo com pendências, sem as linhas pendentes.")
+    parser_lote.add_argument("--resumo", help="Grava o resumo por planilha em JSON.")
+    parser_lote.add_argument("--banco", choices=list(BACKENDS),
+                             help="Backend dos cadastros (padrão: CONVERSOR_BANCO ou mongo).")
+    parser_lote.add_argument("--instrumentar", nargs="?", const="", metavar="RELATORIO_JSON",
+                             help="Mede tempos, linhas e chamadas por etapa em cada planilha (vai também no --resumo).")
+    parser_lote.add_argument("--memoria", action="store_true",
+                             help="Com --instrumentar, mede também o pico de memória (tracemalloc; mais lento).")
+    parser_lote.add_argument("--sem-cache", action="store_true",
+                             help="Interpreta as planilhas de novo, sem usar o cache em disco das abas.")
+    parser_lote.add_argument("--reexportar", action="store_true",
+                             help="Exporta todas as linhas, sem consultar nem registrar o controle de exportação.")
+    parser_lote.add_argument("--consolidar", nargs="*", choices=COLUNAS_CONSOLIDAVEIS, metavar="COLUNA",
+                             help="Soma os lançamentos por data, débito e crédito (e pelas colunas informadas "
+                                  "que o tipo tiver) antes de gravar.")
+    return parser
+
+
+def executar_importacao_lote(args) -> int:
+    """Retorna 0 se tudo foi gravado, 2 com pendências e 1 com falhas."""
+    from src.services.importacao_paralela import importar_em_paralelo
+
+    def exibir(resumo):
+        if resumo.get("erro"):
+            print(f"[FALHA] {resumo['planilha']}: {resumo['erro']}")
+            return
+        for tipo, resultado in resumo["tipos"].items():
+            situacao = "FALHA" if resultado["erro"] else "PENDENTE" if resultado["pendente"] else "OK"
+            detalhe = f" - {resultado['erro']}" if resultado["erro"] else ""
+            print(f"[{situacao}] {resumo['cliente']} / {tipo}: {resultado['linhas']} linhas "
+                  f"({resultado['ja_exportadas']} já exportadas) em {resultado['segundos']}s{detalhe}")
+
+    resumos = importar_em_paralelo(args.origem, args.saida_dir, args.tipos, args.processos,
+                                   args.parcial, not args.reexportar, args.consolidar, ao_concluir=exibir)
+    if not resumos:
+        print(f"Nenhuma planilha encontrada em '{args.origem}'.")
+        return 1
+
+    resultados = [r for resumo in resumos for r in resumo["tipos"].values()]
+    falhas = sum(1 for resumo in resumos if resumo.get("erro")) + sum(1 for r in resultados if r["erro"])
+    pendentes = sum(1 for r in resultados if r["pendente"])
+
+    print(f"\nPlanilhas: {len(resumos)} | Linhas: {sum(r['linhas'] for r in resumos)} | "
+          f"Pendentes: {pendentes} | Falhas: {falhas}")
+
+    if args.resumo:
+        with open(args.resumo, "w", encoding="utf-8") as arquivo:
+            json.dump(resumos, arquivo, ensure_ascii=False, indent=2)
+    if args.instrumentar:
+        with open(args.instrumentar, "w", encoding="utf-8") as arquivo:
+            json.dump({resumo["planilha"]: resumo.get("instrumentacao") for resumo in resumos},
+                      arquivo, ensure_ascii=False, indent=2)
+
+    return 1 if falhas else 2 if pendentes else 0
+
+
+def executar_linha_de_comando(argumentos) -> int:
+    """Retorna o código de saída: 0 sem pendências, 2 com pendências."""
+    from src.services.carga_cadastros import carregar_contas_bancarias, carregar_parametros
+    from src.services.pipeline import importar_em_lote
+
+    args = criar_parser().parse_args(argumentos)
+
+    if args.sem_cache:
+        # Pela variável de ambiente o desvio vale também para os processos filhos
+        os.environ[VARIAVEL_SEM_CACHE] = "1"
+    if args.banco:
+        os.environ[VARIAVEL_BANCO] = args.banco
+    if args.instrumentar is not None:
+        os.environ[VARIAVEL_INSTRUMENTACAO] = "1"
+        instrumentacao.ativar(memoria=args.memoria)
+
+    if args.comando == "importar-lote":
+        return executar_importacao_lote(args)
+
+    if args.contas_bancarias:
+        print(f"Contas bancárias carregadas: {carregar_contas_bancarias(args.contas_bancarias)}")
+    if args.parametros:
+        print(f"Parâmetros carregados: {carregar_parametros(args.parametros)}")
+
+    caminho_saida = args.saida or IMPORTACOES[args.tipo][3]
+    caminho_relatorio = args.pendencias or caminho_saida + ".pendencias.json"
+
+    cliente = None if args.reexportar else args.cliente or nome_cliente(args.entrada)
+
+    resumo = importar_em_lote(args.tipo, args.entrada, caminho_saida, caminho_relatorio, args.parcial,
+                              cliente=cliente, consolidar=args.consolidar)
+
+    if instrumentacao.ativo:
+        instrumentacao.exibir()
+        if args.instrumentar:
+            instrumentacao.salvar(args.instrumentar)
+
+    if resumo["ja_exportadas"]:
+        print(f"{resumo['ja_exportadas']} linha(s) já exportada(s) para '{cliente}' foram ignoradas.")
+    if resumo["gravado"]:
+        print(f"Arquivo '{caminho_saida}' gerado com {resumo['linhas']} lançamentos.")
+        if resumo["consolidacao"]:
+            consolidacao = resumo["consolidacao"]
+            print(f"Consolidados {consolidacao['linhas_origem']} lançamentos em {consolidacao['linhas']} "
+                  f"(total {consolidacao['total']:.2f}, igual ao de origem).")
+    if resumo["pendencias"]:
+        pendencias = resumo["pendencias"]
+        print(f"Pendências: {len(pendencias['parametros'])} parâmetro(s), "
+              f"{len(pendencias['contas_bancarias'])} conta(s) bancária(s), "
+              f"{len(pendencias['vinculos_contas_pagas'])} vínculo(s) de contas pagas, "
+              f"{pendencias['linhas_descartadas']} linha(s) sem conta.")
+        print(f"Pendências gravadas em '{caminho_relatorio}'.")
+        if not resumo["gravado"]:
+            print("Nenhuma linha gravada; use --parcial para gerar a saída sem as linhas pendentes.")
+        return 2
+    return 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(executar_linha_de_comando(sys.argv[1:]))
     main()
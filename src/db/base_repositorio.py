@@ -0,0 +1,33 @@
+from src.db.conexao import obter_client
+from src.db.indices import garantir_indices
+
+NOME_BANCO = "contabilidade"
+
+
+class BaseRepositorioMongo:
+    """
+    Base dos repositórios do MongoDB. A conexão só é aberta, e os índices
+    conferidos, na primeira consulta: criar um repositório (ex.: no
+    construtor dos processadores) não acessa o banco.
+    """
+
+    # Nome da coleção do repositório
+    colecao = None
+
+    _collection = None
+
+    @property
+    def client(self):
+        return obter_client()
+
+    @property
+    def db(self):
+        return self.client[NOME_BANCO]
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            db = self.db
+            garantir_indices(db)
+            self._collection = db[self.colecao]
+        return self._collection
@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+
+# Tempo de vida padrão de cada parâmetro em cache, em segundos
+TTL_PADRAO = 300
+MAXIMO_ENTRADAS_PADRAO = 1024
+
+
+class CacheParametros:
+    """
+    Cache de parâmetros compartilhado pelo processo inteiro, com TTL e
+    descarte LRU. Numa falha, todos os parâmetros são recarregados de uma
+    vez (uma única consulta), e chaves inexistentes também ficam em cache
+    como None, para que importações seguidas não voltem ao banco.
+    """
+
+    def __init__(self, ttl: float = TTL_PADRAO, maximo_entradas: int = MAXIMO_ENTRADAS_PADRAO):
+        self.ttl = ttl
+        self.maximo_entradas = maximo_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self._entradas = OrderedDict()
+
+    def obter(self, chave, carregar_todos):
+        """
+        Retorna o valor da chave. Em caso de falha (ausente ou expirado),
+        chama carregar_todos(), que deve devolver a lista de documentos
+        {"chave", "valor"} da coleção.
+        """
+        entrada = self._entradas.get(chave)
+        if entrada is not None and entrada[1] > time.monotonic():
+            self.acertos += 1
+            self._entradas.move_to_end(chave)
+            return entrada[0]
+
+        self.falhas += 1
+        self.carregar(carregar_todos())
+
+        if chave not in self._entradas:
+            self.definir(chave, None)
+        return self._entradas[chave][0]
+
+    def carregar(self, documentos):
+        for documento in documentos:
+            self.definir(documento["chave"], documento.get("valor"))
+
+    def definir(self, chave, valor):
+        self._entradas[chave] = (valor, time.monotonic() + self.ttl)
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.maximo_entradas:
+            self._entradas.popitem(last=False)
+
+    def invalidar(self, chave=None):
+        if chave is None:
+            self._entradas.clear()
+        else:
+            self._entradas.pop(chave, None)
+
+    def estatisticas(self) -> dict:
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "entradas": len(self._entradas),
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+        }
+
+
+cache_parametros = CacheParametros()
@@ -1,11 +1,41 @@
+import os
+
 from pymongo import MongoClient
 
+from src.db.monitoramento import monitor_mongo
+from src.instrumentacao import instrumentacao
+
 MONGO_URI = "mongodb://localhost:27017"
 
 _client = None
+_pid = None
+
+# Idas ao banco, latências e operações lentas entram no relatório da instrumentação
+instrumentacao.adicionar_secao("mongo", monitor_mongo)
 
 def obter_client():
-    global _client
-    if _client is None:
-        _client = MongoClient(MONGO_URI)
-    return _client
\ No newline at end of file
+    global _client, _pid
+    # MongoClient não é seguro após fork: cada processo abre o seu
+    if _client is None or _pid != os.getpid():
+        _client = MongoClient(MONGO_URI, event_listeners=[monitor_mongo])
+        _pid = os.getpid()
+    return _client
+
+def reiniciar_client():
+    """
+    Descarta o client do processo atual; o próximo obter_client abre outro.
+    Usado ao iniciar cada processo de importação em paralelo. O client
+    herdado não é fechado, pois suas conexões pertencem ao processo pai.
+    """
+    global _client, _pid
+    _client = None
+    _pid = None
+
+def definir_client(client):
+    """
+    Usa um client já criado no lugar do MongoClient padrão, ex.: um
+    mongomock.MongoClient nos benchmarks.
+    """
+    global _client, _pid
+    _client = client
+    _pid = os.getpid()
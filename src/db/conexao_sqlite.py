@@ -0,0 +1,73 @@
+import os
+import sqlite3
+
+# Arquivo do banco local (fora do git); CONVERSOR_SQLITE troca o caminho
+VARIAVEL_CAMINHO_SQLITE = "CONVERSOR_SQLITE"
+CAMINHO_SQLITE_PADRAO = os.path.join("data", "contabilidade.sqlite3")
+
+# Tabelas e índices equivalentes às coleções e a src/db/indices.py.
+# As chaves primárias fazem o papel dos índices únicos do MongoDB.
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS contas_bancarias (
+    numero_conta TEXT PRIMARY KEY,
+    conta_contabil_banco TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS parametros (
+    chave TEXT PRIMARY KEY,
+    valor
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS contas_pagas (
+    assinatura TEXT PRIMARY KEY,
+    fornecedor_norm TEXT,
+    tokens TEXT NOT NULL DEFAULT '[]',
+    conta_despesa TEXT,
+    origem TEXT,
+    aplicacoes INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_contas_pagas_updated_at ON contas_pagas (updated_at);
+CREATE INDEX IF NOT EXISTS ix_contas_pagas_fornecedor_norm ON contas_pagas (fornecedor_norm);
+
+CREATE TABLE IF NOT EXISTS exportacoes (
+    cliente TEXT NOT NULL,
+    layout TEXT NOT NULL,
+    impressao INTEGER NOT NULL,
+    exportado_em TEXT,
+    PRIMARY KEY (cliente, layout, impressao)
+) WITHOUT ROWID;
+"""
+
+_conexao = None
+_pid = None
+
+
+def obter_conexao():
+    """
+    Conexão SQLite do processo, aberta na primeira chamada com o esquema
+    criado. O modo WAL deixa os processos da importação em paralelo lerem
+    enquanto um deles grava; busy_timeout espera a vez de gravar em vez de
+    falhar com 'database is locked'.
+    """
+    global _conexao, _pid
+    # Como o MongoClient, a conexão não pode ser usada depois de um fork
+    if _conexao is None or _pid != os.getpid():
+        caminho = os.environ.get(VARIAVEL_CAMINHO_SQLITE, CAMINHO_SQLITE_PADRAO)
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        _conexao = sqlite3.connect(caminho, timeout=30)
+        _conexao.execute("PRAGMA journal_mode=WAL")
+        _conexao.execute("PRAGMA synchronous=NORMAL")
+        _conexao.executescript(ESQUEMA)
+        _pid = os.getpid()
+    return _conexao
+
+
+def fechar_conexao():
+    global _conexao, _pid
+    if _conexao is not None and _pid == os.getpid():
+        _conexao.close()
+    _conexao = None
+    _pid = None
@@ -0,0 +1,211 @@
+from datetime import datetime
+
+from pymongo.errors import OperationFailure
+
+# Índices exigidos por coleção. Cada consulta frequente dos repositórios
+# precisa estar coberta por um destes.
+INDICES = {
+    "contas_bancarias": [
+        {"nome": "uq_numero_conta", "chaves": [("numero_conta", 1)], "unique": True},
+    ],
+    "parametros": [
+        {"nome": "uq_chave", "chaves": [("chave", 1)], "unique": True},
+    ],
+    "contas_pagas": [
+        {"nome": "uq_assinatura", "chaves": [("assinatura", 1)], "unique": True},
+        # Recarga incremental do índice em memória (carregar_vinculos com
+        # atualizados_desde, ver IndiceContasPagas.atualizar)
+        {"nome": "ix_updated_at_id", "chaves": [("updated_at", 1), ("_id", 1)]},
+        # Busca por prefixo (regex ancorada, sem IGNORECASE) usa estes índices
+        {"nome": "ix_fornecedor_norm", "chaves": [("fornecedor_norm", 1)]},
+        {"nome": "ix_tokens", "chaves": [("tokens", 1)]},
+        # Busca textual com relevância; só pode existir um índice de texto por coleção
+        {
+            "nome": "tx_busca",
+            "chaves": [("assinatura", "text"), ("fornecedor_norm", "text"), ("tokens", "text")],
+            "opcoes": {
+                "weights": {"assinatura": 5, "fornecedor_norm": 3, "tokens": 1},
+                "default_language": "none",
+            },
+        },
+    ],
+    "exportacoes": [
+        # Uma linha de origem só é registrada uma vez por cliente e layout;
+        # também atende ao $in das impressões já exportadas
+        {"nome": "uq_cliente_layout_impressao",
+         "chaves": [("cliente", 1), ("layout", 1), ("impressao", 1)], "unique": True},
+    ],
+}
+
+# Índices que sabidamente estão errados e são removidos na reconciliação.
+# 'uq_assintura' indexava um campo inexistente e, por ser único, impedia
+# mais de um documento na coleção.
+INDICES_OBSOLETOS = {
+    "contas_pagas": ["uq_assintura"],
+}
+
+# Consultas quentes de cada repositório, usadas por verificar_planos()
+# (python -m benchmarks.planos)
+CONSULTAS_CRITICAS = {
+    "contas_bancarias": [
+        {"numero_conta": "0000-0"},
+        {"numero_conta": {"$in": ["0000-0", "0000-1"]}},
+    ],
+    "parametros": [
+        {"chave": "conta_tarifas_bancarias"},
+    ],
+    "contas_pagas": [
+        {"assinatura": "RFB|FGTS"},
+        {"updated_at": {"$gte": datetime(2025, 1, 1)}},
+        {"assinatura": {"$regex": "^RFB"}},
+        {"fornecedor_norm": {"$regex": "^RFB"}},
+        {"tokens": {"$regex": "^FGTS"}},
+    ],
+    "exportacoes": [
+        {"cliente": "MODELO", "layout": "tarifas", "impressao": {"$in": [1, 2, 3]}},
+    ],
+}
+
+_reconciliado = set()
+
+
+def _normalizar_chaves(chaves):
+    return [(campo, int(direcao) if isinstance(direcao, (int, float)) else direcao)
+            for campo, direcao in chaves]
+
+
+def _eh_texto(chaves):
+    return any(direcao == "text" for _, direcao in chaves)
+
+
+def _mesma_definicao(info, indice):
+    """Compara um índice existente (index_information) com o declarado."""
+    if info.get("unique", False) != indice.get("unique", False):
+        return False
+    # O Mongo guarda índices de texto como (_fts, _ftsx); compara-se pelos pesos
+    if _eh_texto(indice["chaves"]) and "weights" in info:
+        pesos = {k: int(v) for k, v in (info.get("weights") or {}).items()}
+        return pesos == indice.get("opcoes", {}).get("weights")
+    return _normalizar_chaves(info["key"]) == _normalizar_chaves(indice["chaves"])
+
+
+def reconciliar_indices(db, remover_obsoletos: bool = False) -> dict:
+    """
+    Compara os índices existentes com os declarados em INDICES e:
+    - cria os que faltam;
+    - remove os listados em INDICES_OBSOLETOS;
+    - aponta (e, se remover_obsoletos=True, remove) índices não declarados
+      ou declarados com nome/definição diferentes.
+    Erros ao criar (ex.: valores duplicados impedindo um índice único) são
+    reportados em vez de interromper a reconciliação.
+    """
+    relatorio = {"criados": [], "removidos": [], "obsoletos": [], "erros": []}
+
+    for colecao, declarados in INDICES.items():
+        collection = db[colecao]
+        existentes = collection.index_information()
+        conhecidos = {"_id_"}
+
+        for nome in INDICES_OBSOLETOS.get(colecao, []):
+            if nome in existentes:
+                collection.drop_index(nome)
+                relatorio["removidos"].append(f"{colecao}.{nome}")
+                del existentes[nome]
+
+        for indice in declarados:
+            nome = indice["nome"]
+            chaves = _normalizar_chaves(indice["chaves"])
+            unico = indice.get("unique", False)
+            conhecidos.add(nome)
+
+            info = existentes.get(nome)
+            if info is not None:
+                if _mesma_definicao(info, indice):
+                    continue
+                # Mesmo nome, definição diferente: precisa ser recriado
+                if not remover_obsoletos:
+                    relatorio["obsoletos"].append(f"{colecao}.{nome} (definição divergente)")
+                    continue
+                collection.drop_index(nome)
+                relatorio["removidos"].append(f"{colecao}.{nome}")
+
+            # Mesma definição com outro nome: o Mongo recusaria criar um segundo
+            if _eh_texto(chaves):
+                mesmo_indice = [n for n, i in existentes.items()
+                                if n != nome and "weights" in i]
+            else:
+                mesmo_indice = [n for n, i in existentes.items()
+                                if n != nome and _normalizar_chaves(i["key"]) == chaves]
+            if mesmo_indice and not remover_obsoletos:
+                relatorio["obsoletos"].append(f"{colecao}.{mesmo_indice[0]} (deveria se chamar {nome})")
+                conhecidos.add(mesmo_indice[0])
+                continue
+            for outro in mesmo_indice:
+                collection.drop_index(outro)
+                relatorio["removidos"].append(f"{colecao}.{outro}")
+                del existentes[outro]
+
+            try:
+                collection.create_index(chaves, name=nome, unique=unico,
+                                        **indice.get("opcoes", {}))
+                relatorio["criados"].append(f"{colecao}.{nome}")
+            except OperationFailure as e:
+                relatorio["erros"].append(f"{colecao}.{nome}: {e}")
+
+        for nome in existentes:
+            if nome in conhecidos:
+                continue
+            if remover_obsoletos:
+                collection.drop_index(nome)
+                relatorio["removidos"].append(f"{colecao}.{nome}")
+            else:
+                relatorio["obsoletos"].append(f"{colecao}.{nome} (não declarado)")
+
+    return relatorio
+
+
+def garantir_indices(db):
+    """
+    Reconcilia os índices uma única vez por processo e banco, avisando
+    sobre índices obsoletos ou que não puderam ser criados.
+    """
+    if db.name in _reconciliado:
+        return
+    _reconciliado.add(db.name)
+
+    relatorio = reconciliar_indices(db)
+    for aviso in relatorio["obsoletos"]:
+        print(f"Aviso: índice obsoleto {aviso}")
+    for erro in relatorio["erros"]:
+        print(f"Aviso: não foi possível criar o índice {erro}")
+
+
+def _estagios(plano):
+    yield plano.get("stage")
+    if "inputStage" in plano:
+        yield from _estagios(plano["inputStage"])
+    for subplano in plano.get("inputStages", []):
+        yield from _estagios(subplano)
+    if "queryPlan" in plano:
+        yield from _estagios(plano["queryPlan"])
+
+
+def verificar_planos(db) -> list[dict]:
+    """
+    Executa explain() nas consultas de CONSULTAS_CRITICAS e informa, para
+    cada uma, se o plano vencedor usa índice (IXSCAN) ou varre a coleção.
+    """
+    resultado = []
+    for colecao, consultas in CONSULTAS_CRITICAS.items():
+        for filtro in consultas:
+            plano = db[colecao].find(filtro).explain()
+            vencedor = plano.get("queryPlanner", {}).get("winningPlan", {})
+            estagios = [e for e in _estagios(vencedor) if e]
+            resultado.append({
+                "colecao": colecao,
+                "filtro": filtro,
+                "estagios": estagios,
+                # EXPRESS_IXSCAN/IDHACK são atalhos de índice das versões recentes
+                "usa_indice": any(e.endswith("IXSCAN") or e == "IDHACK" for e in estagios),
+            })
+    return resultado
@@ -0,0 +1,265 @@
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import Counter
+
+# Campos de um vínculo de contas pagas que podem ser alterados depois de criado
+CAMPOS_ALTERAVEIS_CONTAS_PAGAS = {"conta_despesa", "fornecedor_norm", "tokens", "origem"}
+
+
+class BaseRepositorioContasBancarias(ABC):
+    """
+    Contrato dos repositórios de contas bancárias (numero_conta -> conta
+    contábil do banco). Implementações: MongoDB (RepositorioContasBancarias),
+    SQLite e memória; a escolha é feita em src.db.repositorios.
+    """
+
+    @abstractmethod
+    def criar_contas_bancarias(self, chave, valor):
+        ...
+
+    @abstractmethod
+    def obter_contas_bancarias(self, chave):
+        """Conta contábil do número de conta ou None se não cadastrada."""
+
+    @abstractmethod
+    def obter_muitas_contas_bancarias(self, chaves) -> dict:
+        """{numero_conta: conta_contabil_banco} apenas com as contas encontradas."""
+
+    @abstractmethod
+    def atualizar_contas_bancarias(self, chave, valor):
+        ...
+
+    @abstractmethod
+    def definir_contas_bancarias(self, chave, valor):
+        """Cria ou atualiza (upsert)."""
+
+    @abstractmethod
+    def definir_muitas_contas_bancarias(self, contas: dict) -> int:
+        ...
+
+    @abstractmethod
+    def deletar_contas_bancarias(self, chave):
+        ...
+
+    @abstractmethod
+    def listar_contas_bancarias(self) -> list[dict]:
+        """Documentos {'numero_conta', 'conta_contabil_banco'}."""
+
+
+class BaseRepositorioParametros(ABC):
+    """Contrato dos repositórios de parâmetros (chave -> valor)."""
+
+    @abstractmethod
+    def criar_parametro(self, chave, valor):
+        ...
+
+    @abstractmethod
+    def obter_parametro(self, chave):
+        """Valor do parâmetro ou None se não cadastrado."""
+
+    @abstractmethod
+    def atualizar_parametro(self, chave, valor):
+        ...
+
+    @abstractmethod
+    def definir_parametro(self, chave, valor):
+        """Cria ou atualiza (upsert)."""
+
+    @abstractmethod
+    def deletar_parametro(self, chave):
+        ...
+
+    @abstractmethod
+    def listar_parametros(self) -> list[dict]:
+        """Documentos {'chave', 'valor'}."""
+
+
+class BaseRepositorioContasPagas(ABC):
+    """
+    Contrato dos repositórios de vínculos de contas pagas (assinatura ->
+    conta de despesa), só com o que a importação usa: carga dos vínculos
+    para o índice, gravação em lote dos aprendidos e contagem de
+    aplicações. A gestão dos vínculos (cadastro unitário, listagem
+    paginada, busca) é outro contrato, BaseGestaoContasPagas.
+
+    Validação e normalização ficam aqui, iguais para todos os backends.
+    """
+
+    def __init__(self):
+        # Incrementos de stats.aplicacoes ainda não gravados: assinatura -> quantidade
+        self._aplicacoes_pendentes = Counter()
+
+    @abstractmethod
+    def obter_contas_pagas(self, chave: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def definir_muitas(self, itens: dict[str, dict]) -> dict:
+        """
+        Upsert em lote {assinatura: valor}; conta_despesa é obrigatória só
+        para assinaturas novas. Retorna {'inseridos': n, 'atualizados': n}.
+        """
+
+    @abstractmethod
+    def carregar_vinculos(self, atualizados_desde=None):
+        """
+        Vínculos com assinatura, fornecedor_norm, tokens, conta_despesa e
+        updated_at; com atualizados_desde, só os alterados a partir dessa data.
+        """
+
+    @abstractmethod
+    def contar_vinculos(self) -> int:
+        """Quantidade de vínculos gravados; revela exclusões à recarga incremental."""
+
+    def registrar_aplicacoes(self, assinaturas, limite_buffer: int = 10_000):
+        """
+        Acumula em memória os incrementos de stats.aplicacoes, agrupados por
+        assinatura. Nada vai ao banco até descarregar_aplicacoes() (ou até o
+        buffer passar de limite_buffer assinaturas distintas).
+        Aceita uma assinatura, um iterável de assinaturas ou {assinatura: quantidade}.
+        """
+        if isinstance(assinaturas, str):
+            assinaturas = [assinaturas]
+        self._aplicacoes_pendentes.update(assinaturas)
+
+        if len(self._aplicacoes_pendentes) >= limite_buffer:
+            self.descarregar_aplicacoes()
+
+    @abstractmethod
+    def descarregar_aplicacoes(self) -> int:
+        """Grava os incrementos acumulados; retorna quantas assinaturas foram atualizadas."""
+
+    def _validar_criacao(self, chave, valor):
+        if not chave or not isinstance(chave, str):
+            raise ValueError("assinatura (chave) inválida")
+
+        conta = valor.get('conta_despesa')
+        if not conta or not isinstance(conta, str):
+            raise ValueError(
+                "campo obrigatório 'conta_despesa' ausente ou inválido")
+
+    def _validar_definicao(self, chave, valor):
+        if not chave or not isinstance(chave, str):
+            raise ValueError("assinatura (chave) inválida")
+        if not isinstance(valor, dict):
+            raise ValueError("valor deve ser um dict")
+
+    def _validar_conta_insercao(self, valor):
+        conta = valor.get('conta_despesa')
+        if not conta or not isinstance(conta, str):
+            raise ValueError(
+                "para criar, 'conta_despesa' é obrigatório e deve ser string")
+
+    def _validar_lote(self, itens, existentes):
+        """Todas as assinaturas novas do lote precisam de conta_despesa."""
+        invalidas = []
+        for chave, valor in itens.items():
+            if chave in existentes:
+                continue
+            try:
+                self._validar_conta_insercao(valor)
+            except ValueError:
+                invalidas.append(chave)
+        if invalidas:
+            raise ValueError(
+                "para criar, 'conta_despesa' é obrigatório e deve ser string: "
+                + ", ".join(invalidas))
+
+    def _mesclar_definicao(self, existente: dict | None, chave, valor, agora) -> dict:
+        """
+        Documento resultante do upsert de `valor` sobre `existente` (None =
+        inserção), com as mesmas regras do $set/$setOnInsert do MongoDB.
+        Usado pelos backends que gravam o documento inteiro.
+        """
+        if existente is None:
+            documento = {
+                "assinatura": chave,
+                "fornecedor_norm": None,
+                "tokens": [],
+                "conta_despesa": valor.get("conta_despesa"),
+                "origem": valor.get("origem", "manual"),
+                "stats": {"aplicacoes": 0},
+                "created_at": agora,
+            }
+        else:
+            documento = dict(existente)
+
+        for campo, conteudo in valor.items():
+            if campo in CAMPOS_ALTERAVEIS_CONTAS_PAGAS:
+                documento[campo] = conteudo
+        if valor.get("tokens") is not None:
+            documento["tokens"] = normalizar_tokens(valor["tokens"])
+        if valor.get("fornecedor_norm"):
+            documento["fornecedor_norm"] = str(valor["fornecedor_norm"]).strip().upper()
+        documento["updated_at"] = agora
+        return documento
+
+
+class BaseGestaoContasPagas(BaseRepositorioContasPagas):
+    """
+    Contrato completo dos vínculos de contas pagas: o da importação mais
+    cadastro, alteração e exclusão unitários, listagem paginada e busca.
+    Só o MongoDB implementa; ver repositorios.repositorio_gestao_contas_pagas.
+    """
+
+    @abstractmethod
+    def criar_contas_pagas(self, chave: str, valor: dict) -> dict:
+        ...
+
+    @abstractmethod
+    def criar_muitas(self, itens: dict[str, dict]) -> list[dict]:
+        ...
+
+    @abstractmethod
+    def atualizar_contas_pagas(self, chave: str, valor: dict, incrementar_aplicacoes: int = 0) -> dict:
+        ...
+
+    @abstractmethod
+    def definir_contas_pagas(self, chave: str, valor: dict, incrementar_aplicacoes: int = 0) -> dict:
+        ...
+
+    @abstractmethod
+    def deletar_contas_pagas(self, chave: str) -> dict:
+        ...
+
+    @abstractmethod
+    def paginar_contas_pagas(self, *args, **kwargs) -> dict:
+        """{'items': [...], 'proximo': token ou None} e, se pedido, 'total'."""
+
+    @abstractmethod
+    def buscar_contas_pagas(self, termo: str, limit: int = 20, campos: list[str] | None = None) -> list[dict]:
+        ...
+
+
+class BaseRepositorioExportacoes(ABC):
+    """Contrato dos repositórios do controle de exportação (ver RepositorioExportacoes)."""
+
+    @abstractmethod
+    def obter_exportadas(self, cliente: str, layout: str, impressoes) -> set:
+        ...
+
+    @abstractmethod
+    def registrar_exportadas(self, cliente: str, layout: str, impressoes) -> int:
+        """Grava as impressões ainda não registradas; retorna quantas foram inseridas."""
+
+    @abstractmethod
+    def limpar(self, cliente: str, layout: str = None) -> int:
+        ...
+
+
+def normalizar_texto(texto) -> str:
+    """UPPER, sem acentos e com espaços simples (mesma forma de 'fornecedor_norm')."""
+    sem_acento = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(sem_acento.upper().split())
+
+
+def normalizar_tokens(tokens) -> list[str]:
+    """Lista de strings sem vazios, em maiúsculas e sem repetições (mantém a ordem)."""
+    if not isinstance(tokens, list):
+        raise ValueError("tokens devem ser uma lista de strings")
+    normalizados = []
+    for token in tokens:
+        texto = str(token).strip().upper()
+        if texto:
+            normalizados.append(texto)
+    return list(dict.fromkeys(normalizados))
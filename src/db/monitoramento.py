@@ -0,0 +1,211 @@
+import logging
+import os
+import threading
+import time
+
+from pymongo import monitoring
+
+# Operações acima deste tempo (ms) vão para o log de operações lentas
+VARIAVEL_LIMITE_LENTO = "CONVERSOR_MONGO_LENTO_MS"
+LIMITE_LENTO_MS_PADRAO = 100
+
+# Limites superiores (ms) das faixas do histograma de latência
+FAIXAS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Quantas operações lentas ficam guardadas para o relatório
+MAXIMO_LENTAS = 50
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorMongo(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    """
+    Ouvinte de comandos e do pool de conexões do pymongo, registrado no
+    client por conexao.obter_client.
+
+    Conta as idas ao banco por coleção e comando, monta um histograma de
+    latência de cada par e conta as conexões retiradas do pool (e quanto se
+    esperou por elas). Operações acima do limite (CONVERSOR_MONGO_LENTO_MS,
+    padrão 100 ms) são registradas no log com o formato do filtro: os
+    campos e operadores consultados, sem os valores.
+    """
+
+    def __init__(self, limite_lento_ms: float = None):
+        if limite_lento_ms is None:
+            limite_lento_ms = float(os.environ.get(VARIAVEL_LIMITE_LENTO, LIMITE_LENTO_MS_PADRAO))
+        self.limite_lento_ms = limite_lento_ms
+        self._trava = threading.Lock()
+        self._em_andamento = {}
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._trava:
+            self._comandos = {}
+            self._lentas = []
+            self._conexoes = {"retiradas": 0, "falhas": 0, "criadas": 0, "espera_ms": 0.0}
+            self._inicios_retirada = {}
+
+    # --- comandos ---
+
+    def started(self, event):
+        colecao = _colecao(event.command_name, event.command)
+        if colecao is None:
+            return
+        # Guarda só a referência ao comando; o formato do filtro é montado
+        # apenas se a operação for lenta
+        self._em_andamento[(event.connection_id, event.request_id)] = (colecao, event.command)
+
+    def succeeded(self, event):
+        self._concluir(event, falhou=False)
+
+    def failed(self, event):
+        self._concluir(event, falhou=True)
+
+    def _concluir(self, event, falhou):
+        pendente = self._em_andamento.pop((event.connection_id, event.request_id), None)
+        if pendente is None:
+            return
+        colecao, comando = pendente
+        milissegundos = event.duration_micros / 1000
+        chave = f"{colecao}.{event.command_name}"
+
+        with self._trava:
+            dados = self._comandos.get(chave)
+            if dados is None:
+                dados = self._comandos[chave] = {"chamadas": 0, "falhas": 0, "ms": 0.0, "max_ms": 0.0,
+                                                 "histograma": [0] * (len(FAIXAS_MS) + 1)}
+            dados["chamadas"] += 1
+            dados["ms"] += milissegundos
+            dados["max_ms"] = max(dados["max_ms"], milissegundos)
+            dados["histograma"][_faixa(milissegundos)] += 1
+            if falhou:
+                dados["falhas"] += 1
+
+        if milissegundos >= self.limite_lento_ms:
+            filtro = _filtro(event.command_name, comando)
+            formato = formato_filtro(filtro) if filtro is not None else None
+            logger.warning("Operação lenta no MongoDB: %s %.1f ms filtro=%s", chave, milissegundos, formato)
+            with self._trava:
+                if len(self._lentas) < MAXIMO_LENTAS:
+                    self._lentas.append({"operacao": chave, "ms": round(milissegundos, 1), "filtro": formato})
+
+    # --- pool de conexões ---
+
+    def connection_check_out_started(self, event):
+        self._inicios_retirada[threading.get_ident()] = _agora_ms()
+
+    def connection_checked_out(self, event):
+        inicio = self._inicios_retirada.pop(threading.get_ident(), None)
+        with self._trava:
+            self._conexoes["retiradas"] += 1
+            if inicio is not None:
+                self._conexoes["espera_ms"] += _agora_ms() - inicio
+
+    def connection_check_out_failed(self, event):
+        self._inicios_retirada.pop(threading.get_ident(), None)
+        with self._trava:
+            self._conexoes["falhas"] += 1
+
+    def connection_created(self, event):
+        with self._trava:
+            self._conexoes["criadas"] += 1
+
+    # Eventos do pool sem interesse aqui
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_checked_in(self, event): pass
+    def connection_closed(self, event): pass
+
+    # --- relatório ---
+
+    def relatorio(self) -> dict:
+        with self._trava:
+            comandos = {}
+            for chave, dados in sorted(self._comandos.items(), key=lambda item: -item[1]["ms"]):
+                comandos[chave] = {
+                    "chamadas": dados["chamadas"],
+                    "falhas": dados["falhas"],
+                    "ms": round(dados["ms"], 2),
+                    "media_ms": round(dados["ms"] / dados["chamadas"], 3),
+                    "max_ms": round(dados["max_ms"], 2),
+                    "histograma": _rotular(dados["histograma"]),
+                }
+            return {
+                "idas_ao_banco": sum(dados["chamadas"] for dados in comandos.values()),
+                "comandos": comandos,
+                "conexoes": dict(self._conexoes, espera_ms=round(self._conexoes["espera_ms"], 2)),
+                "limite_lento_ms": self.limite_lento_ms,
+                "lentas": list(self._lentas),
+            }
+
+    def exibir(self, relatorio: dict = None):
+        relatorio = relatorio or self.relatorio()
+        print(f"\n=== MongoDB: {relatorio['idas_ao_banco']} idas ao banco ===")
+        print(f"{'coleção.comando':<40} {'chamadas':>9} {'média ms':>10} {'máx ms':>10} {'total ms':>10}")
+        for chave, dados in relatorio["comandos"].items():
+            print(f"{chave:<40} {dados['chamadas']:>9} {dados['media_ms']:>10.3f} "
+                  f"{dados['max_ms']:>10.2f} {dados['ms']:>10.2f}")
+        conexoes = relatorio["conexoes"]
+        print(f"Conexões: {conexoes['retiradas']} retiradas do pool, {conexoes['criadas']} criadas, "
+              f"{conexoes['espera_ms']} ms de espera")
+        for lenta in relatorio["lentas"]:
+            print(f"Lenta: {lenta['operacao']} {lenta['ms']} ms filtro={lenta['filtro']}")
+
+
+monitor_mongo = MonitorMongo()
+
+
+def formato_filtro(filtro):
+    """
+    Formato de um filtro sem os valores: {"numero_conta": {"$in": "list[2]"}}.
+    Agrupa consultas iguais com valores diferentes e não expõe dados no log.
+    """
+    if isinstance(filtro, dict):
+        return {chave: formato_filtro(valor) for chave, valor in filtro.items()}
+    if isinstance(filtro, (list, tuple)):
+        if filtro and all(isinstance(item, dict) for item in filtro):
+            return [formato_filtro(item) for item in filtro]
+        return f"list[{len(filtro)}]"
+    return type(filtro).__name__
+
+
+def _colecao(nome_comando, comando):
+    # O valor do comando é o nome da coleção (find, insert, update...);
+    # getMore informa a coleção à parte. Comandos administrativos ficam de fora.
+    if nome_comando == "getMore":
+        return comando.get("collection")
+    colecao = comando.get(nome_comando)
+    return colecao if isinstance(colecao, str) else None
+
+
+def _filtro(nome_comando, comando):
+    if nome_comando in ("find", "findAndModify"):
+        return comando.get("filter", comando.get("query"))
+    if nome_comando in ("count", "distinct"):
+        return comando.get("query")
+    if nome_comando == "update":
+        return [atualizacao.get("q") for atualizacao in comando.get("updates", [])[:1]]
+    if nome_comando == "delete":
+        return [remocao.get("q") for remocao in comando.get("deletes", [])[:1]]
+    if nome_comando == "aggregate":
+        return [etapa for etapa in comando.get("pipeline", []) if "$match" in etapa][:1]
+    return None
+
+
+def _faixa(milissegundos):
+    for indice, limite in enumerate(FAIXAS_MS):
+        if milissegundos <= limite:
+            return indice
+    return len(FAIXAS_MS)
+
+
+def _rotular(histograma):
+    rotulos = [f"<={limite}ms" for limite in FAIXAS_MS] + [f">{FAIXAS_MS[-1]}ms"]
+    return {rotulo: quantidade for rotulo, quantidade in zip(rotulos, histograma) if quantidade}
+
+
+def _agora_ms():
+    return time.perf_counter() * 1000
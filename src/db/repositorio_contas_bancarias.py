@@ -1,24 +1,56 @@
-from src.db.conexao import obter_client
+from pymongo import UpdateOne
 
-class RepositorioContasBancarias:           
+from src.db.base_repositorio import BaseRepositorioMongo
+from src.db.interfaces import BaseRepositorioContasBancarias
+from src.instrumentacao import instrumentar_metodos
+
+@instrumentar_metodos("db.contas_bancarias")
+class RepositorioContasBancarias(BaseRepositorioMongo, BaseRepositorioContasBancarias):
+
+    colecao = "contas_bancarias"
    
     def __init__(self):
-        self.client = obter_client()
-        self.db = self.client['contabilidade']
-        self.collection = self.db['contas_bancarias']
+        # Cache de leitura da execução: numero_conta -> conta contábil (None = não cadastrada)
+        self._cache = {}
 
     def criar_contas_bancarias(self, chave, valor):
         self.collection.insert_one({"numero_conta": chave, "conta_contabil_banco": valor})
+        self._cache[chave] = valor
 
     def obter_contas_bancarias(self, chave):
-        documento = self.collection.find_one({"numero_conta": chave})
-        return documento["conta_contabil_banco"] if documento else None
+        if chave not in self._cache:
+            documento = self.collection.find_one({"numero_conta": chave})
+            self._cache[chave] = documento["conta_contabil_banco"] if documento else None
+        return self._cache[chave]
+
+    def obter_muitas_contas_bancarias(self, chaves):
+        """
+        Resolve vários números de conta com uma única consulta $in.
+        Só os números que ainda não estão no cache da execução vão ao banco;
+        os não cadastrados também ficam em cache para não serem consultados de novo.
+        Retorna {numero_conta: conta_contabil_banco} apenas com as contas encontradas.
+        """
+        chaves = list(dict.fromkeys(chaves))
+        pendentes = [chave for chave in chaves if chave not in self._cache]
+
+        if pendentes:
+            for chave in pendentes:
+                self._cache[chave] = None
+            documentos = self.collection.find(
+                {"numero_conta": {"$in": pendentes}},
+                {"_id": 0, "numero_conta": 1, "conta_contabil_banco": 1}
+            )
+            for documento in documentos:
+                self._cache[documento["numero_conta"]] = documento["conta_contabil_banco"]
+
+        return {chave: self._cache[chave] for chave in chaves if self._cache[chave] is not None}
     
     def atualizar_contas_bancarias(self, chave, valor):
         self.collection.update_one(
             {"numero_conta": chave},
             {"$set": {"conta_contabil_banco": valor}}
         )
+        self._cache.pop(chave, None)
     
     def definir_contas_bancarias(self, chave, valor):
         self.collection.update_one(
@@ -26,9 +58,22 @@ class RepositorioContasBancarias:
             {"$set": {"conta_contabil_banco": valor}},
             upsert=True
         )
+        self._cache[chave] = valor
+
+    def definir_muitas_contas_bancarias(self, contas: dict) -> int:
+        """Grava {numero_conta: conta_contabil_banco} com um único bulk_write de upserts."""
+        if not contas:
+            return 0
+        self.collection.bulk_write([
+            UpdateOne({"numero_conta": chave}, {"$set": {"conta_contabil_banco": valor}}, upsert=True)
+            for chave, valor in contas.items()
+        ], ordered=False)
+        self._cache.update(contas)
+        return len(contas)
 
     def deletar_contas_bancarias(self, chave):
         self.collection.delete_one({"numero_conta": chave})
+        self._cache[chave] = None
 
     def listar_contas_bancarias(self):
-        return list(self.collection.find({}, {"_id": 0}))
\ No newline at end of file
+        return list(self.collection.find({}, {"_id": 0}))
@@ -1,21 +1,32 @@
 from datetime import datetime
-from pymongo.errors import DuplicateKeyError
-from pymongo import ReturnDocument
-from src.db.conexao import obter_client
+from bson import json_util
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo import ReturnDocument, UpdateOne
+from src.db.base_repositorio import BaseRepositorioMongo
+from src.db.interfaces import (CAMPOS_ALTERAVEIS_CONTAS_PAGAS, BaseGestaoContasPagas, normalizar_texto,
+                               normalizar_tokens)
+from src.instrumentacao import instrumentar_metodos
+import base64
+import hashlib
 import re
+import time
+import warnings
 
+# Validade, em segundos, das contagens usadas na paginação
+TTL_TOTAIS = 60
 
-class RepositorioContasPagas:
+# Campos únicos dispensam o _id como desempate na paginação por cursor,
+# o que permite usar diretamente o índice do próprio campo
+CAMPOS_ORDENACAO_UNICOS = {"_id", "assinatura"}
 
-    def __init__(self):
-        self.client = obter_client()
-        self.db = self.client['contabilidade']
-        self.collection = self.db['contas_pagas']
-        self.collection.create_index(
-            [("assintura", 1)],
-            unique=True,
-            name="uq_assintura"
-        )
+# Contagens recentes por consulta: filtro serializado -> (total, expira_em, marca da coleção)
+_cache_totais = {}
+
+
+@instrumentar_metodos("db.contas_pagas")
+class RepositorioContasPagas(BaseRepositorioMongo, BaseGestaoContasPagas):
+
+    colecao = "contas_pagas"
 
     def criar_contas_pagas(self, chave: str, valor: dict) -> dict:
         """
@@ -24,29 +35,13 @@ class RepositorioContasPagas:
         valor precisa ter: conta_despesa (str)
         opcionais: fornecedor_norm (str), tokens (list[str]), origem (str),        
         """
-        if not chave or not isinstance(chave, str):
-            raise ValueError("assinatura (chave) inválida")
-
-        conta = valor.get('conta_despesa')
-        if not conta or not isinstance(conta, str):
-            raise ValueError(
-                "campo obrigatório 'conta_despesa' ausente ou inválido")
+        self._validar_criacao(chave, valor)
 
         # Verificação explícita (mensagem amigável)
-        if self.collection.find_one({"assintura": chave}):
+        if self.collection.find_one({"assinatura": chave}):
             raise ValueError(f"já existe vínculo para assinatura='{chave}'")
 
-        now = datetime.utcnow()
-        doc = {
-            "assinatura": chave,
-            "fornecedor_norm": valor.get('fornecedor_norm'),
-            "tokens": valor.get('tokens') or [],
-            "conta_despesa": conta,
-            "origem": valor.get('origem', 'manual'),
-            "stats": {'aplicacoes': 0},
-            "created_at": now,
-            "updated_at": now,
-        }
+        doc = self._montar_documento(chave, valor, datetime.utcnow())
 
         try:
             self.collection.insert_one(doc)
@@ -54,8 +49,43 @@ class RepositorioContasPagas:
             # Corrida eventual
             raise ValueError(f"assinatura'{chave}' já cadastrada")
 
+        _cache_totais.clear()
         return doc
 
+    def criar_muitas(self, itens: dict[str, dict]) -> list[dict]:
+        """
+        Versão em lote de criar_contas_pagas: {assinatura: valor}.
+        Valida tudo antes de escrever; se alguma assinatura já existir, nada
+        é gravado e o ValueError lista todas elas. A gravação é um único
+        bulk_write não ordenado com upserts $setOnInsert.
+        Retorna os documentos criados.
+        """
+        for chave, valor in itens.items():
+            self._validar_criacao(chave, valor)
+        if not itens:
+            return []
+
+        existentes = self._assinaturas_existentes(list(itens))
+        if existentes:
+            raise ValueError(
+                f"já existe vínculo para assinatura(s): {', '.join(sorted(existentes))}")
+
+        now = datetime.utcnow()
+        docs = [self._montar_documento(chave, valor, now) for chave, valor in itens.items()]
+        operacoes = [
+            UpdateOne({"assinatura": doc["assinatura"]}, {"$setOnInsert": doc}, upsert=True)
+            for doc in docs
+        ]
+        resultado = self.collection.bulk_write(operacoes, ordered=False)
+        _cache_totais.clear()
+
+        if resultado.matched_count:
+            # Corrida eventual: outra importação criou parte das assinaturas
+            raise ValueError(
+                f"{resultado.matched_count} assinatura(s) cadastrada(s) durante a criação em lote")
+
+        return docs
+
     def obter_contas_pagas(self, chave: str) -> dict | None:
         """
         Recupera vínculo pela assinatura canônica.
@@ -80,16 +110,12 @@ class RepositorioContasPagas:
         if not isinstance(valor, dict):
             raise ValueError("valor deve ser um dict")
 
-        # Permitir apenas esses campos serem alterados via patch
-        allowed = {"conta_despesa", "fornecedor_norm", "tokens", "origem"}
-        set_doc = {k: v for k, v in valor.items() if k in allowed}
-
-        # Normalização opcional dos tokens
+        # Mesmos campos e normalização do upsert (ver _montar_definicao)
+        set_doc = {k: v for k, v in valor.items() if k in CAMPOS_ALTERAVEIS_CONTAS_PAGAS}
         if "tokens" in set_doc and set_doc["tokens"] is not None:
-            if not isinstance(set_doc["tokens"], list):
-                raise ValueError("tokens devem ser uma lista de strings")
-            set_doc["tokens"] = [str(t).strip().upper()
-                                 for t in set_doc["tokens"] if str(t).strip()]
+            set_doc["tokens"] = normalizar_tokens(set_doc["tokens"])
+        if set_doc.get("fornecedor_norm"):
+            set_doc["fornecedor_norm"] = str(set_doc["fornecedor_norm"]).strip().upper()
 
         # Sempre atualiza o carimbo de atualização
         set_doc["updated_at"] = datetime.utcnow()
@@ -111,6 +137,7 @@ class RepositorioContasPagas:
             raise ValueError(
                 f"assinatura '{chave}' não encontrada para atualizar")
 
+        _cache_totais.clear()
         return doc
 
     def definir_contas_pagas(self, chave: str, valor: dict, incrementar_aplicacoes: int = 0) -> dict:
@@ -124,57 +151,14 @@ class RepositorioContasPagas:
             * Campos permitidos no update: conta_despesa, fornecedor_norm, tokens, origem.
         Retorna o documento final (após upsert).
         """
-        if not chave or not isinstance(chave, str):
-            raise ValueError("assinatura (chave) inválida")
-        if not isinstance(valor, dict):
-            raise ValueError("valor deve ser um dict")
+        self._validar_definicao(chave, valor)
 
         # Verifica existência pra exigir 'conta_despesa' apenas em INSERT
         existente = self.collection.find_one({"assinatura": chave})
         if not existente:
-            conta = valor.get('conta_despesa')
-            if not conta or not isinstance(conta, str):
-                raise ValueError(
-                    "para criar, 'conta_despesa' é obrigatório e deve ser string")
-
-        allowed = {"conta_despesa", "fornecedor_norm", "tokens", "origem"}
-        set_doc = {k: v for k, v in valor.items() if k in allowed}
-
-        # Normalização opcional dos tokens (lista de strings, sem vazios, uppercase, únicos)
-        if "tokens" in set_doc and set_doc["tokens"] is not None:
-            if not isinstance(set_doc["tokens"], list):
-                raise ValueError("tokens devem ser uma lista de strings")
-            norm_tokens = []
-            for t in set_doc["tokens"]:
-                s = str(t).strip().upper()
-                if s:
-                    norm_tokens.append(s)
-            # mantém ordem e remove duplicatas
-            set_doc["tokens"] = list(dict.fromkeys(norm_tokens))
+            self._validar_conta_insercao(valor)
 
-        set_doc["updated_at"] = datetime.utcnow()
-
-        set_on_insert = {
-            "assinatura": chave,
-            "created_at": datetime.utcnow(),
-            "stats": {'aplicacoes': 0},
-            # origem default só no insert (pode vir em set_doc para update)
-            "origem": valor.get('origem', 'manual'),
-        }
-        # Em insert, gravar também conta_despesa (já validada acima)
-        if not existente and "conta_despesa" in valor:
-            set_on_insert["conta_despesa"] = valor["conta_despesa"]
-        # Opcionalmente povoar fornecedor_norm/tokens no insert, se fornecidos
-        if "fornecedor_norm" in valor and valor["fornecedor_norm"]:
-            set_on_insert["fornecedor_norm"] = str(
-                valor["fornecedor_norm"]).strip().upper()
-        if "tokens" in set_doc and not existente:
-            set_on_insert["tokens"] = set_doc["tokens"]
-
-        update_ops = {"$set": set_doc, "$setOnInsert": set_on_insert}
-        if incrementar_aplicacoes > 0:
-            update_ops["$inc"] = {
-                "stats.aplicacoes": int(incrementar_aplicacoes)}
+        update_ops = self._montar_definicao(chave, valor, bool(existente), incrementar_aplicacoes)
 
         doc = self.collection.find_one_and_update(
             {"assinatura": chave},
@@ -182,8 +166,38 @@ class RepositorioContasPagas:
             upsert=True,
             return_document=ReturnDocument.AFTER,
         )
+        _cache_totais.clear()
         return doc
 
+    def definir_muitas(self, itens: dict[str, dict]) -> dict:
+        """
+        Versão em lote de definir_contas_pagas: {assinatura: valor}.
+        Mesmas regras do upsert unitário (conta_despesa obrigatória só para
+        assinaturas novas, tokens normalizados), mas com uma consulta $in
+        para descobrir as existentes e um único bulk_write não ordenado.
+        Retorna {'inseridos': n, 'atualizados': n}.
+        """
+        for chave, valor in itens.items():
+            self._validar_definicao(chave, valor)
+        if not itens:
+            return {"inseridos": 0, "atualizados": 0}
+
+        existentes = self._assinaturas_existentes(list(itens))
+        self._validar_lote(itens, existentes)
+
+        operacoes = [
+            UpdateOne(
+                {"assinatura": chave},
+                self._montar_definicao(chave, valor, chave in existentes),
+                upsert=True,
+            )
+            for chave, valor in itens.items()
+        ]
+        resultado = self.collection.bulk_write(operacoes, ordered=False)
+        _cache_totais.clear()
+
+        return {"inseridos": resultado.upserted_count, "atualizados": resultado.matched_count}
+
     def deletar_contas_pagas(self, chave: str) -> dict:
         """
         Remove definitivamente o vínculo da assinatura.
@@ -199,8 +213,52 @@ class RepositorioContasPagas:
             raise ValueError(
                 f"assinatura '{chave}' não encontrada para deletar")
 
+        _cache_totais.clear()
         return doc
 
+    def carregar_vinculos(self, atualizados_desde: datetime | None = None):
+        """
+        Cursor com os vínculos, só com os campos usados na classificação.
+        Com atualizados_desde, traz apenas os alterados a partir dessa data
+        (coberto pelo índice ix_updated_at_id), para recargas incrementais.
+        """
+        query = {}
+        if atualizados_desde is not None:
+            query["updated_at"] = {"$gte": atualizados_desde}
+
+        return self.collection.find(query, {
+            "_id": 0,
+            "assinatura": 1,
+            "fornecedor_norm": 1,
+            "tokens": 1,
+            "conta_despesa": 1,
+            "updated_at": 1,
+        })
+
+    def contar_vinculos(self) -> int:
+        # Pelos metadados da coleção, sem varrê-la
+        return self.collection.estimated_document_count()
+
+    def descarregar_aplicacoes(self) -> int:
+        """
+        Grava os incrementos acumulados com um único bulk_write não ordenado.
+        Retorna quantas assinaturas foram atualizadas.
+        """
+        if not self._aplicacoes_pendentes:
+            return 0
+
+        operacoes = [
+            UpdateOne({"assinatura": chave}, {"$inc": {"stats.aplicacoes": int(quantidade)}})
+            for chave, quantidade in self._aplicacoes_pendentes.items()
+            if quantidade > 0
+        ]
+        self._aplicacoes_pendentes.clear()
+        if not operacoes:
+            return 0
+
+        resultado = self.collection.bulk_write(operacoes, ordered=False)
+        return resultado.matched_count
+
     def listar_contas_pagas(
             self,
             termo: str | None = None,
@@ -217,10 +275,13 @@ class RepositorioContasPagas:
         """
         LIsta vínculos da coleção "contas_pagas" com filtro opcionais.
 
+        Obsoleto: o skip percorre todos os documentos anteriores à página.
+        Use paginar_contas_pagas (páginas) ou buscar_contas_pagas (busca).
+
         Parâmetros
         ----------
         termo: str | None
-            Procura (regex, case-insensitive) em 'assinatura' OU 'fornecedor_norm'.
+            Prefixo de 'assinatura' OU 'fornecedor_norm' (ver _montar_filtro).
         fornecedor : str | None
             Filtro exato por fornecedor normalizado (UPPER, sem acento).
         tokens : list[str] | None
@@ -245,13 +306,220 @@ class RepositorioContasPagas:
         list[dict] | dict   
             Lista de documentos ou dict com total/items.
         """
+        warnings.warn("listar_contas_pagas está obsoleto; use paginar_contas_pagas ou buscar_contas_pagas",
+                      DeprecationWarning, stacklevel=2)
+        query = self._montar_filtro(termo, fornecedor, tokens, conta)
+        projection = self._montar_projecao(campos)
+
+        sort_dir = -1 if descendente else 1
+
+        cursor = (
+            self.collection.find(query, projection)
+            .sort(ordenar_por, sort_dir)
+            .skip(int(skip))
+            .limit(int(limit))
+        )
+        items = list(cursor)
+
+        if retornar_total:
+            total = self._contar(query)
+            return {"total": total, "items": items}
+
+        return items
+
+    def paginar_contas_pagas(
+            self,
+            termo: str | None = None,
+            fornecedor: str | None = None,
+            tokens: list[str] | None = None,
+            conta: str | None = None,
+            limit: int = 100,
+            ordenar_por: str = 'assinatura',
+            descendente: bool = False,
+            campos: list[str] | None = None,
+            continuacao: str | None = None,
+            retornar_total: bool = False,
+            total_estimado: bool = False,
+    ) -> dict:
+        """
+        Paginação por cursor (keyset) sobre (ordenar_por, _id).
+
+        Em vez de skip, cada página devolve em 'proximo' um token opaco que
+        aponta para o último documento entregue; passando-o em 'continuacao'
+        a próxima página começa exatamente dali, com custo constante mesmo
+        em páginas profundas. 'proximo' é None na última página.
+
+        Filtros: termo (prefixo de 'assinatura' ou 'fornecedor_norm'),
+        fornecedor, tokens (todos presentes) e conta. O token só vale para
+        a mesma combinação de filtros e ordenação que o gerou.
+
+        retornar_total : bool
+            Inclui 'total' na resposta. A contagem é feita uma vez e reaproveitada
+            pelas páginas seguintes da mesma consulta (até expirar ou a coleção mudar).
+        total_estimado : bool
+            Sem filtros, usa estimated_document_count() (metadados, sem varrer a coleção).
+
+        Retorna
+        -------
+        dict
+            {'items': [...], 'proximo': str | None} e, se pedido, 'total'.
+        """
+        query = self._montar_filtro(termo, fornecedor, tokens, conta)
+        projection = self._montar_projecao(campos)
+        if projection is not None:
+            projection[ordenar_por] = 1
+
+        sort_dir = -1 if descendente else 1
+        assinatura_consulta = self._assinar_consulta(query, ordenar_por, sort_dir)
+
+        filtro_pagina = query
+        if continuacao:
+            filtro_pagina = {"$and": [query, self._filtro_continuacao(
+                continuacao, assinatura_consulta, ordenar_por, sort_dir)]}
+
+        ordenacao = [(ordenar_por, sort_dir)]
+        if ordenar_por not in CAMPOS_ORDENACAO_UNICOS:
+            ordenacao.append(("_id", sort_dir))
+
+        # Busca um a mais para saber se existe próxima página
+        items = list(
+            self.collection.find(filtro_pagina, projection)
+            .sort(ordenacao)
+            .limit(int(limit) + 1)
+        )
+
+        proximo = None
+        if len(items) > int(limit):
+            items = items[:int(limit)]
+            ultimo = items[-1]
+            proximo = self._gerar_continuacao(
+                assinatura_consulta, _valor_campo(ultimo, ordenar_por), ultimo["_id"])
+
+        if campos and ordenar_por not in campos:
+            for item in items:
+                item.pop(ordenar_por, None)
+
+        resposta = {"items": items, "proximo": proximo}
+        if retornar_total:
+            resposta["total"] = self._contar(query, total_estimado)
+        return resposta
+
+    def buscar_contas_pagas(self, termo: str, limit: int = 20, campos: list[str] | None = None) -> list[dict]:
+        """
+        Busca interativa por relevância em 'assinatura', 'fornecedor_norm' e 'tokens'.
+
+        Combina duas consultas que usam índice:
+        - prefixo: regex ancorada (^TERMO) sobre os campos já normalizados,
+          resolvida por varredura de intervalo nos índices de cada campo;
+        - texto: $text no índice 'tx_busca', que encontra palavras em
+          qualquer posição e fornece a pontuação textScore.
+        O resultado é ordenado por '_score' (textScore + bônus para acertos
+        exatos/prefixo na assinatura e no fornecedor).
+        """
+        termo_norm = normalizar_texto(termo)
+        if not termo_norm:
+            return []
+
+        projection = self._montar_projecao(campos)
+        if projection is not None:
+            projection.update({"assinatura": 1, "fornecedor_norm": 1, "tokens": 1})
+
+        candidatos = {}
+
+        prefixo = {"$regex": "^" + re.escape(termo_norm)}
+        cursor = self.collection.find(
+            {"$or": [{"assinatura": prefixo}, {"fornecedor_norm": prefixo}, {"tokens": prefixo}]},
+            projection,
+        ).limit(int(limit) * 5)
+        for doc in cursor:
+            candidatos[doc["_id"]] = doc
+
+        projection_texto = dict(projection or {})
+        projection_texto["_score"] = {"$meta": "textScore"}
+        try:
+            cursor = (
+                self.collection.find({"$text": {"$search": termo_norm}}, projection_texto)
+                .sort([("_score", {"$meta": "textScore"})])
+                .limit(int(limit) * 5)
+            )
+            for doc in cursor:
+                candidatos.setdefault(doc["_id"], {}).update(doc)
+        except OperationFailure:
+            # Sem índice de texto (ex.: antes da reconciliação): fica só o prefixo
+            pass
+
+        for doc in candidatos.values():
+            doc["_score"] = float(doc.get("_score") or 0.0) + _bonus_busca(doc, termo_norm)
+
+        resultado = sorted(candidatos.values(), key=lambda d: d["_score"], reverse=True)
+        return resultado[:int(limit)]
+
+    def _montar_documento(self, chave, valor, now) -> dict:
+        return {
+            "assinatura": chave,
+            "fornecedor_norm": valor.get('fornecedor_norm'),
+            "tokens": valor.get('tokens') or [],
+            "conta_despesa": valor['conta_despesa'],
+            "origem": valor.get('origem', 'manual'),
+            "stats": {'aplicacoes': 0},
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def _montar_definicao(self, chave, valor, existente: bool, incrementar_aplicacoes: int = 0) -> dict:
+        """Monta o update do upsert de definir_contas_pagas/definir_muitas."""
+        set_doc = {k: v for k, v in valor.items() if k in CAMPOS_ALTERAVEIS_CONTAS_PAGAS}
+
+        # Normalização opcional dos tokens (lista de strings, sem vazios, uppercase, únicos)
+        if "tokens" in set_doc and set_doc["tokens"] is not None:
+            set_doc["tokens"] = normalizar_tokens(set_doc["tokens"])
+
+        set_doc["updated_at"] = datetime.utcnow()
+
+        set_on_insert = {
+            "assinatura": chave,
+            "created_at": datetime.utcnow(),
+            "stats": {'aplicacoes': 0},
+            # origem default só no insert (pode vir em set_doc para update)
+            "origem": valor.get('origem', 'manual'),
+        }
+        # Em insert, gravar também conta_despesa (já validada acima)
+        if not existente and "conta_despesa" in valor:
+            set_on_insert["conta_despesa"] = valor["conta_despesa"]
+        # Opcionalmente povoar fornecedor_norm/tokens no insert, se fornecidos
+        if "fornecedor_norm" in valor and valor["fornecedor_norm"]:
+            set_on_insert["fornecedor_norm"] = str(
+                valor["fornecedor_norm"]).strip().upper()
+        if "tokens" in set_doc and not existente:
+            set_on_insert["tokens"] = set_doc["tokens"]
+
+        # O Mongo recusa o mesmo campo em $set e $setOnInsert ("would create a
+        # conflict"); o que já vai no $set vale também para o insert.
+        if set_doc.get("fornecedor_norm"):
+            set_doc["fornecedor_norm"] = set_on_insert["fornecedor_norm"]
+        set_on_insert = {k: v for k, v in set_on_insert.items() if k not in set_doc}
+
+        update_ops = {"$set": set_doc, "$setOnInsert": set_on_insert}
+        if incrementar_aplicacoes > 0:
+            # No insert o próprio $inc cria stats.aplicacoes
+            set_on_insert.pop("stats", None)
+            update_ops["$inc"] = {
+                "stats.aplicacoes": int(incrementar_aplicacoes)}
+        return update_ops
+
+    def _assinaturas_existentes(self, chaves: list[str]) -> set[str]:
+        documentos = self.collection.find({"assinatura": {"$in": chaves}}, {"_id": 0, "assinatura": 1})
+        return {documento["assinatura"] for documento in documentos}
+
+    def _montar_filtro(self, termo, fornecedor, tokens, conta) -> dict:
         query = {}
 
         if termo:
-            # Busca em assinatura OU fornecedor_norm
-            rx = re.compile(
-                re.escape(str(termo).strip().upper()), re.IGNORECASE)
-            query["$or"] = [{"assinatura": rx}, {"fornecedor_norm": rx}]
+            # Prefixo em assinatura OU fornecedor_norm: os campos já estão
+            # normalizados, então a regex ancorada e sem IGNORECASE percorre só
+            # um intervalo dos índices; palavras no meio ficam com buscar_contas_pagas
+            prefixo = {"$regex": "^" + re.escape(normalizar_texto(termo))}
+            query["$or"] = [{"assinatura": prefixo}, {"fornecedor_norm": prefixo}]
 
         if fornecedor:
             query["fornecedor_norm"] = str(fornecedor).strip().upper()
@@ -265,24 +533,101 @@ class RepositorioContasPagas:
             if norm_tokens:
                 query["tokens"] = {"$all": norm_tokens}
 
+        return query
+
+    def _montar_projecao(self, campos):
         projection = None
         if campos:
             projection = {c: 1 for c in campos}
             # Para ocultar o _id, descomente:
             # projection["_id"] = 0
+        return projection
 
-        sort_dir = -1 if descendente else 1
-
-        cursor = (
-            self.collection.find(query, projection)
-            .sort(ordenar_por, sort_dir)
-            .skip(int(skip))
-            .limit(int(limit))
-        )
-        items = list(cursor)
-
-        if retornar_total:
-            total = self.collection.count_documents(query)
-            return {"total": total, "items": items}
-
-        return items
+    def _contar(self, query: dict, estimado: bool = False) -> int:
+        """
+        Conta os documentos da consulta reaproveitando contagens recentes.
+        O cache é compartilhado pelo processo e esvaziado a cada escrita
+        deste processo; as de outros (ex.: importações em lote paralelas)
+        são percebidas pela marca da coleção (ver _marca_colecao).
+        """
+        if estimado and not query:
+            return self.collection.estimated_document_count()
+
+        chave = json_util.dumps(query, sort_keys=True)
+        marca = self._marca_colecao()
+        em_cache = _cache_totais.get(chave)
+        if em_cache and em_cache[1] > time.monotonic() and em_cache[2] == marca:
+            return em_cache[0]
+
+        total = self.collection.count_documents(query)
+        _cache_totais[chave] = (total, time.monotonic() + TTL_TOTAIS, marca)
+        return total
+
+    def _marca_colecao(self):
+        # Quantidade de documentos (metadados) e última alteração (ix_updated_at_id):
+        # duas leituras baratas que mudam com qualquer inclusão, alteração ou exclusão
+        ultimo = self.collection.find_one({}, {"_id": 0, "updated_at": 1},
+                                          sort=[("updated_at", -1), ("_id", -1)])
+        return self.collection.estimated_document_count(), (ultimo or {}).get("updated_at")
+
+    def _assinar_consulta(self, query, ordenar_por, sort_dir) -> str:
+        texto = json_util.dumps([query, ordenar_por, sort_dir], sort_keys=True)
+        return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:16]
+
+    def _gerar_continuacao(self, assinatura_consulta, valor, _id) -> str:
+        conteudo = json_util.dumps({"q": assinatura_consulta, "v": valor, "id": _id})
+        return base64.urlsafe_b64encode(conteudo.encode("utf-8")).decode("ascii")
+
+    def _filtro_continuacao(self, continuacao, assinatura_consulta, ordenar_por, sort_dir) -> dict:
+        try:
+            conteudo = json_util.loads(base64.urlsafe_b64decode(continuacao.encode("ascii")))
+        except (ValueError, TypeError):
+            raise ValueError("token de continuação inválido")
+
+        if conteudo.get("q") != assinatura_consulta:
+            raise ValueError("token de continuação pertence a outra consulta")
+
+        op = "$lt" if sort_dir < 0 else "$gt"
+        if ordenar_por == "_id":
+            return {"_id": {op: conteudo["id"]}}
+        if ordenar_por in CAMPOS_ORDENACAO_UNICOS:
+            return {ordenar_por: {op: conteudo["v"]}}
+
+        # Nulos (ou campo ausente) vêm antes de qualquer valor na ordenação do
+        # Mongo, mas $gt/$lt com None ou com um texto nunca os alcançam: a
+        # faixa dos nulos é tratada à parte para não perder páginas
+        empate = {ordenar_por: conteudo["v"], "_id": {op: conteudo["id"]}}
+        if conteudo["v"] is None:
+            if sort_dir < 0:
+                return empate
+            return {"$or": [{ordenar_por: {"$ne": None}}, empate]}
+        continuacao_valor = [{ordenar_por: {op: conteudo["v"]}}, empate]
+        if sort_dir < 0:
+            continuacao_valor.append({ordenar_por: None})
+        return {"$or": continuacao_valor}
+
+
+def _bonus_busca(doc: dict, termo: str) -> float:
+    bonus = 0.0
+    assinatura = doc.get("assinatura") or ""
+    fornecedor = doc.get("fornecedor_norm") or ""
+    if assinatura == termo:
+        bonus += 10
+    elif assinatura.startswith(termo):
+        bonus += 5
+    if fornecedor == termo:
+        bonus += 4
+    elif fornecedor.startswith(termo):
+        bonus += 3
+    if any(str(t).startswith(termo) for t in doc.get("tokens") or []):
+        bonus += 1
+    return bonus
+
+
+def _valor_campo(documento: dict, caminho: str):
+    valor = documento
+    for parte in caminho.split("."):
+        if not isinstance(valor, dict):
+            return None
+        valor = valor.get(parte)
+    return valor
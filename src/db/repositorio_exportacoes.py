@@ -0,0 +1,65 @@
+from datetime import datetime
+from pymongo.errors import BulkWriteError
+from src.db.base_repositorio import BaseRepositorioMongo
+from src.db.interfaces import BaseRepositorioExportacoes
+from src.instrumentacao import instrumentar_metodos
+
+# Quantidade de impressões por consulta $in / inserção em lote
+TAMANHO_LOTE = 50_000
+
+
+@instrumentar_metodos("db.exportacoes")
+class RepositorioExportacoes(BaseRepositorioMongo, BaseRepositorioExportacoes):
+    """
+    Registro das linhas de origem já exportadas para o Domínio, por
+    cliente e layout (tarifas, receitas...). Cada documento guarda só a
+    impressão digital (int64) da linha normalizada; o índice único
+    (cliente, layout, impressao) garante que a mesma linha não seja
+    registrada duas vezes.
+    """
+
+    colecao = "exportacoes"
+
+    def obter_exportadas(self, cliente: str, layout: str, impressoes) -> set:
+        """Quais das impressões informadas já foram exportadas (consultas $in em lote)."""
+        impressoes = list(impressoes)
+        exportadas = set()
+        for inicio in range(0, len(impressoes), TAMANHO_LOTE):
+            documentos = self.collection.find(
+                {"cliente": cliente, "layout": layout,
+                 "impressao": {"$in": impressoes[inicio:inicio + TAMANHO_LOTE]}},
+                {"_id": 0, "impressao": 1}
+            )
+            exportadas.update(documento["impressao"] for documento in documentos)
+        return exportadas
+
+    def registrar_exportadas(self, cliente: str, layout: str, impressoes) -> int:
+        """
+        Grava as impressões com insert_many não ordenado. Impressões já
+        registradas (ex.: duas execuções simultâneas) são ignoradas.
+        Retorna quantas foram de fato inseridas.
+        """
+        impressoes = list(impressoes)
+        agora = datetime.utcnow()
+        inseridas = 0
+
+        for inicio in range(0, len(impressoes), TAMANHO_LOTE):
+            documentos = [
+                {"cliente": cliente, "layout": layout, "impressao": impressao, "exportado_em": agora}
+                for impressao in impressoes[inicio:inicio + TAMANHO_LOTE]
+            ]
+            try:
+                inseridas += len(self.collection.insert_many(documentos, ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                if any(erro.get("code") != 11000 for erro in e.details.get("writeErrors", [])):
+                    raise
+                inseridas += e.details.get("nInserted", 0)
+
+        return inseridas
+
+    def limpar(self, cliente: str, layout: str = None) -> int:
+        """Esquece as exportações do cliente (ou de um layout dele), para reexportar."""
+        filtro = {"cliente": cliente}
+        if layout is not None:
+            filtro["layout"] = layout
+        return self.collection.delete_many(filtro).deleted_count
@@ -1,25 +1,31 @@
-from .conexao import obter_client
+from .base_repositorio import BaseRepositorioMongo
+from .interfaces import BaseRepositorioParametros
+from .cache_parametros import cache_parametros
+from src.instrumentacao import instrumentar_metodos
 
 
-class RepositorioParametros:
+@instrumentar_metodos("db.parametros")
+class RepositorioParametros(BaseRepositorioMongo, BaseRepositorioParametros):
+
+    colecao = "parametros"
 
     def __init__(self):
-        self.client = obter_client()
-        self.db = self.client['contabilidade']
-        self.collection = self.db['parametros']
+        self.cache = cache_parametros
 
     def criar_parametro(self, chave, valor):
         self.collection.insert_one({"chave": chave, "valor": valor})
+        self.cache.definir(chave, valor)
 
     def obter_parametro(self, chave):
-        documento = self.collection.find_one({"chave": chave})
-        return documento["valor"] if documento else None
+        return self.cache.obter(chave, self.listar_parametros)
     
     def atualizar_parametro(self, chave, valor):
         self.collection.update_one(
             {"chave": chave},
             {"$set": {"valor": valor}}
         )
+        # Sem upsert a chave pode não existir: melhor reler do banco
+        self.cache.invalidar(chave)
 
     def definir_parametro(self, chave, valor):
         self.collection.update_one(
@@ -27,9 +33,14 @@ class RepositorioParametros:
             {"$set": {"valor": valor}},
             upsert=True
         )
+        self.cache.definir(chave, valor)
 
     def deletar_parametro(self, chave):
         self.collection.delete_one({"chave": chave})
+        self.cache.definir(chave, None)
 
     def listar_parametros(self):
         return list(self.collection.find({}, {"_id": 0}))
+
+    def estatisticas_cache(self):
+        return self.cache.estatisticas()
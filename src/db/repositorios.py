@@ -0,0 +1,73 @@
+import os
+from importlib import import_module
+
+# Backend dos repositórios: mongo (padrão), sqlite ou memoria
+VARIAVEL_BANCO = "CONVERSOR_BANCO"
+BANCO_PADRAO = "mongo"
+
+# Backend -> repositório -> "módulo:Classe". As classes só são importadas
+# quando usadas: com sqlite ou memoria o pymongo nem é carregado.
+BACKENDS = {
+    "mongo": {
+        "contas_bancarias": "src.db.repositorio_contas_bancarias:RepositorioContasBancarias",
+        "parametros": "src.db.repositorio_parametros:RepositorioParametros",
+        "contas_pagas": "src.db.repositorio_contas_pagas:RepositorioContasPagas",
+        "exportacoes": "src.db.repositorio_exportacoes:RepositorioExportacoes",
+    },
+    "sqlite": {
+        "contas_bancarias": "src.db.repositorios_sqlite:RepositorioContasBancariasSqlite",
+        "parametros": "src.db.repositorios_sqlite:RepositorioParametrosSqlite",
+        "contas_pagas": "src.db.repositorios_sqlite:RepositorioContasPagasSqlite",
+        "exportacoes": "src.db.repositorios_sqlite:RepositorioExportacoesSqlite",
+    },
+    "memoria": {
+        "contas_bancarias": "src.db.repositorios_memoria:RepositorioContasBancariasMemoria",
+        "parametros": "src.db.repositorios_memoria:RepositorioParametrosMemoria",
+        "contas_pagas": "src.db.repositorios_memoria:RepositorioContasPagasMemoria",
+        "exportacoes": "src.db.repositorios_memoria:RepositorioExportacoesMemoria",
+    },
+}
+
+
+def banco_configurado() -> str:
+    banco = os.environ.get(VARIAVEL_BANCO) or BANCO_PADRAO
+    if banco not in BACKENDS:
+        raise ValueError(f"Banco desconhecido em {VARIAVEL_BANCO}: {banco} (use {', '.join(BACKENDS)})")
+    return banco
+
+
+def criar_repositorio(nome: str, banco: str = None):
+    """Instância do repositório `nome` no backend configurado (ou no informado)."""
+    modulo, classe = BACKENDS[banco or banco_configurado()][nome].split(":")
+    return getattr(import_module(modulo), classe)()
+
+
+def repositorio_contas_bancarias():
+    return criar_repositorio("contas_bancarias")
+
+
+def repositorio_parametros():
+    return criar_repositorio("parametros")
+
+
+def repositorio_contas_pagas():
+    """Vínculos de contas pagas com o que a importação usa (todos os backends)."""
+    return criar_repositorio("contas_pagas")
+
+
+def repositorio_gestao_contas_pagas():
+    """
+    Vínculos de contas pagas com cadastro, listagem paginada e busca
+    (BaseGestaoContasPagas). ValueError se o backend configurado não oferece.
+    """
+    from src.db.interfaces import BaseGestaoContasPagas
+
+    repositorio = repositorio_contas_pagas()
+    if not isinstance(repositorio, BaseGestaoContasPagas):
+        raise ValueError(f"O banco '{banco_configurado()}' não oferece a gestão de contas pagas "
+                         f"(cadastro, listagem e busca); use {VARIAVEL_BANCO}=mongo")
+    return repositorio
+
+
+def repositorio_exportacoes():
+    return criar_repositorio("exportacoes")
@@ -0,0 +1,170 @@
+import copy
+from datetime import datetime
+
+from src.db.interfaces import (BaseRepositorioContasBancarias, BaseRepositorioContasPagas,
+                               BaseRepositorioExportacoes, BaseRepositorioParametros)
+from src.instrumentacao import instrumentar_metodos
+
+# "Banco" do processo, compartilhado por todas as instâncias dos repositórios.
+# Não é persistido nem visto por outros processos (cada processo da
+# importação em paralelo tem a sua cópia).
+_dados = {
+    "contas_bancarias": {},
+    "parametros": {},
+    "contas_pagas": {},
+    "exportacoes": {},
+}
+
+
+def limpar_memoria():
+    """Esvazia o banco em memória (ex.: entre testes ou execuções de benchmark)."""
+    for tabela in _dados.values():
+        tabela.clear()
+
+
+@instrumentar_metodos("db.contas_bancarias")
+class RepositorioContasBancariasMemoria(BaseRepositorioContasBancarias):
+    """Backend em memória, para testes e benchmarks."""
+
+    def __init__(self):
+        self.contas = _dados["contas_bancarias"]
+
+    def criar_contas_bancarias(self, chave, valor):
+        if chave in self.contas:
+            raise ValueError(f"conta bancária '{chave}' já cadastrada")
+        self.contas[chave] = valor
+
+    def obter_contas_bancarias(self, chave):
+        return self.contas.get(chave)
+
+    def obter_muitas_contas_bancarias(self, chaves):
+        return {chave: self.contas[chave] for chave in dict.fromkeys(chaves)
+                if self.contas.get(chave) is not None}
+
+    def atualizar_contas_bancarias(self, chave, valor):
+        if chave in self.contas:
+            self.contas[chave] = valor
+
+    def definir_contas_bancarias(self, chave, valor):
+        self.contas[chave] = valor
+
+    def definir_muitas_contas_bancarias(self, contas: dict) -> int:
+        self.contas.update(contas)
+        return len(contas)
+
+    def deletar_contas_bancarias(self, chave):
+        self.contas.pop(chave, None)
+
+    def listar_contas_bancarias(self):
+        return [{"numero_conta": chave, "conta_contabil_banco": valor} for chave, valor in self.contas.items()]
+
+
+@instrumentar_metodos("db.parametros")
+class RepositorioParametrosMemoria(BaseRepositorioParametros):
+    """Backend em memória, para testes e benchmarks."""
+
+    def __init__(self):
+        self.parametros = _dados["parametros"]
+
+    def criar_parametro(self, chave, valor):
+        if chave in self.parametros:
+            raise ValueError(f"parâmetro '{chave}' já cadastrado")
+        self.parametros[chave] = valor
+
+    def obter_parametro(self, chave):
+        return self.parametros.get(chave)
+
+    def atualizar_parametro(self, chave, valor):
+        if chave in self.parametros:
+            self.parametros[chave] = valor
+
+    def definir_parametro(self, chave, valor):
+        self.parametros[chave] = valor
+
+    def deletar_parametro(self, chave):
+        self.parametros.pop(chave, None)
+
+    def listar_parametros(self):
+        return [{"chave": chave, "valor": valor} for chave, valor in self.parametros.items()]
+
+
+@instrumentar_metodos("db.contas_pagas")
+class RepositorioContasPagasMemoria(BaseRepositorioContasPagas):
+    """Backend em memória, para testes e benchmarks."""
+
+    def __init__(self):
+        super().__init__()
+        self.vinculos = _dados["contas_pagas"]
+
+    def obter_contas_pagas(self, chave: str) -> dict | None:
+        if not chave or not isinstance(chave, str):
+            raise ValueError("assinatura (chave) inválida")
+        documento = self.vinculos.get(chave)
+        # Cópia, como um documento lido do banco
+        return copy.deepcopy(documento) if documento is not None else None
+
+    def definir_muitas(self, itens: dict[str, dict]) -> dict:
+        for chave, valor in itens.items():
+            self._validar_definicao(chave, valor)
+        if not itens:
+            return {"inseridos": 0, "atualizados": 0}
+
+        existentes = {chave for chave in itens if chave in self.vinculos}
+        self._validar_lote(itens, existentes)
+
+        agora = datetime.utcnow()
+        for chave, valor in itens.items():
+            self.vinculos[chave] = self._mesclar_definicao(self.vinculos.get(chave), chave, valor, agora)
+
+        return {"inseridos": len(itens) - len(existentes), "atualizados": len(existentes)}
+
+    def carregar_vinculos(self, atualizados_desde: datetime | None = None):
+        return [
+            {
+                "assinatura": documento["assinatura"],
+                "fornecedor_norm": documento.get("fornecedor_norm"),
+                "tokens": list(documento.get("tokens") or []),
+                "conta_despesa": documento.get("conta_despesa"),
+                "updated_at": documento.get("updated_at"),
+            }
+            for documento in self.vinculos.values()
+            if atualizados_desde is None or documento["updated_at"] >= atualizados_desde
+        ]
+
+    def contar_vinculos(self) -> int:
+        return len(self.vinculos)
+
+    def descarregar_aplicacoes(self) -> int:
+        atualizadas = 0
+        for chave, quantidade in self._aplicacoes_pendentes.items():
+            documento = self.vinculos.get(chave)
+            if documento is not None and quantidade > 0:
+                documento["stats"]["aplicacoes"] += int(quantidade)
+                atualizadas += 1
+        self._aplicacoes_pendentes.clear()
+        return atualizadas
+
+
+@instrumentar_metodos("db.exportacoes")
+class RepositorioExportacoesMemoria(BaseRepositorioExportacoes):
+    """Backend em memória, para testes e benchmarks."""
+
+    def __init__(self):
+        # (cliente, layout) -> impressões exportadas
+        self.exportacoes = _dados["exportacoes"]
+
+    def obter_exportadas(self, cliente: str, layout: str, impressoes) -> set:
+        return self.exportacoes.get((cliente, layout), set()).intersection(impressoes)
+
+    def registrar_exportadas(self, cliente: str, layout: str, impressoes) -> int:
+        registradas = self.exportacoes.setdefault((cliente, layout), set())
+        antes = len(registradas)
+        registradas.update(impressoes)
+        return len(registradas) - antes
+
+    def limpar(self, cliente: str, layout: str = None) -> int:
+        removidas = 0
+        for chave in [chave for chave in self.exportacoes if chave[0] == cliente]:
+            if layout is None or chave[1] == layout:
+                removidas += len(self.exportacoes.pop(chave))
+        return removidas
@@ -0,0 +1,239 @@
+import json
+from datetime import datetime
+
+from src.db.conexao_sqlite import obter_conexao
+from src.db.interfaces import (BaseRepositorioContasBancarias, BaseRepositorioContasPagas,
+                               BaseRepositorioExportacoes, BaseRepositorioParametros)
+from src.instrumentacao import instrumentar_metodos
+
+# Parâmetros por consulta IN (...); o limite do SQLite pode ser de 999
+TAMANHO_LOTE = 500
+
+
+class BaseRepositorioSqlite:
+    """
+    Base dos repositórios no SQLite local: sem servidor, cada consulta é
+    uma busca na chave primária do arquivo. A conexão é aberta na
+    primeira consulta.
+    """
+
+    @property
+    def conexao(self):
+        return obter_conexao()
+
+    def _buscar_em_lotes(self, sql, valores, *parametros):
+        """Executa `sql` (com {marcadores} no IN) em lotes de TAMANHO_LOTE valores."""
+        valores = list(valores)
+        for inicio in range(0, len(valores), TAMANHO_LOTE):
+            lote = valores[inicio:inicio + TAMANHO_LOTE]
+            marcadores = ",".join("?" * len(lote))
+            yield from self.conexao.execute(sql.format(marcadores=marcadores), (*parametros, *lote))
+
+
+@instrumentar_metodos("db.contas_bancarias")
+class RepositorioContasBancariasSqlite(BaseRepositorioSqlite, BaseRepositorioContasBancarias):
+
+    def criar_contas_bancarias(self, chave, valor):
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT INTO contas_bancarias (numero_conta, conta_contabil_banco) VALUES (?, ?)",
+                (chave, valor))
+
+    def obter_contas_bancarias(self, chave):
+        linha = self.conexao.execute(
+            "SELECT conta_contabil_banco FROM contas_bancarias WHERE numero_conta = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def obter_muitas_contas_bancarias(self, chaves):
+        chaves = list(dict.fromkeys(chaves))
+        linhas = self._buscar_em_lotes(
+            "SELECT numero_conta, conta_contabil_banco FROM contas_bancarias "
+            "WHERE numero_conta IN ({marcadores})", chaves)
+        return {numero_conta: conta for numero_conta, conta in linhas if conta is not None}
+
+    def atualizar_contas_bancarias(self, chave, valor):
+        with self.conexao:
+            self.conexao.execute(
+                "UPDATE contas_bancarias SET conta_contabil_banco = ? WHERE numero_conta = ?", (valor, chave))
+
+    def definir_contas_bancarias(self, chave, valor):
+        self.definir_muitas_contas_bancarias({chave: valor})
+
+    def definir_muitas_contas_bancarias(self, contas: dict) -> int:
+        with self.conexao:
+            self.conexao.executemany(
+                "INSERT INTO contas_bancarias (numero_conta, conta_contabil_banco) VALUES (?, ?) "
+                "ON CONFLICT (numero_conta) DO UPDATE SET conta_contabil_banco = excluded.conta_contabil_banco",
+                contas.items())
+        return len(contas)
+
+    def deletar_contas_bancarias(self, chave):
+        with self.conexao:
+            self.conexao.execute("DELETE FROM contas_bancarias WHERE numero_conta = ?", (chave,))
+
+    def listar_contas_bancarias(self):
+        return [{"numero_conta": numero_conta, "conta_contabil_banco": conta}
+                for numero_conta, conta in self.conexao.execute(
+                    "SELECT numero_conta, conta_contabil_banco FROM contas_bancarias")]
+
+
+@instrumentar_metodos("db.parametros")
+class RepositorioParametrosSqlite(BaseRepositorioSqlite, BaseRepositorioParametros):
+
+    def criar_parametro(self, chave, valor):
+        with self.conexao:
+            self.conexao.execute("INSERT INTO parametros (chave, valor) VALUES (?, ?)", (chave, valor))
+
+    def obter_parametro(self, chave):
+        linha = self.conexao.execute("SELECT valor FROM parametros WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def atualizar_parametro(self, chave, valor):
+        with self.conexao:
+            self.conexao.execute("UPDATE parametros SET valor = ? WHERE chave = ?", (valor, chave))
+
+    def definir_parametro(self, chave, valor):
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT INTO parametros (chave, valor) VALUES (?, ?) "
+                "ON CONFLICT (chave) DO UPDATE SET valor = excluded.valor", (chave, valor))
+
+    def deletar_parametro(self, chave):
+        with self.conexao:
+            self.conexao.execute("DELETE FROM parametros WHERE chave = ?", (chave,))
+
+    def listar_parametros(self):
+        return [{"chave": chave, "valor": valor}
+                for chave, valor in self.conexao.execute("SELECT chave, valor FROM parametros")]
+
+
+@instrumentar_metodos("db.contas_pagas")
+class RepositorioContasPagasSqlite(BaseRepositorioSqlite, BaseRepositorioContasPagas):
+
+    COLUNAS = ("assinatura", "fornecedor_norm", "tokens", "conta_despesa", "origem",
+               "aplicacoes", "created_at", "updated_at")
+
+    def obter_contas_pagas(self, chave: str) -> dict | None:
+        if not chave or not isinstance(chave, str):
+            raise ValueError("assinatura (chave) inválida")
+        linha = self.conexao.execute(
+            f"SELECT {', '.join(self.COLUNAS)} FROM contas_pagas WHERE assinatura = ?", (chave,)).fetchone()
+        return self._documento(linha) if linha else None
+
+    def definir_muitas(self, itens: dict[str, dict]) -> dict:
+        for chave, valor in itens.items():
+            self._validar_definicao(chave, valor)
+        if not itens:
+            return {"inseridos": 0, "atualizados": 0}
+
+        linhas = self._buscar_em_lotes(
+            f"SELECT {', '.join(self.COLUNAS)} FROM contas_pagas WHERE assinatura IN ({{marcadores}})",
+            itens)
+        existentes = {linha[0]: self._documento(linha) for linha in linhas}
+        self._validar_lote(itens, existentes)
+
+        agora = datetime.utcnow()
+        documentos = [self._mesclar_definicao(existentes.get(chave), chave, valor, agora)
+                      for chave, valor in itens.items()]
+        with self.conexao:
+            self.conexao.executemany(
+                f"INSERT OR REPLACE INTO contas_pagas ({', '.join(self.COLUNAS)}) "
+                f"VALUES ({', '.join('?' * len(self.COLUNAS))})",
+                [self._linha(documento) for documento in documentos])
+
+        return {"inseridos": len(itens) - len(existentes), "atualizados": len(existentes)}
+
+    def carregar_vinculos(self, atualizados_desde: datetime | None = None):
+        sql = "SELECT assinatura, fornecedor_norm, tokens, conta_despesa, updated_at FROM contas_pagas"
+        parametros = ()
+        if atualizados_desde is not None:
+            # Coberto por ix_contas_pagas_updated_at
+            sql += " WHERE updated_at >= ?"
+            parametros = (_data_texto(atualizados_desde),)
+
+        for assinatura, fornecedor_norm, tokens, conta_despesa, updated_at in self.conexao.execute(sql, parametros):
+            yield {
+                "assinatura": assinatura,
+                "fornecedor_norm": fornecedor_norm,
+                "tokens": json.loads(tokens),
+                "conta_despesa": conta_despesa,
+                "updated_at": _data(updated_at),
+            }
+
+    def contar_vinculos(self) -> int:
+        return self.conexao.execute("SELECT COUNT(*) FROM contas_pagas").fetchone()[0]
+
+    def descarregar_aplicacoes(self) -> int:
+        pendentes = [(int(quantidade), chave) for chave, quantidade in self._aplicacoes_pendentes.items()
+                     if quantidade > 0]
+        self._aplicacoes_pendentes.clear()
+        if not pendentes:
+            return 0
+
+        with self.conexao:
+            cursor = self.conexao.executemany(
+                "UPDATE contas_pagas SET aplicacoes = aplicacoes + ? WHERE assinatura = ?", pendentes)
+        return cursor.rowcount
+
+    def _documento(self, linha) -> dict:
+        assinatura, fornecedor_norm, tokens, conta_despesa, origem, aplicacoes, created_at, updated_at = linha
+        return {
+            "assinatura": assinatura,
+            "fornecedor_norm": fornecedor_norm,
+            "tokens": json.loads(tokens),
+            "conta_despesa": conta_despesa,
+            "origem": origem,
+            "stats": {"aplicacoes": aplicacoes},
+            "created_at": _data(created_at),
+            "updated_at": _data(updated_at),
+        }
+
+    def _linha(self, documento) -> tuple:
+        return (
+            documento["assinatura"],
+            documento.get("fornecedor_norm"),
+            json.dumps(documento.get("tokens") or []),
+            documento.get("conta_despesa"),
+            documento.get("origem"),
+            (documento.get("stats") or {}).get("aplicacoes", 0),
+            _data_texto(documento.get("created_at")),
+            _data_texto(documento.get("updated_at")),
+        )
+
+
+@instrumentar_metodos("db.exportacoes")
+class RepositorioExportacoesSqlite(BaseRepositorioSqlite, BaseRepositorioExportacoes):
+
+    def obter_exportadas(self, cliente: str, layout: str, impressoes) -> set:
+        linhas = self._buscar_em_lotes(
+            "SELECT impressao FROM exportacoes WHERE cliente = ? AND layout = ? AND impressao IN ({marcadores})",
+            (int(impressao) for impressao in impressoes), cliente, layout)
+        return {impressao for impressao, in linhas}
+
+    def registrar_exportadas(self, cliente: str, layout: str, impressoes) -> int:
+        agora = _data_texto(datetime.utcnow())
+        antes = self.conexao.total_changes
+        with self.conexao:
+            # Impressões já registradas (ex.: duas execuções simultâneas) são ignoradas
+            self.conexao.executemany(
+                "INSERT OR IGNORE INTO exportacoes (cliente, layout, impressao, exportado_em) VALUES (?, ?, ?, ?)",
+                ((cliente, layout, int(impressao), agora) for impressao in impressoes))
+        return self.conexao.total_changes - antes
+
+    def limpar(self, cliente: str, layout: str = None) -> int:
+        sql = "DELETE FROM exportacoes WHERE cliente = ?"
+        parametros = (cliente,)
+        if layout is not None:
+            sql += " AND layout = ?"
+            parametros += (layout,)
+        with self.conexao:
+            return self.conexao.execute(sql, parametros).rowcount
+
+
+def _data_texto(data):
+    # Sempre com microssegundos, para que a ordem do texto seja a das datas
+    return data.isoformat(timespec="microseconds") if data is not None else None
+
+
+def _data(texto):
+    return datetime.fromisoformat(texto) if texto else None
@@ -0,0 +1,188 @@
+import functools
+import json
+import os
+import time
+import tracemalloc
+import types
+
+# Com esta variável de ambiente definida (ex.: =1) a instrumentação já começa ligada
+VARIAVEL_INSTRUMENTACAO = "CONVERSOR_INSTRUMENTACAO"
+
+
+class Instrumentacao:
+    """
+    Tempos, contagem de chamadas e de linhas por etapa (leitura, processamento,
+    banco, escrita) e pico de memória (tracemalloc) de uma execução.
+
+    Desligada, cada ponto instrumentado custa só a verificação de `ativo`.
+    Os tempos são inclusivos: uma etapa que chama outra soma o tempo das duas.
+    Em geradores conta-se só o tempo gasto produzindo os itens, não o de
+    quem os consome.
+    """
+
+    def __init__(self):
+        self.ativo = bool(os.environ.get(VARIAVEL_INSTRUMENTACAO))
+        self.memoria = False
+        self._secoes = {}
+        self.reiniciar()
+
+    def ativar(self, memoria: bool = False):
+        """memoria=True liga o tracemalloc, que deixa a execução bem mais lenta."""
+        self.ativo = True
+        self.memoria = memoria
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.reiniciar()
+
+    def desativar(self):
+        self.ativo = False
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memoria = False
+
+    def adicionar_secao(self, nome: str, fonte):
+        """
+        Acrescenta ao relatório a seção `nome`, vinda de fonte.relatorio();
+        fonte.reiniciar() é chamado junto com o reiniciar() daqui.
+        """
+        self._secoes[nome] = fonte
+
+    def reiniciar(self):
+        for fonte in self._secoes.values():
+            fonte.reiniciar()
+        self._etapas = {}
+        self._contadores = {}
+        self._inicio = time.perf_counter()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def registrar(self, nome: str, segundos: float, linhas: int = None):
+        etapa = self._etapas.get(nome)
+        if etapa is None:
+            etapa = self._etapas[nome] = {"chamadas": 0, "segundos": 0.0, "linhas": 0}
+        etapa["chamadas"] += 1
+        etapa["segundos"] += segundos
+        if linhas:
+            etapa["linhas"] += linhas
+
+    def contar(self, nome: str, quantidade: int = 1):
+        if self.ativo:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+
+    def relatorio(self) -> dict:
+        etapas = {nome: dict(dados, segundos=round(dados["segundos"], 4))
+                  for nome, dados in sorted(self._etapas.items(), key=lambda item: -item[1]["segundos"])}
+        relatorio = {
+            "duracao": round(time.perf_counter() - self._inicio, 4),
+            "etapas": etapas,
+            "chamadas_repositorios": sum(dados["chamadas"] for nome, dados in etapas.items()
+                                         if nome.startswith("db.")),
+            "contadores": dict(self._contadores),
+        }
+        if tracemalloc.is_tracing():
+            atual, pico = tracemalloc.get_traced_memory()
+            relatorio["memoria"] = {"atual_bytes": atual, "pico_bytes": pico}
+        for nome, fonte in self._secoes.items():
+            relatorio[nome] = fonte.relatorio()
+        return relatorio
+
+    def exibir(self, relatorio: dict = None):
+        relatorio = relatorio or self.relatorio()
+        print(f"\n=== Instrumentação ({relatorio['duracao']}s) ===")
+        print(f"{'etapa':<60} {'chamadas':>9} {'linhas':>10} {'segundos':>10}")
+        for nome, dados in relatorio["etapas"].items():
+            print(f"{nome:<60} {dados['chamadas']:>9} {dados['linhas']:>10} {dados['segundos']:>10.4f}")
+        print(f"Chamadas aos repositórios: {relatorio['chamadas_repositorios']}")
+        for nome, quantidade in relatorio["contadores"].items():
+            print(f"{nome}: {quantidade}")
+        if "memoria" in relatorio:
+            print(f"Pico de memória: {relatorio['memoria']['pico_bytes'] / 1024 / 1024:.1f} MB")
+        for nome, fonte in self._secoes.items():
+            if nome in relatorio:
+                fonte.exibir(relatorio[nome])
+
+    def salvar(self, caminho_arquivo, relatorio: dict = None):
+        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio or self.relatorio(), arquivo, ensure_ascii=False, indent=2)
+
+
+instrumentacao = Instrumentacao()
+
+
+def medir(nome: str = None, contar_linhas=None):
+    """
+    Decorador que registra tempo, chamadas e linhas de uma função ou método.
+    - nome: rótulo da etapa (padrão: nome qualificado da função);
+    - contar_linhas: função resultado -> quantidade de linhas (padrão: len de
+      DataFrames e listas; itens de geradores contam 1 cada, ou len se forem
+      blocos).
+    Se a função devolver um gerador, o tempo é medido a cada item produzido.
+    """
+    def decorador(funcao):
+        rotulo = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not instrumentacao.ativo:
+                return funcao(*args, **kwargs)
+
+            inicio = time.perf_counter()
+            resultado = funcao(*args, **kwargs)
+            segundos = time.perf_counter() - inicio
+
+            if isinstance(resultado, types.GeneratorType):
+                return _medir_gerador(rotulo, resultado, segundos, contar_linhas)
+
+            instrumentacao.registrar(rotulo, segundos, (contar_linhas or _linhas)(resultado))
+            return resultado
+
+        return envolvida
+    return decorador
+
+
+def instrumentar_metodos(prefixo: str, predicado=None):
+    """
+    Decorador de classe: aplica medir() a todos os métodos públicos (ou aos
+    aceitos por predicado(nome)), com rótulos '<prefixo>.<método>'.
+    """
+    def decorador(cls):
+        for nome_metodo, metodo in list(vars(cls).items()):
+            if not isinstance(metodo, types.FunctionType) or nome_metodo.startswith("_"):
+                continue
+            if predicado is not None and not predicado(nome_metodo):
+                continue
+            setattr(cls, nome_metodo, medir(f"{prefixo}.{nome_metodo}")(metodo))
+        return cls
+    return decorador
+
+
+def _medir_gerador(rotulo, gerador, segundos, contar_linhas):
+    linhas = 0
+    try:
+        while True:
+            inicio = time.perf_counter()
+            try:
+                item = next(gerador)
+            except StopIteration:
+                return
+            finally:
+                segundos += time.perf_counter() - inicio
+            linhas += (contar_linhas or _linhas_item)(item) or 0
+            yield item
+    finally:
+        gerador.close()
+        instrumentacao.registrar(rotulo, segundos, linhas)
+
+
+def _linhas(resultado):
+    if isinstance(resultado, (dict, str, bytes)) or not hasattr(resultado, "__len__"):
+        return None
+    return len(resultado)
+
+
+def _linhas_item(item):
+    # Um bloco (lista/DataFrame) são várias linhas; um lançamento (registro
+    # de src/models/lancamentos.py, uma tupla nomeada, ou dict) é uma só
+    if isinstance(item, list) or hasattr(item, "columns"):
+        return len(item)
+    return 1
@@ -1,8 +1,8 @@
-from src.db.repositorio_contas_bancarias import RepositorioContasBancarias
+from src.db.repositorios import repositorio_contas_bancarias
 
 class MenuContasBancarias:
     def __init__(self):
-        self.repo = RepositorioContasBancarias()
+        self.repo = repositorio_contas_bancarias()
 
     def exibir_menu(self):
         while True:
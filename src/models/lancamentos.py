@@ -0,0 +1,99 @@
+from typing import Any, NamedTuple
+
+
+def _campo(self, chave):
+    # Compatível com o dict de antes: lancamento["valor"]; índices continuam valendo
+    if isinstance(chave, str):
+        if chave not in self._fields:
+            raise KeyError(chave)
+        return getattr(self, chave)
+    return tuple.__getitem__(self, chave)
+
+
+def _obter(self, chave, padrao=None):
+    return getattr(self, chave) if chave in self._fields else padrao
+
+
+class LancamentoTarifa(NamedTuple):
+    """
+    Um lançamento de tarifa bancária. Os registros são tuplas nomeadas:
+    sem o dicionário por linha, ocupam uma fração da memória e os campos
+    são lidos por atributo (lancamento.valor) ou, como antes, por chave
+    (lancamento["valor"]).
+    """
+    data: Any
+    valor: Any
+    numero_conta: Any
+    conta_contabil_banco: Any
+    conta_contabil_tarifa: Any
+    # Impressão da linha de origem no controle de exportação (None sem controle)
+    impressao: Any = None
+
+    __getitem__ = _campo
+    get = _obter
+
+
+class LancamentoReceita(NamedTuple):
+    data: Any
+    valor: Any
+    numero_conta: Any
+    conta_contabil_banco: Any
+    conta_transitoria_recebimento: Any
+    nf: Any
+    cliente: Any
+    impressao: Any = None
+
+    __getitem__ = _campo
+    get = _obter
+
+
+class LancamentoApropriacao(NamedTuple):
+    data: Any
+    debito: Any
+    credito: Any
+    valor: Any
+    cd_historico: Any
+    historico: Any
+    impressao: Any = None
+
+    __getitem__ = _campo
+    get = _obter
+
+
+class LancamentoContaPaga(NamedTuple):
+    data: Any
+    valor: Any
+    conta_despesa: Any
+    conta_transitoria_pagamento: Any
+    fornecedor: Any
+    descricao: Any
+    documento: Any
+    assinatura: Any
+    impressao: Any = None
+
+    __getitem__ = _campo
+    get = _obter
+
+
+def registros(tipo, df) -> list:
+    """
+    Converte o DataFrame de um processador em registros do tipo informado,
+    coluna a coluna (sem passar por um dict por linha). Campos ausentes
+    no DataFrame ficam com o valor padrão do registro.
+    """
+    colunas = []
+    for campo in tipo._fields:
+        if campo in df.columns:
+            colunas.append(df[campo].tolist())
+        else:
+            colunas.append([tipo._field_defaults.get(campo)] * len(df))
+    return list(map(tipo._make, zip(*colunas)))
+
+
+# Colunas que podem entrar no agrupamento do modo consolidado (--consolidar),
+# além de data e contas: as de identificação de algum tipo de lançamento
+COLUNAS_CONSOLIDAVEIS = sorted({
+    campo
+    for tipo in (LancamentoTarifa, LancamentoReceita, LancamentoApropriacao, LancamentoContaPaga)
+    for campo in tipo._fields
+} - {"data", "valor", "impressao"})
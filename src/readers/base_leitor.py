@@ -1,7 +1,105 @@
+from operator import itemgetter
+
+from src.readers.cache_planilhas import cache_planilhas
+from src.readers.cache_disco import cache_disco
+from src.readers.esquemas import obter_esquema
+from src.readers.formatos import detectar_formato, ler_csv_em_blocos, linhas_planilha, separar_cabecalho
+from src.instrumentacao import medir
+
+# Quantidade de linhas entregue por vez no modo de leitura em blocos
+TAMANHO_BLOCO_PADRAO = 10_000
+
+
 class BaseLeitor:
+    aba = None
+    # Incrementar ao mudar a limpeza feita pelo leitor: invalida o cache em disco
+    # (o esquema da aba também entra na chave, ver versao_cache)
+    versao = 3
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Cada leitor registra sua aba para que a planilha seja lida numa só passada
+        if cls.aba:
+            cache_planilhas.registrar_aba(cls.aba)
+
     def __init__(self, file_path):
         self.file_path = file_path
 
+    @medir("leitura.ler")
     def ler(self, sheet_name: str):
+        return cache_planilhas.obter(self.file_path, sheet_name)
+
+    @medir("leitura.ler_limpo")
+    def ler_limpo(self, carregar):
+        """DataFrame já limpo da aba, do cache em disco quando a planilha já foi lida."""
+        return cache_disco.obter_df(self.file_path, self.aba, self.versao_cache(), carregar)
+
+    @medir("leitura.ler_limpo_em_blocos")
+    def ler_limpo_em_blocos(self, tamanho_bloco: int, gerar):
+        """Blocos já limpos da aba, do cache em disco quando a planilha já foi lida."""
+        return cache_disco.obter_blocos(self.file_path, self.aba, self.versao_cache(), tamanho_bloco, gerar)
+
+    def versao_cache(self) -> str:
+        """Versão do leitor e esquema da aba: mudar qualquer um dos dois invalida o cache em disco."""
+        return f"{self.versao}|{obter_esquema(self.aba)!r}"
+
+    @medir("leitura.ler_em_blocos")
+    def ler_em_blocos(self, sheet_name: str, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO, linha_cabecalho: int = None):
+        """
+        Lê a aba de forma preguiçosa, entregando DataFrames de no máximo
+        `tamanho_bloco` linhas. Só um bloco fica em memória por vez,
+        independentemente do tamanho da aba (xlsx em modo read-only do
+        openpyxl, CSV em pedaços; o ods é carregado inteiro, ver formatos).
+        Abas com esquema (ver esquemas.py) vêm só com as colunas dele, já
+        tipadas e sem as linhas que não podem ficar vazias.
+        - linha_cabecalho: índice (a partir de 0) da linha com os nomes das
+          colunas; None pula as linhas de título acima do cabeçalho
+        """
+        esquema = obter_esquema(sheet_name)
+
+        if detectar_formato(self.file_path) == "csv":
+            yield from ler_csv_em_blocos(self.file_path, tamanho_bloco, esquema)
+            return
+
+        linhas = linhas_planilha(self.file_path, sheet_name)
+        try:
+            cabecalho, linhas_dados = separar_cabecalho(linhas, linha_cabecalho, esquema)
+            if cabecalho is None:
+                return
+
+            largura = len(cabecalho)
+            if esquema is not None:
+                # Só os valores das colunas do esquema entram no bloco
+                posicoes = list(esquema.posicoes(cabecalho).values())
+                selecionar = itemgetter(*posicoes) if len(posicoes) > 1 else lambda linha: (linha[posicoes[0]],)
+                colunas = list(esquema.colunas)
+            else:
+                selecionar = itemgetter(slice(0, largura))
+                colunas = [str(c).strip() if c is not None else f"Unnamed: {i}"
+                           for i, c in enumerate(cabecalho)]
+
+            bloco = []
+            for linha in linhas_dados:
+                # Linhas totalmente vazias (comuns no fim das abas) são ignoradas
+                if all(valor is None for valor in linha):
+                    continue
+                if len(linha) < largura:
+                    linha = tuple(linha) + (None,) * (largura - len(linha))
+                bloco.append(selecionar(linha))
+                if len(bloco) >= tamanho_bloco:
+                    yield from self._bloco(bloco, colunas, esquema)
+                    bloco = []
+
+            if bloco:
+                yield from self._bloco(bloco, colunas, esquema)
+        finally:
+            linhas.close()
+
+    def _bloco(self, linhas, colunas, esquema):
         import pandas as pd
-        return pd.read_excel(self.file_path, sheet_name=sheet_name)
\ No newline at end of file
+
+        df = pd.DataFrame.from_records(linhas, columns=colunas)
+        if esquema is not None:
+            df = esquema.converter(df)
+        if not df.empty:
+            yield df
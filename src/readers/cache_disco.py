@@ -0,0 +1,178 @@
+import hashlib
+import os
+import pickle
+
+# Pasta das abas já interpretadas e limpas (fora do git)
+PASTA_CACHE_PADRAO = os.path.join("data", "cache", "planilhas")
+
+# Espaço máximo ocupado pelo cache em disco (1 GB)
+LIMITE_BYTES_PADRAO = 1024 * 1024 * 1024
+
+# Com esta variável de ambiente definida (ex.: =1) o cache é ignorado
+VARIAVEL_SEM_CACHE = "CONVERSOR_SEM_CACHE"
+
+# Muda quando o formato dos arquivos de cache muda
+VERSAO_FORMATO = 1
+
+
+class CacheDisco:
+    """
+    Cache persistente das abas já limpas pelos leitores, para que uma nova
+    execução sobre a mesma planilha não interprete o Excel de novo.
+
+    A chave é o hash do conteúdo da planilha (não o caminho nem a data),
+    a aba, a versão do leitor (com o esquema da aba, ver
+    BaseLeitor.versao_cache) e o modo de leitura (completo ou em blocos).
+    Cada entrada é um arquivo com uma sequência de DataFrames em pickle:
+    a leitura em blocos grava e relê bloco a bloco, sem montar a aba
+    inteira. Os arquivos só são lidos deste diretório, criados pelo próprio
+    sistema. Quando o tamanho total passa do limite, as entradas usadas há
+    mais tempo são apagadas.
+    """
+
+    def __init__(self, pasta: str = PASTA_CACHE_PADRAO, limite_bytes: int = LIMITE_BYTES_PADRAO):
+        self.pasta = pasta
+        self.limite_bytes = limite_bytes
+        self.ativo = True
+        # (caminho, mtime, tamanho) -> hash do conteúdo, para não reler o arquivo
+        self._hashes = {}
+
+    @property
+    def habilitado(self) -> bool:
+        return self.ativo and not os.environ.get(VARIAVEL_SEM_CACHE)
+
+    def obter_df(self, file_path, aba: str, versao, carregar):
+        """DataFrame limpo da aba; carregar() só é chamado se não houver cache."""
+        if not self.habilitado:
+            return carregar()
+
+        import pandas as pd
+
+        arquivo = self._arquivo(file_path, aba, versao, "completo")
+        entrada = self._abrir(arquivo)
+        if entrada is not None:
+            with entrada:
+                blocos = list(self._ler(entrada))
+            return blocos[0] if len(blocos) == 1 else pd.concat(blocos)
+
+        df = carregar()
+        self._gravar(arquivo, [df])
+        return df
+
+    def obter_blocos(self, file_path, aba: str, versao, tamanho_bloco: int, gerar):
+        """
+        Versão em blocos: entrega os blocos do cache ou, sem cache, os de
+        gerar(), gravando-os conforme passam. Se a leitura for interrompida,
+        a entrada incompleta é descartada.
+        """
+        if not self.habilitado:
+            yield from gerar()
+            return
+
+        arquivo = self._arquivo(file_path, aba, versao, "blocos")
+        entrada = self._abrir(arquivo)
+        if entrada is not None:
+            with entrada:
+                for bloco in self._ler(entrada):
+                    for inicio in range(0, len(bloco), tamanho_bloco):
+                        yield bloco.iloc[inicio:inicio + tamanho_bloco]
+            return
+
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = f"{arquivo}.{os.getpid()}.tmp"
+        concluido = False
+        try:
+            with open(temporario, "wb") as saida:
+                for bloco in gerar():
+                    pickle.dump(bloco, saida, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield bloco
+            concluido = True
+        finally:
+            if concluido:
+                os.replace(temporario, arquivo)
+                self._respeitar_limite()
+            elif os.path.exists(temporario):
+                os.remove(temporario)
+
+    def limpar(self) -> int:
+        removidos = 0
+        for arquivo, _, _ in self._entradas():
+            self._remover(arquivo)
+            removidos += 1
+        return removidos
+
+    def _arquivo(self, file_path, aba, versao, modo):
+        chave = f"{VERSAO_FORMATO}|{self._hash_conteudo(file_path)}|{aba}|{versao}|{modo}"
+        return os.path.join(self.pasta, hashlib.sha256(chave.encode("utf-8")).hexdigest() + ".pkl")
+
+    def _hash_conteudo(self, file_path):
+        caminho = os.path.abspath(file_path)
+        info = os.stat(caminho)
+        identificacao = (caminho, info.st_mtime_ns, info.st_size)
+
+        if identificacao not in self._hashes:
+            resumo = hashlib.blake2b(digest_size=20)
+            with open(caminho, "rb") as arquivo:
+                for pedaco in iter(lambda: arquivo.read(1 << 20), b""):
+                    resumo.update(pedaco)
+            self._hashes[identificacao] = resumo.hexdigest()
+        return self._hashes[identificacao]
+
+    def _abrir(self, arquivo):
+        # Outro processo pode ter descartado a entrada entre a busca e a leitura
+        try:
+            entrada = open(arquivo, "rb")
+        except FileNotFoundError:
+            return None
+        # Marca a entrada como usada agora (ordem de descarte)
+        os.utime(entrada.fileno())
+        return entrada
+
+    def _ler(self, entrada):
+        while True:
+            try:
+                yield pickle.load(entrada)
+            except EOFError:
+                return
+
+    def _gravar(self, arquivo, blocos):
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = f"{arquivo}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as saida:
+            for bloco in blocos:
+                pickle.dump(bloco, saida, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, arquivo)
+        self._respeitar_limite()
+
+    def _entradas(self):
+        if not os.path.isdir(self.pasta):
+            return []
+        entradas = []
+        for nome in os.listdir(self.pasta):
+            if nome.endswith(".pkl"):
+                caminho = os.path.join(self.pasta, nome)
+                try:
+                    info = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+                entradas.append((caminho, info.st_mtime, info.st_size))
+        return entradas
+
+    def _respeitar_limite(self):
+        entradas = sorted(self._entradas(), key=lambda entrada: entrada[1])
+        total = sum(tamanho for _, _, tamanho in entradas)
+        for caminho, _, tamanho in entradas:
+            if total <= self.limite_bytes:
+                break
+            self._remover(caminho)
+            total -= tamanho
+
+    def _remover(self, caminho):
+        # Com importações em paralelo, outro processo pode ter removido antes
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+
+
+cache_disco = CacheDisco()
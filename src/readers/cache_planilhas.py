@@ -0,0 +1,96 @@
+import os
+from collections import OrderedDict
+
+from src.readers.formatos import ler_abas
+
+# Orçamento padrão de memória para as abas mantidas em cache (512 MB)
+ORCAMENTO_MEMORIA_PADRAO = 512 * 1024 * 1024
+
+# Abas importadas pelo sistema, carregadas juntas na primeira leitura
+ABAS_PADRAO = ("Tarifas bancárias", "Receitas", "Apropriação", "Contas pagas")
+
+
+class CachePlanilhas:
+    """
+    Cache em memória das abas lidas de cada planilha.
+
+    A planilha é aberta uma única vez e todas as abas registradas pelos
+    leitores são interpretadas na mesma passada. A chave de cada entrada é
+    (caminho absoluto, mtime, tamanho), então um arquivo alterado em disco
+    nunca devolve dados antigos. As entradas são descartadas da menos usada
+    para a mais usada sempre que o orçamento de memória é ultrapassado.
+    """
+
+    def __init__(self, orcamento_bytes: int = ORCAMENTO_MEMORIA_PADRAO):
+        self.orcamento_bytes = orcamento_bytes
+        self.abas_registradas = list(ABAS_PADRAO)
+        self._entradas = OrderedDict()
+        self._bytes_em_uso = 0
+
+    def registrar_aba(self, aba: str):
+        if aba not in self.abas_registradas:
+            self.abas_registradas.append(aba)
+
+    def obter(self, file_path, aba: str):
+        """
+        Retorna uma cópia do DataFrame da aba, lendo a planilha se necessário.
+        A cópia permite que cada leitor ajuste o próprio DataFrame sem
+        alterar o que está guardado no cache; com o Copy-on-Write do pandas
+        a cópia rasa basta (os dados só são duplicados se alguém os alterar).
+        """
+        chave = self._chave(file_path)
+        entrada = self._entradas.get(chave)
+
+        if entrada is None or aba not in entrada["abas"]:
+            entrada = self._carregar(chave, file_path, aba, entrada)
+        else:
+            self._entradas.move_to_end(chave)
+
+        return entrada["abas"][aba].copy(deep=False)
+
+    def limpar(self):
+        self._entradas.clear()
+        self._bytes_em_uso = 0
+
+    def _chave(self, file_path):
+        caminho = os.path.abspath(file_path)
+        info = os.stat(caminho)
+        return (caminho, info.st_mtime_ns, info.st_size)
+
+    def _carregar(self, chave, file_path, aba, entrada_existente):
+        # Versões anteriores do mesmo arquivo não serão mais usadas
+        for antiga in [c for c in self._entradas if c[0] == chave[0] and c != chave]:
+            self._remover(antiga)
+
+        abas = dict(entrada_existente["abas"]) if entrada_existente else {}
+
+        # xlsx, ods ou csv (ver formatos.ler_abas)
+        abas.update(ler_abas(file_path, [a for a in self.abas_registradas if a not in abas], aba))
+
+        if entrada_existente:
+            self._remover(chave)
+
+        tamanho = sum(int(df.memory_usage(deep=True).sum())
+                      for df in abas.values())
+        entrada = {"abas": abas, "bytes": tamanho}
+
+        # Uma planilha maior que o orçamento inteiro é usada, mas não guardada
+        if tamanho <= self.orcamento_bytes:
+            self._entradas[chave] = entrada
+            self._bytes_em_uso += tamanho
+            self._respeitar_orcamento()
+
+        return entrada
+
+    def _respeitar_orcamento(self):
+        while self._bytes_em_uso > self.orcamento_bytes and self._entradas:
+            mais_antiga = next(iter(self._entradas))
+            self._remover(mais_antiga)
+
+    def _remover(self, chave):
+        entrada = self._entradas.pop(chave, None)
+        if entrada:
+            self._bytes_em_uso -= entrada["bytes"]
+
+
+cache_planilhas = CachePlanilhas()
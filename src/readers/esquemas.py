@@ -0,0 +1,149 @@
+from typing import NamedTuple
+
+# Tipos das colunas de um esquema
+TEXTO = "texto"
+NUMERO = "numero"
+DATA = "data"
+
+# Linhas procuradas no início da aba até achar o cabeçalho
+LIMITE_LINHAS_CABECALHO = 20
+
+# Datas em texto reconhecidas (regex -> formato); as células de data do Excel já vêm como data
+FORMATOS_DATA = {
+    r"\d{2}/\d{2}/\d{4}": "%d/%m/%Y",
+    r"\d{4}-\d{2}-\d{2}": "%Y-%m-%d",
+}
+
+
+class Esquema(NamedTuple):
+    """
+    Contrato de uma aba: as colunas que o sistema usa, o tipo de cada uma
+    e as que não podem ficar vazias. Os leitores carregam só essas colunas
+    (as demais da planilha do cliente nem são interpretadas), já com o
+    tipo certo.
+
+    O cabeçalho é a primeira linha que traz todas as colunas do esquema:
+    títulos acima dele (como na aba de tarifas da planilha modelo) são
+    pulados, em qualquer formato.
+    """
+    aba: str
+    # Nome da coluna -> TEXTO, NUMERO ou DATA
+    colunas: dict
+    # Linhas sem valor numa destas colunas são descartadas
+    nao_nulas: tuple = ()
+
+    def localizar_cabecalho(self, primeiras_linhas) -> int | None:
+        """Índice da linha do cabeçalho entre as primeiras linhas da aba; None se não houver."""
+        for indice, linha in enumerate(primeiras_linhas[:LIMITE_LINHAS_CABECALHO]):
+            if set(self.colunas) <= {_nome(valor) for valor in linha}:
+                return indice
+        return None
+
+    def posicoes(self, cabecalho) -> dict:
+        """Coluna do esquema -> posição no cabeçalho. ValueError se faltar alguma."""
+        posicoes = {}
+        for posicao, valor in enumerate(cabecalho):
+            posicoes.setdefault(_nome(valor), posicao)
+        faltando = [coluna for coluna in self.colunas if coluna not in posicoes]
+        if faltando:
+            raise ValueError(f"Aba '{self.aba}' sem as colunas: {', '.join(faltando)}")
+        return {coluna: posicoes[coluna] for coluna in self.colunas}
+
+    def nomes_originais(self, cabecalho) -> dict:
+        """Nome da coluna como está no arquivo (ex.: ' LIQUIDO') -> nome do esquema."""
+        posicoes = self.posicoes(cabecalho)
+        return {cabecalho[posicao]: coluna for coluna, posicao in posicoes.items()}
+
+    def colunas_do_tipo(self, tipo: str) -> list:
+        return [coluna for coluna, tipo_coluna in self.colunas.items() if tipo_coluna == tipo]
+
+    def converter(self, df, decimal: str = "."):
+        """
+        Ajusta os tipos que a leitura não entregou prontos e descarta as
+        linhas vazias. Colunas que já vieram no tipo certo (o caso comum)
+        não são tocadas.
+        - decimal: separador decimal dos números em texto, o detectado no
+          CSV (ver formatos._dialeto_csv)
+        """
+        from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype, is_string_dtype
+
+        for coluna, tipo in self.colunas.items():
+            serie = df[coluna]
+            if tipo == TEXTO and not is_string_dtype(serie):
+                df[coluna] = _textos(serie)
+            elif tipo == NUMERO and not is_numeric_dtype(serie):
+                df[coluna] = _numeros(serie, decimal)
+            elif tipo == DATA and not is_datetime64_any_dtype(serie):
+                df[coluna] = _datas(serie)
+
+        df = df.dropna(how="all")
+        if self.nao_nulas:
+            df = df.dropna(subset=list(self.nao_nulas))
+        return df
+
+
+def _nome(valor) -> str:
+    return str(valor).strip() if valor is not None else ""
+
+
+def _textos(serie):
+    # Mesmo texto que a célula teria (1 e 1.0 -> '1', numa coluna lida como
+    # float por ter vazios); vazios continuam vazios
+    return serie.map(_texto_celula, na_action="ignore").astype("string")
+
+
+def _texto_celula(valor) -> str:
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _numeros(serie, decimal):
+    import pandas as pd
+
+    texto = serie.astype(str).str.strip()
+    if decimal == ",":
+        # 1.234,56 -> 1234.56; sem vírgula o valor fica como está (10.50 não vira 1050)
+        com_virgula = texto.str.contains(",", regex=False, na=False)
+        convertidos = texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        texto = texto.where(~com_virgula, convertidos)
+    return pd.to_numeric(texto, errors="coerce")
+
+
+def _datas(serie):
+    import pandas as pd
+
+    texto = serie.astype("string").str.strip()
+    preenchidos = texto.dropna()
+    for padrao, formato in FORMATOS_DATA.items():
+        if not preenchidos.empty and preenchidos.str.fullmatch(padrao).all():
+            return pd.to_datetime(texto, format=formato, errors="coerce")
+    return pd.to_datetime(serie, dayfirst=True, errors="coerce")
+
+
+ESQUEMAS = {esquema.aba: esquema for esquema in (
+    Esquema(
+        "Tarifas bancárias",
+        {"CONTA": TEXTO, "DATA": DATA, "VALOR": NUMERO, "DESCRIÇÃO": TEXTO},
+        nao_nulas=("CONTA", "VALOR"),
+    ),
+    Esquema(
+        "Receitas",
+        {"DATA PAGAMENTO": DATA, "VALOR PAGO": NUMERO, "C/C": TEXTO, "CLIENTE": TEXTO, "NF": TEXTO},
+        nao_nulas=("DATA PAGAMENTO", "VALOR PAGO"),
+    ),
+    Esquema(
+        "Apropriação",
+        {"DATA": DATA, "DEBITO": TEXTO, "CREDITO": TEXTO, "VALOR": NUMERO, "CD HIST": TEXTO, "HIST": TEXTO},
+    ),
+    Esquema(
+        "Contas pagas",
+        {"FORNECEDOR": TEXTO, "DESCRIÇÃO DO SERVICO": TEXTO, "VALOR PAGO": NUMERO, "DATA MOVIMENTO": DATA,
+         "CONTA DE DÉBITO": TEXTO, "DOCUMENTO": TEXTO},
+        nao_nulas=("DATA MOVIMENTO", "VALOR PAGO"),
+    ),
+)}
+
+
+def obter_esquema(aba: str) -> Esquema | None:
+    return ESQUEMAS.get(aba)
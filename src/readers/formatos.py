@@ -0,0 +1,290 @@
+import os
+import re
+from importlib.util import find_spec
+
+from src.readers.esquemas import LIMITE_LINHAS_CABECALHO, NUMERO, TEXTO, obter_esquema
+
+# Extensão -> formato; arquivos sem extensão conhecida são identificados pelo conteúdo
+EXTENSOES = {".xlsx": "xlsx", ".xlsm": "xlsx", ".ods": "ods", ".csv": "csv"}
+MIMETYPE_ODS = b"application/vnd.oasis.opendocument.spreadsheet"
+
+# Engine do pandas para as planilhas (None: o padrão, openpyxl)
+ENGINES = {"xlsx": None, "ods": "odf"}
+
+# Títulos acima do cabeçalho (como na aba de tarifas da planilha modelo):
+# linhas com um único campo preenchido, procuradas nas primeiras linhas
+LIMITE_LINHAS_TITULO = 10
+
+# Bytes lidos do início do CSV para descobrir codificação e separador
+TAMANHO_AMOSTRA_CSV = 64 * 1024
+
+# Números com uma ou duas casas decimais, que revelam o separador decimal do CSV
+# (10,50 e 1.234,5 contra 10.50 e 1,234.5); inteiros e datas não decidem
+NUMERO_VIRGULA_DECIMAL = re.compile(r"[-+]?\d[\d.]*,\d{1,2}")
+NUMERO_PONTO_DECIMAL = re.compile(r"[-+]?\d[\d,]*\.\d{1,2}")
+
+
+def detectar_formato(caminho) -> str:
+    """xlsx, ods ou csv, pela extensão ou, sem extensão conhecida, pelo conteúdo."""
+    formato = EXTENSOES.get(os.path.splitext(str(caminho))[1].lower())
+    if formato:
+        return formato
+
+    import zipfile
+
+    with open(caminho, "rb") as arquivo:
+        inicio = arquivo.read(4)
+    if inicio != b"PK\x03\x04":
+        return "csv"
+    # xlsx e ods são zip; o ods declara o tipo no arquivo 'mimetype'
+    with zipfile.ZipFile(caminho) as pacote:
+        if "mimetype" in pacote.namelist() and pacote.read("mimetype").startswith(MIMETYPE_ODS):
+            return "ods"
+    return "xlsx"
+
+
+def ler_abas(caminho, abas, aba_pedida) -> dict:
+    """
+    Lê de uma vez as `abas` que existirem no arquivo, e sempre `aba_pedida`.
+    Um CSV é uma única tabela e é entregue como a aba pedida.
+    Abas com esquema (ver esquemas.py) vêm só com as colunas do esquema, já
+    tipadas; as demais, como o pandas as interpretar.
+    """
+    formato = detectar_formato(caminho)
+    if formato == "csv":
+        return {aba_pedida: ler_csv(caminho, obter_esquema(aba_pedida))}
+
+    import pandas as pd
+
+    with pd.ExcelFile(caminho, engine=ENGINES[formato]) as planilha:
+        pendentes = [aba for aba in abas if aba in planilha.sheet_names]
+        if aba_pedida not in pendentes:
+            pendentes.append(aba_pedida)
+        return {aba: _ler_aba(planilha, aba, obter_esquema(aba)) for aba in pendentes}
+
+
+def _ler_aba(planilha, aba, esquema):
+    if esquema is None:
+        return planilha.parse(aba)
+
+    # O cabeçalho é procurado numa leitura curta do início da aba
+    inicio = planilha.parse(aba, header=None, nrows=LIMITE_LINHAS_CABECALHO)
+    primeiras = inicio.astype(object).where(inicio.notna(), None).values.tolist()
+    linha_cabecalho = esquema.localizar_cabecalho(primeiras)
+    if linha_cabecalho is None:
+        linha_cabecalho = indice_cabecalho(primeiras)
+    nomes = esquema.nomes_originais(primeiras[linha_cabecalho] if primeiras else [])
+
+    # Só as colunas do esquema são interpretadas; as de texto já chegam como texto
+    df = planilha.parse(aba, header=linha_cabecalho, usecols=list(nomes),
+                        dtype={original: str for original, coluna in nomes.items()
+                               if esquema.colunas[coluna] == TEXTO})
+    return esquema.converter(df.rename(columns=nomes)[list(esquema.colunas)])
+
+
+def linhas_planilha(caminho, aba):
+    """
+    Linhas (tuplas de valores, None nas células vazias) de uma aba de xlsx
+    ou ods. O xlsx é lido em modo read-only, uma linha por vez; o ods não
+    tem leitura em fluxo e a aba é carregada inteira.
+    """
+    if detectar_formato(caminho) == "ods":
+        import pandas as pd
+
+        df = pd.read_excel(caminho, sheet_name=aba, header=None, engine=ENGINES["ods"])
+        yield from df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        return
+
+    from openpyxl import load_workbook
+
+    planilha = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        yield from planilha[aba].iter_rows(values_only=True)
+    finally:
+        planilha.close()
+
+
+def separar_cabecalho(linhas, linha_cabecalho: int = None, esquema=None):
+    """
+    (cabeçalho, demais linhas) de um iterador de linhas.
+    - linha_cabecalho: índice (a partir de 0) da linha com os nomes das
+      colunas; None pula os títulos acima do cabeçalho
+    - esquema: com ele, o cabeçalho é a primeira linha com todas as colunas
+      do esquema (ver Esquema.localizar_cabecalho); sem ele, ou se nenhuma
+      linha tiver, vale indice_cabecalho
+    """
+    linhas = iter(linhas)
+    if linha_cabecalho is not None:
+        for _ in range(linha_cabecalho):
+            next(linhas, None)
+        return next(linhas, None), linhas
+
+    primeiras = []
+    for linha in linhas:
+        primeiras.append(linha)
+        if esquema is not None:
+            if esquema.localizar_cabecalho([linha]) is not None:
+                return linha, linhas
+            if len(primeiras) >= LIMITE_LINHAS_CABECALHO:
+                break
+        elif len(primeiras) > LIMITE_LINHAS_TITULO or _preenchidos(linha) > 1:
+            break
+    if not primeiras:
+        return None, linhas
+    indice = indice_cabecalho(primeiras)
+    return primeiras[indice], _encadear(primeiras[indice + 1:], linhas)
+
+
+def indice_cabecalho(primeiras_linhas) -> int:
+    """Primeira linha com mais de um campo preenchido; 0 se nenhuma tiver."""
+    for indice, linha in enumerate(primeiras_linhas[:LIMITE_LINHAS_TITULO + 1]):
+        if _preenchidos(linha) > 1:
+            return indice
+    return 0
+
+
+def motor_csv() -> str:
+    # O leitor de CSV do pyarrow usa várias threads; sem ele, o parser em C do pandas
+    return "pyarrow" if find_spec("pyarrow") is not None else "c"
+
+
+def ler_csv(caminho, esquema=None):
+    """
+    CSV inteiro num DataFrame, com o mesmo contrato das abas do Excel:
+    colunas pelo cabeçalho (títulos acima dele são pulados) e, com esquema,
+    só as colunas dele, já tipadas. Separador (; , tab |), codificação
+    (UTF-8 ou cp1252) e separador decimal (vírgula ou ponto, pelos números
+    da amostra) são detectados no início do arquivo.
+    """
+    import pandas as pd
+
+    dialeto = _dialeto_csv(caminho, esquema)
+    motor = motor_csv()
+    opcoes = _opcoes_csv(dialeto, esquema)
+    if motor == "pyarrow":
+        # O pyarrow não aceita separador de milhar; os números com ponto ficam para o esquema converter
+        opcoes.pop("thousands", None)
+    df = pd.read_csv(caminho, engine=motor, **opcoes)
+    return _ajustar(df, dialeto, esquema)
+
+
+def ler_csv_em_blocos(caminho, tamanho_bloco: int, esquema=None):
+    """Como ler_csv, em DataFrames de no máximo tamanho_bloco linhas."""
+    import pandas as pd
+
+    dialeto = _dialeto_csv(caminho, esquema)
+    # Leitura em pedaços só existe no parser em C
+    with pd.read_csv(caminho, engine="c", chunksize=tamanho_bloco, **_opcoes_csv(dialeto, esquema)) as pedacos:
+        for bloco in pedacos:
+            bloco = _ajustar(bloco, dialeto, esquema)
+            if not bloco.empty:
+                yield bloco
+
+
+def _dialeto_csv(caminho, esquema) -> dict:
+    import codecs
+    import csv
+
+    with open(caminho, "rb") as arquivo:
+        amostra = arquivo.read(TAMANHO_AMOSTRA_CSV)
+
+    encoding = "utf-8-sig"
+    try:
+        # Decodificação incremental: a amostra pode terminar no meio de um caractere
+        texto = codecs.getincrementaldecoder(encoding)().decode(amostra, final=False)
+    except UnicodeDecodeError:
+        # Excel em português salva CSV em cp1252
+        encoding = "cp1252"
+        texto = amostra.decode(encoding, errors="replace")
+
+    todas = texto.splitlines()
+    if len(amostra) == TAMANHO_AMOSTRA_CSV:
+        # A última linha da amostra pode estar cortada
+        todas = todas[:-1]
+    primeiras = todas[:max(LIMITE_LINHAS_TITULO + 1, LIMITE_LINHAS_CABECALHO)]
+    try:
+        separador = csv.Sniffer().sniff("\n".join(primeiras[:LIMITE_LINHAS_TITULO + 1]),
+                                        delimiters=";,\t|").delimiter
+    except csv.Error:
+        separador = ";"
+
+    linhas = list(csv.reader(primeiras, delimiter=separador))
+    linha_cabecalho = esquema.localizar_cabecalho(linhas) if esquema is not None else None
+    if linha_cabecalho is None:
+        linha_cabecalho = indice_cabecalho(linhas)
+    cabecalho = linhas[linha_cabecalho] if linhas else []
+
+    posicoes = None
+    if esquema is not None and esquema.localizar_cabecalho([cabecalho]) is not None:
+        posicoes = [esquema.posicoes(cabecalho)[coluna] for coluna in esquema.colunas_do_tipo(NUMERO)]
+    dados = csv.reader(todas[linha_cabecalho + 1:], delimiter=separador)
+    virgula, ponto = _contar_decimais(dados, posicoes)
+    if virgula != ponto:
+        decimal = "," if virgula > ponto else "."
+    else:
+        # Sem números com casas decimais na amostra: com ; ou tab como
+        # separador, a vírgula (padrão do Excel em português)
+        decimal = "," if separador != "," else "."
+    return {
+        "encoding": encoding,
+        "separador": separador,
+        "decimal": decimal,
+        # Ponto de milhar só quando a amostra mostrou números como 1.234,56 e
+        # nenhum como 10.50; numa coluna com os dois, o esquema converte cada valor
+        "milhar": "." if decimal == "," and virgula and not ponto else None,
+        "linha_cabecalho": linha_cabecalho,
+        "cabecalho": cabecalho,
+    }
+
+
+def _contar_decimais(linhas, posicoes=None):
+    """
+    (células com vírgula decimal, células com ponto decimal) nas linhas;
+    com posicoes, só nessas colunas (as numéricas do esquema).
+    """
+    virgula = ponto = 0
+    for linha in linhas:
+        celulas = linha if posicoes is None else [linha[posicao] for posicao in posicoes if posicao < len(linha)]
+        for celula in celulas:
+            celula = celula.strip()
+            if NUMERO_VIRGULA_DECIMAL.fullmatch(celula):
+                virgula += 1
+            elif NUMERO_PONTO_DECIMAL.fullmatch(celula):
+                ponto += 1
+    return virgula, ponto
+
+
+def _opcoes_csv(dialeto, esquema) -> dict:
+    opcoes = {
+        "sep": dialeto["separador"],
+        "encoding": dialeto["encoding"],
+        "decimal": dialeto["decimal"],
+        "skiprows": dialeto["linha_cabecalho"],
+    }
+    if dialeto["milhar"]:
+        opcoes["thousands"] = dialeto["milhar"]
+    if esquema is not None:
+        nomes = esquema.nomes_originais(dialeto["cabecalho"])
+        opcoes["usecols"] = list(nomes)
+        opcoes["dtype"] = {original: str for original, coluna in nomes.items()
+                           if esquema.colunas[coluna] == TEXTO}
+    return opcoes
+
+
+def _ajustar(df, dialeto, esquema):
+    if esquema is not None:
+        nomes = esquema.nomes_originais(dialeto["cabecalho"])
+        return esquema.converter(df.rename(columns=nomes)[list(esquema.colunas)], dialeto["decimal"])
+    # Mesmo tratamento da leitura em blocos do Excel: nomes sem espaços nas
+    # pontas e linhas totalmente vazias (;;;;) descartadas
+    df.columns = [str(coluna).strip() for coluna in df.columns]
+    return df.dropna(how="all")
+
+
+def _preenchidos(linha) -> int:
+    return sum(1 for valor in linha if valor is not None and str(valor).strip() != "")
+
+
+def _encadear(primeiras, demais):
+    yield from primeiras
+    yield from demais
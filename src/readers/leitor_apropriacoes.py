@@ -1,11 +1,15 @@
-from src.readers.base_leitor import BaseLeitor
+from src.readers.base_leitor import BaseLeitor, TAMANHO_BLOCO_PADRAO
 
 
 class LeitorApropriacoes(BaseLeitor):
+    aba = "Apropriação"
 
     def ler_apropriacoes(self):
-        self.df = self.ler("Apropriação")
+        self.df = self.ler_limpo(lambda: self.ler(self.aba))
 
         print(self.df.head())
 
         return self.df
+
+    def ler_apropriacoes_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        yield from self.ler_limpo_em_blocos(tamanho_bloco, lambda: self.ler_em_blocos(self.aba, tamanho_bloco))
@@ -1,11 +1,15 @@
-from readers.base_leitor import BaseLeitor
+from src.readers.base_leitor import BaseLeitor, TAMANHO_BLOCO_PADRAO
 
 
 class LeitorContasPagas(BaseLeitor):
+    aba = "Contas pagas"
 
     def ler_contas_pagas(self):
-        self.df = self.ler("Contas pagas")
+        self.df = self.ler_limpo(lambda: self.ler(self.aba))
 
         print(self.df.head())
 
         return self.df
+
+    def ler_contas_pagas_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        yield from self.ler_limpo_em_blocos(tamanho_bloco, lambda: self.ler_em_blocos(self.aba, tamanho_bloco))
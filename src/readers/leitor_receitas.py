@@ -1,12 +1,15 @@
-from src.readers.base_leitor import BaseLeitor
+from src.readers.base_leitor import BaseLeitor, TAMANHO_BLOCO_PADRAO
 
 
 class LeitorReceitas(BaseLeitor):
+    aba = "Receitas"
 
     def ler_receitas(self):
-        self.df = self.ler("Receitas")
-        self.df = self.df.dropna(subset=["DATA PAGAMENTO", "VALOR PAGO"])
+        self.df = self.ler_limpo(lambda: self.ler(self.aba))
 
         print(self.df.head())
 
         return self.df
+
+    def ler_receitas_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        yield from self.ler_limpo_em_blocos(tamanho_bloco, lambda: self.ler_em_blocos(self.aba, tamanho_bloco))
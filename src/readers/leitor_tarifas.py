@@ -1,19 +1,15 @@
-from src.readers.base_leitor import BaseLeitor
-import pandas as pd
+from src.readers.base_leitor import BaseLeitor, TAMANHO_BLOCO_PADRAO
 
 
 class LeitorTarifas(BaseLeitor):
+    aba = "Tarifas bancárias"
 
     def ler_tarifas(self):
-        self.df = self.ler("Tarifas bancárias")
-
-        self.df.columns = self.df.iloc[0]
-        self.df = self.df.drop(0)
-        self.df = self.df.reset_index(drop=True)
-        self.df = self.df.dropna(subset=["CONTA"])
-        self.df["VALOR"] = pd.to_numeric(self.df["VALOR"], errors='coerce')
-        self.df = self.df.dropna(subset=["VALOR"])
+        self.df = self.ler_limpo(lambda: self.ler(self.aba))
 
         print(self.df.head())
 
         return self.df
+
+    def ler_tarifas_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        yield from self.ler_limpo_em_blocos(tamanho_bloco, lambda: self.ler_em_blocos(self.aba, tamanho_bloco))
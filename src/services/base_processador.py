@@ -0,0 +1,86 @@
+import pandas as pd
+from src.services.pendencias import ResolvedorInterativo
+from src.services.controle_exportacao import COLUNA_IMPRESSAO
+from src.instrumentacao import medir
+from src.models.lancamentos import registros
+
+
+class BaseProcessador:
+    # Estratégia para contas/parâmetros que faltam; ResolvedorLote no modo sem usuário
+    resolvedor = ResolvedorInterativo()
+    # ControleExportacao da importação incremental (None = exporta todas as linhas)
+    controle_exportacao = None
+    # Colunas da aba que identificam uma linha de origem no controle de exportação
+    COLUNAS_IMPRESSAO = []
+    # Registro compacto dos lançamentos do processador (src/models/lancamentos.py)
+    TIPO_LANCAMENTO = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Todo processar_* / iterar_* entra na instrumentação como etapa de processamento
+        for nome, metodo in list(vars(cls).items()):
+            if callable(metodo) and nome.startswith(("processar_", "iterar_")):
+                setattr(cls, nome, medir(f"processamento.{cls.__name__}.{nome}")(metodo))
+
+    def _configurar(self, resolvedor, controle_exportacao):
+        if resolvedor is not None:
+            self.resolvedor = resolvedor
+        if controle_exportacao is not None:
+            self.controle_exportacao = controle_exportacao
+
+    def confirmar(self):
+        """
+        Grava o que o processador acumulou durante a importação (ver
+        ProcessadorContasPagas). Chamado por quem decide que a saída vale.
+        """
+
+    def _filtrar_exportadas(self, df):
+        """Com controle de exportação, mantém só as linhas de origem ainda não exportadas."""
+        if self.controle_exportacao is None:
+            return df
+        colunas = [coluna for coluna in self.COLUNAS_IMPRESSAO if coluna in df.columns]
+        return self.controle_exportacao.filtrar_novas(df, colunas)
+
+    def _levar_impressao(self, resultado, df_origem):
+        # O resultado tem uma linha por linha de origem, na mesma ordem
+        if COLUNA_IMPRESSAO in df_origem:
+            resultado[COLUNA_IMPRESSAO] = df_origem[COLUNA_IMPRESSAO].to_numpy()
+        return resultado
+
+    def _registros(self, df):
+        """Lançamentos do DataFrame como registros TIPO_LANCAMENTO, em vez de um dict por linha."""
+        return registros(self.TIPO_LANCAMENTO, df)
+
+    def _obter_parametro(self, chave, mensagem):
+        valor = self.repo_parametros.obter_parametro(chave)
+
+        if valor is None:
+            valor = self.resolvedor.resolver_parametro(chave, mensagem, self.repo_parametros)
+
+        return valor
+
+    @medir("processamento.busca_contas_bancarias")
+    def _mesclar_contas_bancarias(self, df, coluna_conta: str = "numero_conta"):
+        """
+        Acrescenta 'conta_contabil_banco' ao DataFrame com um único merge.
+        Os números de conta distintos são resolvidos numa só consulta ao
+        repositório; as contas não cadastradas vão juntas para o resolvedor
+        (perguntadas ao usuário, uma vez cada, ou anotadas como pendência).
+        """
+        numeros = pd.unique(df[coluna_conta].dropna()).tolist()
+        contas = self.repo_contas_bancarias.obter_muitas_contas_bancarias(numeros)
+
+        faltantes = [numero for numero in numeros if numero not in contas]
+        if faltantes:
+            contas.update(self.resolvedor.resolver_contas_bancarias(faltantes, self.repo_contas_bancarias))
+
+        # object dos dois lados: números de conta podem vir como texto ou número
+        df_contas = pd.DataFrame({
+            "_chave_conta": pd.Series(list(contas.keys()), dtype=object),
+            "conta_contabil_banco": pd.Series(list(contas.values()), dtype=object),
+        })
+        chaves = df[coluna_conta].astype(object).rename("_chave_conta")
+
+        mesclado = pd.concat([df.reset_index(drop=True), chaves.reset_index(drop=True)], axis=1)
+        mesclado = mesclado.merge(df_contas, how="left", on="_chave_conta", sort=False)
+        return mesclado.drop(columns="_chave_conta")
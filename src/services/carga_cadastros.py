@@ -0,0 +1,43 @@
+import csv
+
+from src.db.repositorios import repositorio_contas_bancarias, repositorio_parametros
+
+
+def ler_csv(caminho_arquivo, colunas) -> list[dict]:
+    """
+    Lê um CSV com cabeçalho (separador ';' ou ',', como o Excel salva)
+    e devolve as linhas com as colunas exigidas preenchidas.
+    """
+    with open(caminho_arquivo, newline="", encoding="utf-8-sig") as arquivo:
+        cabecalho = arquivo.readline()
+        separador = ";" if cabecalho.count(";") >= cabecalho.count(",") else ","
+        arquivo.seek(0)
+        leitor = csv.DictReader(arquivo, delimiter=separador)
+
+        faltando = [c for c in colunas if c not in (leitor.fieldnames or [])]
+        if faltando:
+            raise ValueError(f"{caminho_arquivo}: colunas obrigatórias ausentes: {', '.join(faltando)}")
+
+        linhas = []
+        for linha in leitor:
+            valores = {c: (linha[c] or "").strip() for c in colunas}
+            if all(valores.values()):
+                linhas.append(valores)
+        return linhas
+
+
+def carregar_contas_bancarias(caminho_arquivo, repo=None) -> int:
+    """CSV com as colunas numero_conta e conta_contabil_banco; grava com upsert."""
+    repo = repo or repositorio_contas_bancarias()
+    linhas = ler_csv(caminho_arquivo, ["numero_conta", "conta_contabil_banco"])
+    return repo.definir_muitas_contas_bancarias(
+        {linha["numero_conta"]: linha["conta_contabil_banco"] for linha in linhas})
+
+
+def carregar_parametros(caminho_arquivo, repo=None) -> int:
+    """CSV com as colunas chave e valor; grava com upsert."""
+    repo = repo or repositorio_parametros()
+    linhas = ler_csv(caminho_arquivo, ["chave", "valor"])
+    for linha in linhas:
+        repo.definir_parametro(linha["chave"], linha["valor"])
+    return len(linhas)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from src.instrumentacao import medir
+from src.readers.base_leitor import TAMANHO_BLOCO_PADRAO
+from src.writers.base_lancamentos import blocos_df
+
+
+class Consolidacao:
+    """
+    Etapa opcional entre o processador e o escritor: soma os lançamentos
+    por data, conta de débito, conta de crédito e código do histórico
+    (mais as colunas_consolidacao do escritor e as colunas_extras, ex.:
+    nf e cliente nas receitas), gerando uma linha por grupo em vez de uma
+    por linha da planilha.
+
+    Os valores são somados em centavos inteiros (int64), arredondando cada
+    lançamento como ele sairia no txt, então o total consolidado é
+    exatamente o das linhas de origem; a conferência é feita ao final e
+    uma diferença levanta ValueError.
+    """
+
+    def __init__(self, colunas_extras=()):
+        self.colunas_extras = tuple(colunas_extras)
+        self.linhas_origem = 0
+        self.centavos_origem = 0
+        self.linhas = 0
+        self.centavos = 0
+
+    @medir("consolidacao.consolidar", contar_linhas=lambda df: df.attrs.get("linhas_origem", 0))
+    def consolidar(self, lancamentos, escritor, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> pd.DataFrame:
+        """
+        Consome os lançamentos (DataFrame, lista ou gerador) em blocos e
+        devolve o DataFrame consolidado, na ordem em que cada grupo
+        apareceu. A memória depende da quantidade de grupos, não de linhas.
+        O histórico do escritor passa a ser o das linhas consolidadas.
+        """
+        chaves = None
+        parciais, linhas_parciais = [], 0
+
+        for bloco in blocos_df(lancamentos, tamanho_bloco):
+            if bloco.empty:
+                continue
+            if chaves is None:
+                chaves = self._chaves(escritor, bloco.columns)
+            centavos = _centavos(bloco[escritor.coluna_valor])
+            self.linhas_origem += len(bloco)
+            self.centavos_origem += int(centavos.sum())
+
+            parcial = bloco[chaves].assign(centavos=centavos, quantidade=1)
+            parciais.append(_agrupar(parcial, chaves))
+            linhas_parciais += len(parciais[-1])
+            # Junta os parciais de tempos em tempos para não acumular um por bloco
+            if linhas_parciais > tamanho_bloco and len(parciais) > 1:
+                parciais = [_agrupar(pd.concat(parciais, ignore_index=True), chaves)]
+                linhas_parciais = len(parciais[0])
+
+        if not parciais:
+            return pd.DataFrame()
+
+        consolidado = _agrupar(pd.concat(parciais, ignore_index=True), chaves)
+        self.linhas = len(consolidado)
+        self.centavos = int(consolidado["centavos"].sum())
+        if self.centavos != self.centavos_origem:
+            raise ValueError(f"Total consolidado ({self.centavos} centavos) difere do total de origem "
+                             f"({self.centavos_origem} centavos)")
+
+        escritor.modelo_historico = self._modelo_historico(escritor, chaves)
+        consolidado[escritor.coluna_valor] = consolidado["centavos"] / 100
+        consolidado.attrs["linhas_origem"] = self.linhas_origem
+        return consolidado
+
+    def resumo(self) -> dict:
+        return {
+            "linhas_origem": self.linhas_origem,
+            "linhas": self.linhas,
+            "total_origem": self.centavos_origem / 100,
+            "total": self.centavos / 100,
+        }
+
+    def _chaves(self, escritor, colunas) -> list:
+        chaves = [escritor.coluna_data, escritor.coluna_debito, escritor.coluna_credito,
+                  escritor.coluna_cd_historico, *escritor.colunas_consolidacao, *self.colunas_extras]
+        # Colunas extras que o tipo de lançamento não tem são ignoradas (ex.: nf nas tarifas)
+        return [coluna for coluna in dict.fromkeys(chaves) if coluna is not None and coluna in colunas]
+
+    def _modelo_historico(self, escritor, chaves) -> str:
+        if set(escritor.colunas_historico()) <= set(chaves):
+            return escritor.modelo_historico
+        modelo = escritor.modelo_historico_consolidado
+        if modelo is None or not set(escritor.colunas_historico(modelo)) <= set(chaves):
+            raise ValueError(f"{type(escritor).__name__} não tem histórico para linhas consolidadas "
+                             f"por {', '.join(chaves)}")
+        return modelo
+
+
+def _centavos(valores) -> np.ndarray:
+    # Mesmo arredondamento do valor com duas casas no txt
+    return np.rint(pd.to_numeric(valores).to_numpy(dtype="float64") * 100).astype(np.int64)
+
+
+def _agrupar(df, chaves) -> pd.DataFrame:
+    return (df.groupby(chaves, dropna=False, sort=False)[["centavos", "quantidade"]]
+            .sum()
+            .reset_index())
@@ -0,0 +1,90 @@
+import pandas as pd
+from src.db.repositorios import repositorio_exportacoes
+
+# Coluna com a impressão digital da linha de origem, levada até o lançamento
+COLUNA_IMPRESSAO = "impressao"
+
+
+class ControleExportacao:
+    """
+    Importação incremental de um cliente/layout: descarta as linhas de
+    origem que já foram exportadas e, depois da gravação, registra as novas.
+
+    A impressão digital é calculada por coluna (pandas.util.hash_pandas_object)
+    sobre a linha normalizada: textos sem espaços nas pontas e em
+    maiúsculas, números com 2 casas sempre no mesmo formato (9, 9.0 e '9'
+    dão '9.00', qualquer que seja o dtype do bloco), datas como estão.
+    Linhas idênticas numa mesma planilha são lançamentos distintos, então a
+    ordem da ocorrência (1ª, 2ª...) entra no cálculo; a contagem continua
+    entre os blocos da leitura em fluxo e recomeça no fim do arquivo
+    (confirmar() ou descartar()).
+    """
+
+    def __init__(self, cliente: str, layout: str, repo=None):
+        self.cliente = cliente
+        self.layout = layout
+        self.repo = repo or repositorio_exportacoes()
+        self.ignoradas = 0
+        self._ocorrencias = {}
+        self._pendentes = []
+
+    def calcular_impressoes(self, df, colunas) -> pd.Series:
+        """Impressão de cada linha do bloco."""
+        normalizado = pd.DataFrame({coluna: self._normalizar(df[coluna]) for coluna in colunas})
+        base = pd.util.hash_pandas_object(normalizado, index=False)
+
+        # n-ésima ocorrência da mesma linha, somando as dos blocos anteriores
+        anteriores = base.map(self._ocorrencias).fillna(0).astype("int64")
+        ocorrencia = base.groupby(base, sort=False).cumcount() + anteriores
+        for valor, quantidade in base.value_counts(sort=False).items():
+            self._ocorrencias[valor] = self._ocorrencias.get(valor, 0) + int(quantidade)
+
+        impressoes = pd.util.hash_pandas_object(
+            pd.DataFrame({"base": base.to_numpy(), "ocorrencia": ocorrencia.to_numpy()}), index=False)
+        # uint64 -> int64: o Mongo só guarda inteiros com sinal
+        return pd.Series(impressoes.to_numpy().view("int64"), index=df.index)
+
+    def filtrar_novas(self, df, colunas):
+        """
+        Devolve só as linhas ainda não exportadas, com a coluna 'impressao'.
+        As exportadas são descobertas numa única consulta $in por bloco.
+        """
+        impressoes = self.calcular_impressoes(df, colunas)
+        exportadas = self.repo.obter_exportadas(self.cliente, self.layout, impressoes.tolist())
+
+        df = df.assign(**{COLUNA_IMPRESSAO: impressoes})
+        if not exportadas:
+            return df
+
+        ja_exportadas = impressoes.isin(exportadas)
+        self.ignoradas += int(ja_exportadas.sum())
+        return df[~ja_exportadas]
+
+    def anotar(self, impressao):
+        """Marca uma linha como gravada; só vai ao banco em confirmar()."""
+        self._pendentes.append(int(impressao))
+
+    def confirmar(self) -> int:
+        """
+        Registra, em lote, as linhas anotadas desde a última confirmação.
+        Encerra o arquivo: a contagem de ocorrências recomeça.
+        """
+        pendentes, self._pendentes = self._pendentes, []
+        self._ocorrencias = {}
+        if not pendentes:
+            return 0
+        return self.repo.registrar_exportadas(self.cliente, self.layout, pendentes)
+
+    def descartar(self):
+        self._pendentes = []
+        self._ocorrencias = {}
+
+    def _normalizar(self, serie):
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return serie
+        # Mesmo valor pode vir como 123, 123.0 ou ' 123 ' conforme a leitura;
+        # o formato fixo não depende do dtype da coluna (+ 0.0 tira o -0.00)
+        numeros = pd.to_numeric(serie, errors="coerce")
+        texto = serie.astype("string").str.strip().str.upper()
+        formatados = numeros.round(2).add(0.0).map("{:.2f}".format, na_action="ignore")
+        return texto.where(numeros.isna(), formatados.astype("string")).fillna("")
@@ -0,0 +1,104 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.db.conexao import reiniciar_client
+from src.instrumentacao import instrumentacao
+from src.readers.formatos import EXTENSOES
+from src.services.pipeline import IMPORTACOES, importar_em_lote
+
+# Abas importadas por padrão de cada planilha de cliente
+TIPOS_PADRAO = ("tarifas", "receitas", "apropriacoes")
+
+
+def listar_planilhas(origem: str) -> list[str]:
+    """
+    Aceita uma pasta (todas as .xlsx, .ods e .csv dela) ou um padrão glob
+    (ex.: 'data/input/2025-09/*.xlsx'). Arquivos temporários do Excel
+    ('~$...') são ignorados.
+    """
+    if os.path.isdir(origem):
+        caminhos = [caminho for extensao in EXTENSOES for caminho in glob.glob(os.path.join(origem, "*" + extensao))]
+    else:
+        caminhos = glob.glob(origem)
+    return sorted(caminho for caminho in caminhos
+                  if os.path.isfile(caminho) and not os.path.basename(caminho).startswith("~$"))
+
+
+def importar_planilha(caminho_planilha: str, pasta_saida: str, tipos=TIPOS_PADRAO,
+                      parcial: bool = False, incremental: bool = True, consolidar=None) -> dict:
+    """
+    Importa as abas de uma planilha em modo lote, gravando em
+    <pasta_saida>/<nome da planilha>/. Uma aba com erro não impede as demais.
+    incremental: ignora as linhas já exportadas para o cliente (nome da planilha).
+    consolidar: como em importar_em_lote.
+    """
+    inicio = time.perf_counter()
+    instrumentacao.reiniciar()
+    cliente = os.path.splitext(os.path.basename(caminho_planilha))[0]
+    pasta_cliente = os.path.join(pasta_saida, cliente)
+    os.makedirs(pasta_cliente, exist_ok=True)
+
+    resumo = {"planilha": caminho_planilha, "cliente": cliente, "tipos": {}}
+    for tipo in tipos:
+        inicio_tipo = time.perf_counter()
+        caminho_saida = os.path.join(pasta_cliente, os.path.basename(IMPORTACOES[tipo][3]))
+        try:
+            resultado = importar_em_lote(tipo, caminho_planilha, caminho_saida,
+                                         caminho_saida + ".pendencias.json", parcial,
+                                         cliente=cliente if incremental else None,
+                                         consolidar=consolidar)
+            resumo["tipos"][tipo] = {
+                "linhas": resultado["linhas"],
+                "gravado": resultado["gravado"],
+                "pendente": resultado["pendencias"] is not None,
+                "ja_exportadas": resultado["ja_exportadas"],
+                "consolidacao": resultado["consolidacao"],
+                "erro": None,
+            }
+        except Exception as e:
+            resumo["tipos"][tipo] = {"linhas": 0, "gravado": False, "pendente": False, "ja_exportadas": 0,
+                                     "consolidacao": None, "erro": f"{type(e).__name__}: {e}"}
+        resumo["tipos"][tipo]["segundos"] = round(time.perf_counter() - inicio_tipo, 3)
+
+    resumo["linhas"] = sum(t["linhas"] for t in resumo["tipos"].values())
+    resumo["segundos"] = round(time.perf_counter() - inicio, 3)
+    if instrumentacao.ativo:
+        resumo["instrumentacao"] = instrumentacao.relatorio()
+    return resumo
+
+
+def importar_em_paralelo(origem: str, pasta_saida: str, tipos=TIPOS_PADRAO, processos: int = None,
+                         parcial: bool = False, incremental: bool = True, consolidar=None,
+                         ao_concluir=None) -> list[dict]:
+    """
+    Distribui as planilhas de `origem` entre processos (um por núcleo, por
+    padrão). Cada processo abre o próprio client do Mongo. ao_concluir é
+    chamado com o resumo de cada planilha assim que ela termina.
+    Retorna os resumos na ordem das planilhas.
+    """
+    planilhas = listar_planilhas(origem)
+    if not planilhas:
+        return []
+
+    processos = min(processos or os.cpu_count() or 1, len(planilhas))
+    resumos = {}
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=reiniciar_client) as executor:
+        futuros = {executor.submit(importar_planilha, caminho, pasta_saida, tuple(tipos), parcial,
+                                   incremental, consolidar): caminho
+                   for caminho in planilhas}
+        for futuro in as_completed(futuros):
+            caminho = futuros[futuro]
+            try:
+                resumo = futuro.result()
+            except Exception as e:
+                # Falha do processo inteiro (ex.: processo encerrado), não de uma aba
+                resumo = {"planilha": caminho, "cliente": os.path.basename(caminho), "tipos": {},
+                          "linhas": 0, "segundos": None, "erro": f"{type(e).__name__}: {e}"}
+            resumos[caminho] = resumo
+            if ao_concluir is not None:
+                ao_concluir(resumo)
+
+    return [resumos[caminho] for caminho in planilhas]
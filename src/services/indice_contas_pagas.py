@@ -0,0 +1,173 @@
+import re
+from collections import defaultdict
+
+from src.db.interfaces import normalizar_texto
+
+# Palavras que não ajudam a distinguir um pagamento de outro
+PALAVRAS_IGNORADAS = {
+    "A", "AO", "AS", "COM", "DA", "DAS", "DE", "DO", "DOS", "E", "EM",
+    "NA", "NAS", "NO", "NOS", "O", "OS", "P", "PARA", "POR", "REF", "REFERENTE",
+}
+
+
+def tokenizar(texto) -> list[str]:
+    """
+    Tokens normalizados (UPPER, sem acento), sem palavras vazias e sem repetição.
+    Números puros (competência, parcela, nº de documento) mudam a cada mês e
+    são descartados.
+    """
+    palavras = re.split(r"[^A-Z0-9]+", normalizar_texto(texto))
+    tokens = [p for p in palavras
+              if len(p) >= 2 and not p.isdigit() and p not in PALAVRAS_IGNORADAS]
+    return list(dict.fromkeys(tokens))
+
+
+def montar_assinatura(fornecedor_norm: str, tokens) -> str:
+    """Assinatura canônica do vínculo, ex.: 'RFB|FGTS'."""
+    return f"{fornecedor_norm}|{' '.join(sorted(tokens))}"
+
+
+class IndiceContasPagas:
+    """
+    Índice invertido, em memória, dos vínculos da coleção contas_pagas.
+
+    A coleção é lida uma vez; depois disso cada pagamento é classificado sem
+    nenhuma consulta ao banco:
+    1. assinatura exata (fornecedor + tokens);
+    2. vínculos do mesmo fornecedor, pela maior sobreposição de tokens
+       (um vínculo do fornecedor sem tokens funciona como padrão);
+    3. sem vínculo do fornecedor, vínculos que tenham todos os seus tokens
+       presentes na descrição (token -> assinaturas).
+    As classificações são memorizadas por (fornecedor, tokens), já que os
+    mesmos pagamentos se repetem mês a mês.
+
+    A recarga incremental (atualizar) só enxerga vínculos criados ou
+    alterados; exclusões e trocas de assinatura são percebidas pela
+    contagem de vínculos do banco, que força uma carga completa.
+    """
+
+    def __init__(self, repo_contas_pagas):
+        self.repo = repo_contas_pagas
+        self._por_assinatura = {}
+        self._por_fornecedor = defaultdict(set)
+        self._por_token = defaultdict(set)
+        self._classificados = {}
+        # Assinaturas lidas do banco (as registradas só em memória ficam fora)
+        self._do_banco = set()
+        self._atualizado_ate = None
+        self._carregado = False
+
+    def __len__(self):
+        return len(self._por_assinatura)
+
+    def carregar(self):
+        self._por_assinatura.clear()
+        self._por_fornecedor.clear()
+        self._por_token.clear()
+        self._do_banco.clear()
+        self._classificados.clear()
+        self._atualizado_ate = None
+        self._registrar_todos(self.repo.carregar_vinculos())
+        self._carregado = True
+
+    def atualizar(self):
+        """
+        Recarga incremental: só os vínculos alterados desde a última leitura.
+        Se o banco tem outra quantidade de vínculos que a lida até aqui
+        (exclusão ou troca de assinatura), o índice é recarregado inteiro.
+        Vínculos registrados só em memória (ainda não gravados) são mantidos.
+        """
+        if not self._carregado:
+            self.carregar()
+            return
+
+        self._registrar_todos(self.repo.carregar_vinculos(self._atualizado_ate))
+        if self.repo.contar_vinculos() != len(self._do_banco):
+            so_em_memoria = [vinculo for assinatura, vinculo in self._por_assinatura.items()
+                             if assinatura not in self._do_banco]
+            self.carregar()
+            for vinculo in so_em_memoria:
+                self.registrar(vinculo)
+
+    def registrar(self, vinculo: dict):
+        assinatura = vinculo["assinatura"]
+        if assinatura in self._por_assinatura:
+            self._desindexar(assinatura)
+
+        fornecedor = vinculo.get("fornecedor_norm") or assinatura.split("|")[0]
+        tokens = frozenset(vinculo.get("tokens") or [])
+        self._por_assinatura[assinatura] = {
+            "assinatura": assinatura,
+            "fornecedor_norm": fornecedor,
+            "tokens": tokens,
+            "conta_despesa": vinculo["conta_despesa"],
+        }
+        self._por_fornecedor[fornecedor].add(assinatura)
+        for token in tokens:
+            self._por_token[token].add(assinatura)
+
+        atualizado = vinculo.get("updated_at")
+        if atualizado is not None and (self._atualizado_ate is None or atualizado > self._atualizado_ate):
+            self._atualizado_ate = atualizado
+        self._classificados.clear()
+
+    def remover(self, assinatura: str):
+        if assinatura in self._por_assinatura:
+            self._desindexar(assinatura)
+            self._classificados.clear()
+
+    def classificar(self, fornecedor_norm: str, tokens) -> dict | None:
+        """Retorna o vínculo que melhor atende ao pagamento, ou None."""
+        tokens = frozenset(tokens)
+        chave = (fornecedor_norm, tokens)
+        if chave not in self._classificados:
+            self._classificados[chave] = self._classificar(fornecedor_norm, tokens)
+        return self._classificados[chave]
+
+    def _classificar(self, fornecedor_norm, tokens):
+        exato = self._por_assinatura.get(montar_assinatura(fornecedor_norm, tokens))
+        if exato:
+            return exato
+
+        candidatos = self._por_fornecedor.get(fornecedor_norm)
+        mesmo_fornecedor = bool(candidatos)
+        if not mesmo_fornecedor:
+            candidatos = set().union(*(self._por_token.get(t, ()) for t in tokens))
+
+        melhor, melhor_pontos = None, None
+        for assinatura in candidatos:
+            vinculo = self._por_assinatura[assinatura]
+            tokens_vinculo = vinculo["tokens"]
+            comuns = len(tokens & tokens_vinculo)
+
+            if tokens_vinculo:
+                if comuns == 0:
+                    continue
+                # Fora do fornecedor, só vale se todos os tokens do vínculo aparecem
+                if not mesmo_fornecedor and comuns < len(tokens_vinculo):
+                    continue
+                cobertura = comuns / len(tokens_vinculo)
+            else:
+                if not mesmo_fornecedor:
+                    continue
+                cobertura = 0.5
+
+            pontos = (cobertura, comuns, assinatura)
+            if melhor_pontos is None or pontos > melhor_pontos:
+                melhor, melhor_pontos = vinculo, pontos
+
+        return melhor
+
+    def _registrar_todos(self, vinculos):
+        for vinculo in vinculos:
+            self._do_banco.add(vinculo["assinatura"])
+            if vinculo.get("conta_despesa"):
+                self.registrar(vinculo)
+            else:
+                self.remover(vinculo["assinatura"])
+
+    def _desindexar(self, assinatura):
+        vinculo = self._por_assinatura.pop(assinatura)
+        self._por_fornecedor[vinculo["fornecedor_norm"]].discard(assinatura)
+        for token in vinculo["tokens"]:
+            self._por_token[token].discard(assinatura)
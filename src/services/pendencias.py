@@ -0,0 +1,93 @@
+import json
+
+
+class ResolvedorInterativo:
+    """
+    Resolve contas e parâmetros que faltam perguntando ao usuário (menu).
+    O que é informado já é gravado no banco para as próximas execuções.
+    """
+
+    def resolver_parametro(self, chave, mensagem, repo_parametros):
+        valor = input(mensagem)
+        repo_parametros.criar_parametro(chave, valor)
+        return valor
+
+    def resolver_contas_bancarias(self, faltantes, repo_contas_bancarias) -> dict:
+        print(f"\nContas bancárias sem conta contábil cadastrada: {', '.join(map(str, faltantes))}")
+
+        contas = {}
+        for numero_conta in faltantes:
+            conta_contabil_banco = input(f"Informe a conta contábil para o banco {numero_conta}: ")
+            repo_contas_bancarias.criar_contas_bancarias(numero_conta, conta_contabil_banco)
+            contas[numero_conta] = conta_contabil_banco
+        return contas
+
+    def resolver_vinculos(self, pendentes) -> dict:
+        """pendentes: lista de (assinatura, fornecedor, descricao)."""
+        print(f"\nPagamentos sem conta de despesa vinculada: {len(pendentes)}")
+        for _, fornecedor, descricao in pendentes:
+            print(f" - {fornecedor} | {descricao}")
+
+        return {
+            assinatura: input(f"Informe a conta de despesa para {fornecedor} - {descricao}: ")
+            for assinatura, fornecedor, descricao in pendentes
+        }
+
+    def filtrar_resolvidos(self, df, colunas):
+        return df
+
+    def tem_pendencias(self) -> bool:
+        return False
+
+
+class ResolvedorLote:
+    """
+    Modo sem usuário (linha de comando): nada é perguntado. Tudo o que não
+    pode ser resolvido é anotado num relatório único de pendências e as
+    linhas que dependem disso ficam fora da saída.
+    """
+
+    def __init__(self):
+        self.parametros = {}
+        self.contas_bancarias = []
+        self.vinculos = {}
+        self.linhas_descartadas = 0
+
+    def resolver_parametro(self, chave, mensagem, repo_parametros):
+        self.parametros[chave] = mensagem.strip().rstrip(":")
+        return None
+
+    def resolver_contas_bancarias(self, faltantes, repo_contas_bancarias) -> dict:
+        for numero_conta in faltantes:
+            if numero_conta not in self.contas_bancarias:
+                self.contas_bancarias.append(numero_conta)
+        return {}
+
+    def resolver_vinculos(self, pendentes) -> dict:
+        for assinatura, fornecedor, descricao in pendentes:
+            self.vinculos.setdefault(assinatura, {"fornecedor": fornecedor, "descricao": descricao})
+        return {}
+
+    def filtrar_resolvidos(self, df, colunas):
+        """Remove as linhas que ficaram sem alguma das contas obrigatórias."""
+        resolvidas = df[colunas].notna().all(axis=1)
+        self.linhas_descartadas += int((~resolvidas).sum())
+        return df[resolvidas]
+
+    def tem_pendencias(self) -> bool:
+        return bool(self.parametros or self.contas_bancarias or self.vinculos or self.linhas_descartadas)
+
+    def relatorio(self) -> dict:
+        return {
+            "parametros": [{"chave": chave, "descricao": descricao}
+                           for chave, descricao in self.parametros.items()],
+            "contas_bancarias": [{"numero_conta": str(numero), "conta_contabil_banco": None}
+                                 for numero in self.contas_bancarias],
+            "vinculos_contas_pagas": [dict(assinatura=assinatura, conta_despesa=None, **dados)
+                                      for assinatura, dados in self.vinculos.items()],
+            "linhas_descartadas": self.linhas_descartadas,
+        }
+
+    def salvar_relatorio(self, caminho_arquivo):
+        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+            json.dump(self.relatorio(), arquivo, ensure_ascii=False, indent=2)
@@ -0,0 +1,173 @@
+import os
+import shutil
+from importlib import import_module
+
+from src.readers.base_leitor import TAMANHO_BLOCO_PADRAO
+from src.services.pendencias import ResolvedorLote
+
+# Tipo de importação -> (processador, método gerador, escritor, arquivo de saída padrão).
+# Processador e escritor ficam como "módulo:Classe" e só são importados quando o
+# tipo é usado (obter_importacao): abrir o menu ou a linha de comando não carrega
+# pandas, openpyxl nem pymongo.
+IMPORTACOES = {
+    "tarifas": ("src.services.processador_tarifas:ProcessadorTarifas", "iterar_tarifas",
+                "src.writers.lancamentos_contabeis_tarifas:LancamentosContabeisTarifas",
+                "data/output/lancamentos_contabeis_tarifas.txt"),
+    "receitas": ("src.services.processador_receitas:ProcessadorReceitas", "iterar_receitas",
+                 "src.writers.lancamentos_contabeis_receitas:LancamentosContabeisReceitas",
+                 "data/output/lancamentos_contabeis_receitas.txt"),
+    "apropriacoes": ("src.services.processador_apropriacoes:ProcessadorApropriacoes", "iterar_apropriacoes",
+                     "src.writers.lancamentos_contabeis_apropriacoes:LancamentosContabeisApropriacoes",
+                     "data/output/lancamentos_contabeis_apropriacoes.txt"),
+    "contas_pagas": ("src.services.processador_contas_pagas:ProcessadorContasPagas", "iterar_contas_pagas",
+                     "src.writers.lancamentos_contabeis_contas_pagas:LancamentosContabeisContasPagas",
+                     "data/output/lancamentos_contabeis_contas_pagas.txt"),
+}
+
+
+def obter_importacao(tipo: str) -> tuple:
+    """(classe do processador, método gerador, classe do escritor, saída padrão) do tipo."""
+    if tipo not in IMPORTACOES:
+        raise ValueError(f"Tipo de importação desconhecido: {tipo}")
+    processador, metodo, escritor, saida_padrao = IMPORTACOES[tipo]
+    return _importar_classe(processador), metodo, _importar_classe(escritor), saida_padrao
+
+
+def executar_pipeline(lancamentos, escritor, caminho_arquivo, ao_lancar=None,
+                      linhas_por_bloco: int = TAMANHO_BLOCO_PADRAO) -> int:
+    """
+    Liga um gerador de lançamentos (processador.iterar_*) a um escritor.
+    Cada lançamento passa uma única vez: ao_lancar (ex.: print) é chamado
+    conforme ele chega e o escritor grava a cada linhas_por_bloco, então
+    o pico de memória depende do tamanho do bloco, não da planilha.
+    Retorna a quantidade de linhas gravadas.
+    """
+    if ao_lancar is not None:
+        lancamentos = _observar(lancamentos, ao_lancar)
+
+    return escritor.salvar_txt(lancamentos, caminho_arquivo, linhas_por_bloco)
+
+
+def importar(tipo: str, caminho_planilha: str, caminho_saida: str = None, ao_lancar=None,
+             tamanho_bloco: int = TAMANHO_BLOCO_PADRAO, resolvedor=None,
+             controle_exportacao=None, consolidacao=None, confirmacoes: list = None) -> int:
+    """
+    Executa a importação completa de um tipo (ver IMPORTACOES) em fluxo.
+    Com controle_exportacao, só as linhas ainda não exportadas são
+    processadas e as gravadas ficam anotadas; quem chama decide quando
+    confirmá-las (controle_exportacao.confirmar()).
+    O que o processador aprende (ex.: vínculos de contas pagas) é gravado
+    ao fim da importação; com confirmacoes, a gravação é acrescentada à
+    lista e fica para quem chama, como a do controle de exportação.
+    Com consolidacao (src/services/consolidacao.py), os lançamentos são
+    somados antes de chegar ao escritor; ao_lancar recebe os de origem.
+    """
+    classe_processador, metodo, classe_escritor, saida_padrao = obter_importacao(tipo)
+    processador = classe_processador(caminho_planilha, resolvedor, controle_exportacao)
+    lancamentos = getattr(processador, metodo)(tamanho_bloco)
+
+    if controle_exportacao is not None:
+        from src.services.controle_exportacao import COLUNA_IMPRESSAO
+        lancamentos = _observar(lancamentos, lambda lancamento: controle_exportacao.anotar(
+            getattr(lancamento, COLUNA_IMPRESSAO)))
+
+    escritor = classe_escritor()
+    if consolidacao is not None:
+        if ao_lancar is not None:
+            lancamentos = _observar(lancamentos, ao_lancar)
+            ao_lancar = None
+        lancamentos = consolidacao.consolidar(lancamentos, escritor, tamanho_bloco)
+
+    linhas = executar_pipeline(lancamentos, escritor, caminho_saida or saida_padrao,
+                               ao_lancar, tamanho_bloco)
+    if confirmacoes is None:
+        processador.confirmar()
+    else:
+        confirmacoes.append(processador.confirmar)
+    return linhas
+
+
+def importar_em_lote(tipo: str, caminho_planilha: str, caminho_saida: str = None,
+                     caminho_relatorio: str = None, parcial: bool = False,
+                     tamanho_bloco: int = TAMANHO_BLOCO_PADRAO, cliente: str = None,
+                     consolidar=None) -> dict:
+    """
+    Importação sem usuário. Tudo o que pode ser resolvido é processado; as
+    contas, parâmetros e vínculos que faltam vão para um único relatório de
+    pendências (JSON em caminho_relatorio).
+    As linhas são gravadas num arquivo temporário e só chegam à saída se não
+    houver pendências ou se parcial=True (saída sem as linhas pendentes).
+    Com cliente, a importação é incremental: linhas já exportadas para o
+    cliente são ignoradas e as gravadas na saída são registradas.
+    consolidar: None grava uma linha por lançamento; uma lista (mesmo
+    vazia) grava as linhas consolidadas, agrupadas também pelas colunas
+    informadas (ex.: ["nf", "cliente"]).
+    """
+    from src.services.controle_exportacao import ControleExportacao
+
+    caminho_saida = caminho_saida or IMPORTACOES[tipo][3]
+    temporario = caminho_saida + ".tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+
+    resolvedor = ResolvedorLote()
+    controle = ControleExportacao(cliente, tipo) if cliente else None
+    consolidacao = None
+    if consolidar is not None:
+        from src.services.consolidacao import Consolidacao
+        consolidacao = Consolidacao(consolidar)
+    confirmacoes = []
+    try:
+        linhas = importar(tipo, caminho_planilha, temporario, tamanho_bloco=tamanho_bloco,
+                          resolvedor=resolvedor, controle_exportacao=controle, consolidacao=consolidacao,
+                          confirmacoes=confirmacoes)
+        gravar = parcial or not resolvedor.tem_pendencias()
+        if gravar and os.path.exists(temporario):
+            _anexar(temporario, caminho_saida)
+        if gravar:
+            # Vínculos aprendidos e linhas exportadas só ficam se a saída ficar
+            for confirmar in confirmacoes:
+                confirmar()
+            if controle is not None:
+                controle.confirmar()
+        elif controle is not None:
+            controle.descartar()
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+    if caminho_relatorio:
+        if resolvedor.tem_pendencias():
+            resolvedor.salvar_relatorio(caminho_relatorio)
+        elif os.path.exists(caminho_relatorio):
+            # Relatório de uma execução anterior, já resolvido
+            os.remove(caminho_relatorio)
+
+    return {
+        "tipo": tipo,
+        "linhas": linhas if gravar else 0,
+        "gravado": gravar,
+        "ja_exportadas": controle.ignoradas if controle is not None else 0,
+        "consolidacao": consolidacao.resumo() if consolidacao is not None else None,
+        "pendencias": resolvedor.relatorio() if resolvedor.tem_pendencias() else None,
+    }
+
+
+def _importar_classe(referencia):
+    modulo, classe = referencia.split(":")
+    return getattr(import_module(modulo), classe)
+
+
+def _anexar(origem, destino):
+    # Os escritores gravam em modo append; a saída final mantém esse comportamento
+    if not os.path.exists(destino):
+        os.replace(origem, destino)
+        return
+    with open(origem, "rb") as entrada, open(destino, "ab") as saida:
+        shutil.copyfileobj(entrada, saida, 1 << 20)
+
+
+def _observar(lancamentos, ao_lancar):
+    for lancamento in lancamentos:
+        ao_lancar(lancamento)
+        yield lancamento
@@ -1,35 +1,60 @@
 import pandas as pd
 from src.readers.leitor_apropriacoes import LeitorApropriacoes
-from src.db.repositorio_parametros import RepositorioParametros
-
-class ProcessadorApropriacoes:
-
-    def __init__(self, file_path):
+from src.readers.base_leitor import TAMANHO_BLOCO_PADRAO
+from src.services.base_processador import BaseProcessador
+from src.models.lancamentos import LancamentoApropriacao
+from src.db.repositorios import repositorio_parametros
+
+class ProcessadorApropriacoes(BaseProcessador):
+
+    COLUNAS = {
+        'DATA': "data",
+        'DEBITO': "debito",
+        'CREDITO': "credito",
+        'VALOR': "valor",
+        'CD HIST': "cd_historico",
+        'HIST': "historico",
+    }
+
+    COLUNAS_IMPRESSAO = list(COLUNAS)
+    TIPO_LANCAMENTO = LancamentoApropriacao
+
+    def __init__(self, file_path, resolvedor=None, controle_exportacao=None):
+        self._configurar(resolvedor, controle_exportacao)
         self.leitor = LeitorApropriacoes(file_path)
-        self.repo_parametros = RepositorioParametros()
+        self.repo_parametros = repositorio_parametros()
 
     def processar_apropriacoes(self):
-
+        return self._registros(self.processar_apropriacoes_df())
+
+    def processar_apropriacoes_df(self):
+        """
+        Caminho colunar: devolve um DataFrame com as colunas data, debito,
+        credito, valor, cd_historico e historico, que os escritores consomem
+        diretamente.
+        """
         df_apropriacoes = self.leitor.ler_apropriacoes()
 
-        resultado = []
-
-        for _, linha in df_apropriacoes.iterrows():
-            
-            data = linha['DATA']
-            conta_debito = linha['DEBITO']
-            conta_credito = linha['CREDITO']
-            valor = linha['VALOR']
-            cd_historico = linha['CD HIST']
-            historico = linha['HIST']
-
-            resultado.append({
-                "data": data,
-                "debito": conta_debito,
-                "credito": conta_credito,
-                "valor": valor,
-                "cd_historico": cd_historico,
-                "historico": historico,
-            })
-
-        return resultado
\ No newline at end of file
+        return self._processar_df(df_apropriacoes)
+
+    def processar_apropriacoes_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Versão em streaming: lê a aba em blocos e entrega uma lista de
+        lançamentos por bloco, sem manter a planilha inteira em memória.
+        """
+        for df_bloco in self.leitor.ler_apropriacoes_em_blocos(tamanho_bloco):
+            yield self._registros(self._processar_df(df_bloco))
+
+    def iterar_apropriacoes(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Pipeline em fluxo: entrega um lançamento por vez, processando a aba
+        bloco a bloco. Serve de entrada para os escritores, que gravam as
+        linhas conforme chegam (ver src/services/pipeline.py).
+        """
+        for bloco in self.processar_apropriacoes_em_blocos(tamanho_bloco):
+            yield from bloco
+
+    def _processar_df(self, df_apropriacoes):
+        df_apropriacoes = self._filtrar_exportadas(df_apropriacoes)
+        resultado = df_apropriacoes[list(self.COLUNAS)].rename(columns=self.COLUNAS)
+        return self._levar_impressao(resultado.reset_index(drop=True), df_apropriacoes)
@@ -0,0 +1,190 @@
+from collections import Counter
+
+import pandas as pd
+from src.readers.leitor_contas_pagas import LeitorContasPagas
+from src.readers.base_leitor import TAMANHO_BLOCO_PADRAO
+from src.services.base_processador import BaseProcessador
+from src.models.lancamentos import LancamentoContaPaga
+from src.services.controle_exportacao import COLUNA_IMPRESSAO
+from src.services.indice_contas_pagas import IndiceContasPagas, tokenizar, montar_assinatura
+from src.db.repositorios import repositorio_contas_pagas, repositorio_parametros
+from src.db.interfaces import normalizar_texto
+
+class ProcessadorContasPagas(BaseProcessador):
+
+    COLUNAS_IMPRESSAO = ['FORNECEDOR', 'DESCRIÇÃO DO SERVICO', 'VALOR PAGO', 'DATA MOVIMENTO', 'DOCUMENTO']
+    TIPO_LANCAMENTO = LancamentoContaPaga
+
+    def __init__(self, file_path, resolvedor=None, controle_exportacao=None):
+        self._configurar(resolvedor, controle_exportacao)
+        self.leitor = LeitorContasPagas(file_path)
+        self.repo_parametros = repositorio_parametros()
+        self.repo_contas_pagas = repositorio_contas_pagas()
+        self.indice = IndiceContasPagas(self.repo_contas_pagas)
+        # Vínculos aprendidos e aplicações da importação, gravados só em confirmar()
+        self._vinculos_novos = {}
+        self._aplicacoes = Counter()
+
+    def processar_contas_pagas(self):
+        return self._registros(self.processar_contas_pagas_df())
+
+    def processar_contas_pagas_df(self):
+        """
+        Caminho colunar: devolve um DataFrame com as colunas data, valor,
+        conta_despesa, conta_transitoria_pagamento, fornecedor, descricao,
+        documento e assinatura. Os vínculos aprendidos só são gravados
+        quando quem chama confirma a importação (confirmar()).
+        """
+        df_contas_pagas = self.leitor.ler_contas_pagas()
+
+        conta_transitoria_pagamento = self._obter_conta_transitoria_pagamento()
+
+        return self._processar_df(df_contas_pagas, conta_transitoria_pagamento)
+
+    def processar_contas_pagas_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Versão em streaming: lê a aba em blocos e entrega uma lista de
+        lançamentos por bloco, sem manter a planilha inteira em memória.
+        Os vínculos aprendidos valem para os blocos seguintes, mas só são
+        gravados quando quem chama confirma a importação (confirmar()).
+        """
+        conta_transitoria_pagamento = self._obter_conta_transitoria_pagamento()
+
+        for df_bloco in self.leitor.ler_contas_pagas_em_blocos(tamanho_bloco):
+            yield self._registros(self._processar_df(df_bloco, conta_transitoria_pagamento))
+
+    def iterar_contas_pagas(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Pipeline em fluxo: entrega um lançamento por vez, processando a aba
+        bloco a bloco. Serve de entrada para os escritores, que gravam as
+        linhas conforme chegam (ver src/services/pipeline.py).
+        """
+        for bloco in self.processar_contas_pagas_em_blocos(tamanho_bloco):
+            yield from bloco
+
+    def confirmar(self):
+        """
+        Grava de uma vez os vínculos aprendidos e as aplicações de todos os
+        blocos: uma importação descartada (ex.: lote com pendências) não
+        deixa vínculos nem contadores no banco.
+        """
+        if self._vinculos_novos:
+            self.repo_contas_pagas.definir_muitas(self._vinculos_novos)
+            self._vinculos_novos = {}
+        if self._aplicacoes:
+            self.repo_contas_pagas.registrar_aplicacoes(self._aplicacoes)
+            self.repo_contas_pagas.descarregar_aplicacoes()
+            self._aplicacoes = Counter()
+
+    def _obter_conta_transitoria_pagamento(self):
+        return self._obter_parametro("conta_transitoria_pagamento", "Informe a conta contábil para conta transitória de pagamento: ")
+
+    def _processar_df(self, df_contas_pagas, conta_transitoria_pagamento):
+        """
+        Classifica cada pagamento numa conta de despesa.
+        - Se a linha já traz 'CONTA DE DÉBITO', ela é usada e, quando a
+          assinatura ainda não tem vínculo, vira um vínculo novo (origem 'planilha').
+        - Caso contrário a conta vem do índice em memória; os pagamentos sem
+          vínculo são listados juntos e vão ao resolvedor uma vez por assinatura.
+        A classificação é feita só para os pares (fornecedor, descrição)
+        distintos e depois distribuída às linhas com um merge.
+        """
+        df_contas_pagas = self._filtrar_exportadas(df_contas_pagas)
+        self.indice.atualizar()
+
+        fornecedor = df_contas_pagas['FORNECEDOR'].astype("string").str.strip().fillna("")
+        descricao = df_contas_pagas['DESCRIÇÃO DO SERVICO'].astype("string").str.strip().fillna("")
+        conta_informada = df_contas_pagas['CONTA DE DÉBITO'].astype("string").str.split('.', n=1).str[0].str.strip().fillna("")
+        documento = df_contas_pagas['DOCUMENTO'].astype("string").str.split('.', n=1).str[0].str.strip().fillna("")
+
+        linhas = pd.DataFrame({
+            "data": df_contas_pagas['DATA MOVIMENTO'].to_numpy(),
+            "valor": df_contas_pagas['VALOR PAGO'].to_numpy(),
+            "fornecedor": fornecedor.to_numpy(dtype=object),
+            "descricao": descricao.to_numpy(dtype=object),
+            "conta_informada": conta_informada.to_numpy(dtype=object),
+            "documento": documento.to_numpy(dtype=object),
+        })
+        linhas = self._levar_impressao(linhas, df_contas_pagas)
+
+        pares = linhas[["fornecedor", "descricao"]].drop_duplicates().reset_index(drop=True)
+        assinaturas, tokens_pares, contas_classificadas = [], [], []
+        for fornecedor_par, descricao_par in pares.itertuples(index=False):
+            fornecedor_norm = normalizar_texto(fornecedor_par)
+            tokens = tokenizar(descricao_par)
+            vinculo = self.indice.classificar(fornecedor_norm, tokens)
+            assinaturas.append(montar_assinatura(fornecedor_norm, tokens))
+            tokens_pares.append(tokens)
+            contas_classificadas.append(vinculo["conta_despesa"] if vinculo else None)
+        pares["assinatura"] = assinaturas
+        pares["tokens"] = tokens_pares
+        pares["conta_classificada"] = contas_classificadas
+
+        linhas = linhas.merge(pares, how="left", on=["fornecedor", "descricao"], sort=False)
+
+        novos_vinculos = self._aprender_da_planilha(linhas)
+        novos_vinculos.update(self._perguntar_nao_classificados(linhas, novos_vinculos))
+        if novos_vinculos:
+            # O índice já usa os vínculos novos nos próximos blocos; o banco, só em confirmar()
+            for assinatura, valor in novos_vinculos.items():
+                self.indice.registrar({"assinatura": assinatura, **valor})
+            self._vinculos_novos.update(novos_vinculos)
+            contas_novas = {assinatura: valor["conta_despesa"] for assinatura, valor in novos_vinculos.items()}
+            sem_conta = linhas["conta_classificada"].isna()
+            linhas.loc[sem_conta, "conta_classificada"] = linhas.loc[sem_conta, "assinatura"].map(contas_novas)
+
+        informada = linhas["conta_informada"] != ""
+        linhas["conta_despesa"] = linhas["conta_classificada"].where(~informada, linhas["conta_informada"])
+
+        aplicadas = linhas.loc[~informada & linhas["conta_classificada"].notna(), "assinatura"].value_counts()
+        self._aplicacoes.update(aplicadas.to_dict())
+
+        linhas["conta_transitoria_pagamento"] = conta_transitoria_pagamento
+
+        colunas = [
+            "data", "valor", "conta_despesa", "conta_transitoria_pagamento",
+            "fornecedor", "descricao", "documento", "assinatura",
+        ]
+        if COLUNA_IMPRESSAO in linhas.columns:
+            colunas.append(COLUNA_IMPRESSAO)
+        resultado = linhas[colunas]
+        return self.resolvedor.filtrar_resolvidos(resultado, ["conta_despesa", "conta_transitoria_pagamento"])
+
+    def _aprender_da_planilha(self, linhas):
+        informadas = linhas[(linhas["conta_informada"] != "") & linhas["conta_classificada"].isna()]
+        informadas = informadas.drop_duplicates("assinatura")
+
+        return {
+            linha.assinatura: {
+                "conta_despesa": linha.conta_informada,
+                "fornecedor_norm": normalizar_texto(linha.fornecedor),
+                "tokens": list(linha.tokens),
+                "origem": "planilha",
+            }
+            for linha in informadas.itertuples(index=False)
+        }
+
+    def _perguntar_nao_classificados(self, linhas, aprendidos):
+        # Assinaturas aprendidas de outra linha do mesmo bloco já têm conta
+        pendentes = linhas[(linhas["conta_informada"] == "") & linhas["conta_classificada"].isna()
+                           & ~linhas["assinatura"].isin(list(aprendidos))]
+        pendentes = pendentes.drop_duplicates("assinatura")
+        if pendentes.empty:
+            return {}
+
+        contas = self.resolvedor.resolver_vinculos([
+            (linha.assinatura, linha.fornecedor, linha.descricao)
+            for linha in pendentes.itertuples(index=False)
+        ])
+
+        novos = {}
+        for linha in pendentes.itertuples(index=False):
+            if linha.assinatura not in contas:
+                continue
+            novos[linha.assinatura] = {
+                "conta_despesa": contas[linha.assinatura],
+                "fornecedor_norm": normalizar_texto(linha.fornecedor),
+                "tokens": list(linha.tokens),
+                "origem": "manual",
+            }
+        return novos
@@ -1,48 +1,75 @@
 import pandas as pd
 from src.readers.leitor_receitas import LeitorReceitas
-from src.db.repositorio_parametros import RepositorioParametros
-from src.db.repositorio_contas_bancarias import RepositorioContasBancarias
+from src.readers.base_leitor import TAMANHO_BLOCO_PADRAO
+from src.services.base_processador import BaseProcessador
+from src.models.lancamentos import LancamentoReceita
+from src.db.repositorios import repositorio_contas_bancarias, repositorio_parametros
 
-class ProcessadorReceitas:
+class ProcessadorReceitas(BaseProcessador):
 
-    def __init__(self, file_path):
+    COLUNAS_IMPRESSAO = ['DATA PAGAMENTO', 'VALOR PAGO', 'C/C', 'CLIENTE', 'NF']
+    TIPO_LANCAMENTO = LancamentoReceita
+
+    def __init__(self, file_path, resolvedor=None, controle_exportacao=None):
+        self._configurar(resolvedor, controle_exportacao)
         self.leitor = LeitorReceitas(file_path)
-        self.repo_parametros = RepositorioParametros()
-        self.repo_contas_bancarias = RepositorioContasBancarias()
+        self.repo_parametros = repositorio_parametros()
+        self.repo_contas_bancarias = repositorio_contas_bancarias()
 
     def processar_receitas(self):
+        return self._registros(self.processar_receitas_df())
 
+    def processar_receitas_df(self):
+        """
+        Caminho colunar: devolve um DataFrame com as colunas data, valor,
+        numero_conta, conta_contabil_banco, conta_transitoria_recebimento,
+        nf e cliente, que os escritores consomem diretamente.
+        """
         df_receitas = self.leitor.ler_receitas()
 
-        conta_transitoria_recebimento = self.repo_parametros.obter_parametro("conta_transitoria_recebimento")
-        
-        if conta_transitoria_recebimento is None:
-            conta_transitoria_recebimento = input("Informe a conta contábil para conta transitória de recebimento: ")
-            self.repo_parametros.criar_parametro("conta_transitoria_recebimento", conta_transitoria_recebimento)
-
-        resultado = []
-
-        for _, linha in df_receitas.iterrows():
-            
-            numero_conta = linha['C/C']
-
-            conta_contabil_banco = self.repo_contas_bancarias.obter_contas_bancarias(numero_conta)
-
-            nf = str(linha['NF']).split('.')[0] if not pd.isna(linha['NF']) else ""
-            cliente = str(linha['CLIENTE']).strip() if not pd.isna(linha['CLIENTE']) else ""
-            
-            if conta_contabil_banco is None:
-                conta_contabil_banco = input(f"Informe a conta contábil para o banco {numero_conta}: ")
-                self.repo_contas_bancarias.criar_contas_bancarias(numero_conta, conta_contabil_banco)
-
-            resultado.append({
-                "data": linha['DATA PAGAMENTO'],
-                "valor": linha['VALOR PAGO'],
-                "numero_conta": numero_conta,
-                "conta_contabil_banco": conta_contabil_banco,
-                "conta_transitoria_recebimento": conta_transitoria_recebimento,
-                "nf": nf,
-                "cliente": cliente
-            })
-
-        return resultado
\ No newline at end of file
+        conta_transitoria_recebimento = self._obter_conta_transitoria_recebimento()
+
+        return self._processar_df(df_receitas, conta_transitoria_recebimento)
+
+    def processar_receitas_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Versão em streaming: lê a aba em blocos e entrega uma lista de
+        lançamentos por bloco, sem manter a planilha inteira em memória.
+        """
+        conta_transitoria_recebimento = self._obter_conta_transitoria_recebimento()
+
+        for df_bloco in self.leitor.ler_receitas_em_blocos(tamanho_bloco):
+            yield self._registros(self._processar_df(df_bloco, conta_transitoria_recebimento))
+
+    def iterar_receitas(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Pipeline em fluxo: entrega um lançamento por vez, processando a aba
+        bloco a bloco. Serve de entrada para os escritores, que gravam as
+        linhas conforme chegam (ver src/services/pipeline.py).
+        """
+        for bloco in self.processar_receitas_em_blocos(tamanho_bloco):
+            yield from bloco
+
+    def _obter_conta_transitoria_recebimento(self):
+        return self._obter_parametro("conta_transitoria_recebimento", "Informe a conta contábil para conta transitória de recebimento: ")
+
+    def _processar_df(self, df_receitas, conta_transitoria_recebimento):
+        df_receitas = self._filtrar_exportadas(df_receitas)
+
+        # NF costuma vir como float (ex.: 123.0): mantém só a parte inteira
+        nf = df_receitas['NF'].astype("string").str.split('.', n=1).str[0].fillna("")
+        cliente = df_receitas['CLIENTE'].astype("string").str.strip().fillna("")
+
+        resultado = pd.DataFrame({
+            "data": df_receitas['DATA PAGAMENTO'],
+            "valor": df_receitas['VALOR PAGO'],
+            "numero_conta": df_receitas['C/C'],
+        })
+
+        resultado = self._mesclar_contas_bancarias(resultado)
+        resultado = self._levar_impressao(resultado, df_receitas)
+        resultado["conta_transitoria_recebimento"] = conta_transitoria_recebimento
+        resultado["nf"] = nf.to_numpy(dtype=object)
+        resultado["cliente"] = cliente.to_numpy(dtype=object)
+
+        return self.resolvedor.filtrar_resolvidos(resultado, ["conta_contabil_banco", "conta_transitoria_recebimento"])
@@ -1,42 +1,69 @@
+import pandas as pd
 from src.readers.leitor_tarifas import LeitorTarifas
-from src.db.repositorio_parametros import RepositorioParametros
-from src.db.repositorio_contas_bancarias import RepositorioContasBancarias
+from src.readers.base_leitor import TAMANHO_BLOCO_PADRAO
+from src.services.base_processador import BaseProcessador
+from src.models.lancamentos import LancamentoTarifa
+from src.db.repositorios import repositorio_contas_bancarias, repositorio_parametros
 
-class ProcessadorTarifas:
+class ProcessadorTarifas(BaseProcessador):
 
-    def __init__(self, file_path):
+    COLUNAS_IMPRESSAO = ['CONTA', 'DATA', 'VALOR', 'DESCRIÇÃO']
+    TIPO_LANCAMENTO = LancamentoTarifa
+
+    def __init__(self, file_path, resolvedor=None, controle_exportacao=None):
+        self._configurar(resolvedor, controle_exportacao)
         self.leitor = LeitorTarifas(file_path)
-        self.repo_parametros = RepositorioParametros()
-        self.repo_contas_bancarias = RepositorioContasBancarias()
+        self.repo_parametros = repositorio_parametros()
+        self.repo_contas_bancarias = repositorio_contas_bancarias()
 
     def processar_tarifas(self):
+        return self._registros(self.processar_tarifas_df())
 
+    def processar_tarifas_df(self):
+        """
+        Caminho colunar: devolve um DataFrame com as colunas data, valor,
+        numero_conta, conta_contabil_banco e conta_contabil_tarifa, que os
+        escritores consomem diretamente.
+        """
         df_tarifas = self.leitor.ler_tarifas()
 
-        conta_tarifas = self.repo_parametros.obter_parametro("conta_tarifas_bancarias")
-        
-        if conta_tarifas is None:
-            conta_tarifas = input("Informe a conta contábil para tarifas bancárias: ")
-            self.repo_parametros.criar_parametro("conta_tarifas_bancarias", conta_tarifas)
-
-        resultado = []
-
-        for _, linha in df_tarifas.iterrows():
-            
-            numero_conta = linha['CONTA']
-
-            conta_contabil_banco = self.repo_contas_bancarias.obter_contas_bancarias(numero_conta)
-            
-            if conta_contabil_banco is None:
-                conta_contabil_banco = input(f"Informe a conta contábil para o banco {numero_conta}: ")
-                self.repo_contas_bancarias.criar_contas_bancarias(numero_conta, conta_contabil_banco)
-
-            resultado.append({
-                "data": linha['DATA'],
-                "valor": linha['VALOR'],
-                "numero_conta": numero_conta,
-                "conta_contabil_banco": conta_contabil_banco,
-                "conta_contabil_tarifa": conta_tarifas,
-            })
-
-        return resultado
\ No newline at end of file
+        conta_tarifas = self._obter_conta_tarifas()
+
+        return self._processar_df(df_tarifas, conta_tarifas)
+
+    def processar_tarifas_em_blocos(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Versão em streaming: lê a aba em blocos e entrega uma lista de
+        lançamentos por bloco, sem manter a planilha inteira em memória.
+        """
+        conta_tarifas = self._obter_conta_tarifas()
+
+        for df_bloco in self.leitor.ler_tarifas_em_blocos(tamanho_bloco):
+            yield self._registros(self._processar_df(df_bloco, conta_tarifas))
+
+    def iterar_tarifas(self, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Pipeline em fluxo: entrega um lançamento por vez, processando a aba
+        bloco a bloco. Serve de entrada para os escritores, que gravam as
+        linhas conforme chegam (ver src/services/pipeline.py).
+        """
+        for bloco in self.processar_tarifas_em_blocos(tamanho_bloco):
+            yield from bloco
+
+    def _obter_conta_tarifas(self):
+        return self._obter_parametro("conta_tarifas_bancarias", "Informe a conta contábil para tarifas bancárias: ")
+
+    def _processar_df(self, df_tarifas, conta_tarifas):
+        df_tarifas = self._filtrar_exportadas(df_tarifas)
+
+        resultado = pd.DataFrame({
+            "data": df_tarifas['DATA'],
+            "valor": df_tarifas['VALOR'],
+            "numero_conta": df_tarifas['CONTA'],
+        })
+
+        resultado = self._mesclar_contas_bancarias(resultado)
+        resultado = self._levar_impressao(resultado, df_tarifas)
+        resultado["conta_contabil_tarifa"] = conta_tarifas
+
+        return self.resolvedor.filtrar_resolvidos(resultado, ["conta_contabil_banco", "conta_contabil_tarifa"])
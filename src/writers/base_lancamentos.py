@@ -0,0 +1,177 @@
+from itertools import islice
+from string import Formatter
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentacao import medir
+
+# Quantidade de linhas formatadas e gravadas de uma só vez
+LINHAS_POR_BLOCO = 50_000
+
+
+def df_lancamentos(lancamentos) -> pd.DataFrame:
+    """DataFrame de uma lista de registros (src/models/lancamentos.py) ou de dicts."""
+    if lancamentos and hasattr(lancamentos[0], "_fields"):
+        # from_records não usa os nomes dos campos de tuplas nomeadas
+        return pd.DataFrame.from_records(lancamentos, columns=lancamentos[0]._fields)
+    return pd.DataFrame.from_records(lancamentos)
+
+
+def blocos_df(lancamentos, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """Divide um DataFrame ou uma lista/gerador de lançamentos em DataFrames de até linhas_por_bloco linhas."""
+    if isinstance(lancamentos, pd.DataFrame):
+        for inicio in range(0, len(lancamentos), linhas_por_bloco):
+            yield lancamentos.iloc[inicio:inicio + linhas_por_bloco]
+        return
+
+    iterador = iter(lancamentos)
+    while True:
+        bloco = list(islice(iterador, linhas_por_bloco))
+        if not bloco:
+            return
+        yield df_lancamentos(bloco)
+
+
+class BaseLancamentosContabeis:
+    """
+    Motor comum dos arquivos de lançamentos do Domínio.
+
+    Cada linha tem o layout
+        data;debito;credito;valor;codigo_historico;historico;;;;
+    e cada escritor só declara de onde vem cada campo:
+    - coluna_debito / coluna_credito / coluna_cd_historico: nome da coluna
+      do lançamento (None deixa o campo vazio);
+    - modelo_historico: texto no formato str.format com nomes de colunas,
+      ex.: "Referente Tarifa bancária - Conta {numero_conta}".
+
+    A formatação é feita por coluna inteira (datas, valores com vírgula
+    decimal, histórico em maiúsculas) e o arquivo é gravado em blocos
+    grandes, codificados em cp1252 de uma vez.
+    formatar_valor_historico permite especializar como uma coluna aparece
+    no histórico.
+
+    No modo consolidado (src/services/consolidacao.py) as linhas são
+    somadas por data, débito, crédito, código do histórico e
+    colunas_consolidacao; se o modelo_historico usar colunas fora do
+    agrupamento, as linhas consolidadas usam modelo_historico_consolidado.
+    """
+
+    coluna_data = "data"
+    coluna_debito = None
+    coluna_credito = None
+    coluna_valor = "valor"
+    coluna_cd_historico = None
+    modelo_historico = ""
+    colunas_consolidacao = ()
+    modelo_historico_consolidado = None
+
+    def __init__(self):
+        self.encoding = 'cp1252'
+
+    @medir("escrita.formatar_df")
+    def formatar_df(self, df) -> pd.Series:
+        """
+        Formata todas as linhas do DataFrame de uma vez. Cada campo é
+        formatado só sobre os valores distintos da coluna (datas, contas e
+        históricos se repetem muito) e depois expandido para as linhas; a
+        montagem final é uma única passada de interpolação.
+        """
+        literais_historico, colunas_historico = self._partes_historico()
+
+        campos = [
+            self._por_distintos(df[self.coluna_data], self._formatar_data),
+            self._formatar_texto(df, self.coluna_debito),
+            self._formatar_texto(df, self.coluna_credito),
+            self._por_distintos(df[self.coluna_valor], self._formatar_valor),
+            self._formatar_texto(df, self.coluna_cd_historico),
+        ]
+        for coluna in colunas_historico:
+            campos.append(self._por_distintos(
+                df[coluna], lambda valor, coluna=coluna: self.formatar_valor_historico(coluna, valor).upper()))
+
+        # Os trechos fixos do histórico entram direto no modelo da linha
+        modelo = "%s;%s;%s;%s;%s;" + "%s".join(
+            literal.upper().replace("%", "%%") for literal in literais_historico) + ";;;;"
+
+        linhas = [modelo % valores for valores in zip(*campos)]
+        return pd.Series(linhas, index=df.index, dtype=object)
+
+    def formatar_valor_historico(self, coluna, valor) -> str:
+        """Texto de um valor dentro do histórico; subclasses podem especializar por coluna."""
+        return _texto(valor)
+
+    def colunas_historico(self, modelo: str = None) -> list:
+        """Colunas usadas pelo modelo de histórico (padrão: modelo_historico)."""
+        return self._partes_historico(modelo)[1]
+
+    def formatar_linha(self, lancamento):
+        return self.formatar_df(df_lancamentos([lancamento])).iloc[0]
+
+    @medir("escrita.salvar_txt", contar_linhas=lambda linhas: linhas)
+    def salvar_txt(self, lancamentos, caminho_arquivo, linhas_por_bloco: int = LINHAS_POR_BLOCO) -> int:
+        """
+        Aceita DataFrame, lista/gerador de lançamentos (dicts ou registros)
+        e grava em blocos de linhas_por_bloco linhas. Cada bloco é enviado
+        ao disco assim que formatado, então um gerador tem suas primeiras
+        linhas gravadas antes de ser consumido por inteiro.
+        Retorna a quantidade de linhas gravadas.
+        """
+        return self._gravar(blocos_df(lancamentos, linhas_por_bloco), caminho_arquivo)
+
+    @medir("escrita.salvar_txt_em_blocos", contar_linhas=lambda linhas: linhas)
+    def salvar_txt_em_blocos(self, blocos, caminho_arquivo) -> int:
+        """
+        Consome os blocos de lançamentos à medida que são gerados
+        (ex.: processar_*_em_blocos), gravando cada um assim que chega e
+        sem acumular a lista completa.
+        """
+        return self._gravar(
+            (bloco if isinstance(bloco, pd.DataFrame) else df_lancamentos(bloco) for bloco in blocos),
+            caminho_arquivo)
+
+    def _gravar(self, blocos, caminho_arquivo):
+        total = 0
+        with open(caminho_arquivo, 'a', encoding=self.encoding, buffering=1 << 20) as arquivo:
+            for bloco in blocos:
+                if bloco.empty:
+                    continue
+                linhas = self.formatar_df(bloco)
+                arquivo.write("\n".join(linhas.tolist()) + "\n")
+                arquivo.flush()
+                total += len(linhas)
+        return total
+
+    def _partes_historico(self, modelo: str = None):
+        """
+        Separa modelo_historico em trechos fixos e colunas:
+        "NF {nf} {cliente}" -> (["NF ", " ", ""], ["nf", "cliente"]).
+        """
+        literais, colunas = [""], []
+        for literal, coluna, _, _ in Formatter().parse(self.modelo_historico if modelo is None else modelo):
+            literais[-1] += literal
+            if coluna is not None:
+                colunas.append(coluna)
+                literais.append("")
+        return literais, colunas
+
+    def _por_distintos(self, coluna, formatar):
+        codigos, distintos = pd.factorize(coluna, use_na_sentinel=False)
+        formatados = np.array([formatar(valor) for valor in distintos], dtype=object)
+        return formatados[codigos]
+
+    def _formatar_data(self, data):
+        return data.strftime("%d/%m/%Y")
+
+    def _formatar_valor(self, valor):
+        return f"{valor:.2f}".replace('.', ',')
+
+    def _formatar_texto(self, df, coluna):
+        if coluna is None:
+            return np.full(len(df), "", dtype=object)
+        return self._por_distintos(df[coluna], _texto)
+
+
+def _texto(valor) -> str:
+    # Célula vazia (None, NaN, pd.NA) fica vazia no arquivo, não 'nan' ou '<NA>'
+    return "" if pd.isna(valor) else str(valor)
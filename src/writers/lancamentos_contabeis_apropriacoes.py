@@ -1,27 +1,10 @@
-import datetime
+from src.writers.base_lancamentos import BaseLancamentosContabeis
 
 
-class LancamentosContabeisApropriacoes:
+class LancamentosContabeisApropriacoes(BaseLancamentosContabeis):
 
-    def __init__(self):
-        self.encoding = 'cp1252'
-
-    def formatar_linha(self, lancamento):
-
-        data = lancamento['data'].strftime("%d/%m/%Y")
-
-        valor_formatado = f"{lancamento['valor']:.2f}".replace('.', ',')
-
-        conta_debito = lancamento['debito']
-        conta_credito = lancamento['credito']
-        codigo_historico = lancamento['cd_historico']
-        descricao = lancamento['historico'].upper()
-
-        linha = f"{data};{conta_debito};{conta_credito};{valor_formatado};{codigo_historico};{descricao};;;;"
-        return linha
-
-    def salvar_txt(self, lancamentos, caminho_arquivo):
-        with open(caminho_arquivo, 'a', encoding=self.encoding) as arquivo:
-            for lancamento in lancamentos:
-                linha_formatada = self.formatar_linha(lancamento)
-                arquivo.write(linha_formatada + "\n")
+    coluna_debito = 'debito'
+    coluna_credito = 'credito'
+    coluna_cd_historico = 'cd_historico'
+    modelo_historico = "{historico}"
+    colunas_consolidacao = ('historico',)
@@ -0,0 +1,16 @@
+from src.writers.base_lancamentos import BaseLancamentosContabeis
+
+
+class LancamentosContabeisContasPagas(BaseLancamentosContabeis):
+
+    coluna_debito = 'conta_despesa'
+    coluna_credito = 'conta_transitoria_pagamento'
+    modelo_historico = "Referente Pagamento {descricao} - {fornecedor}{documento}"
+    colunas_consolidacao = ('fornecedor',)
+    modelo_historico_consolidado = "Referente Pagamentos - {fornecedor}"
+
+    def formatar_valor_historico(self, coluna, valor):
+        # O número do documento só entra no histórico quando foi informado
+        if coluna == 'documento':
+            return f" Doc {valor}" if valor else ""
+        return super().formatar_valor_historico(coluna, valor)
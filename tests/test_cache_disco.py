@@ -0,0 +1,97 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.readers import esquemas
+from src.readers.cache_disco import VARIAVEL_SEM_CACHE, CacheDisco, cache_disco
+from src.readers.esquemas import NUMERO, TEXTO, Esquema
+from src.readers.leitor_tarifas import LeitorTarifas
+
+
+@pytest.fixture(autouse=True)
+def com_cache(monkeypatch):
+    monkeypatch.delenv(VARIAVEL_SEM_CACHE, raising=False)
+
+
+class _Carga:
+    """carregar() que conta as leituras de verdade."""
+
+    def __init__(self, valor=1):
+        self.valor = valor
+        self.chamadas = 0
+
+    def __call__(self):
+        self.chamadas += 1
+        return pd.DataFrame({"VALOR": [self.valor]})
+
+
+def _arquivo(tmp_path, nome, conteudo=b"planilha"):
+    caminho = tmp_path / nome
+    caminho.write_bytes(conteudo)
+    return str(caminho)
+
+
+def test_chave_pelo_conteudo_e_pela_versao(tmp_path):
+    cache = CacheDisco(str(tmp_path / "cache"))
+    carga = _Carga()
+    original = _arquivo(tmp_path, "a.xlsx")
+
+    cache.obter_df(original, "Tarifas", 1, carga)
+    # Mesmo conteúdo em outro caminho: vem do cache
+    assert cache.obter_df(_arquivo(tmp_path, "copia.xlsx"), "Tarifas", 1, carga)["VALOR"].tolist() == [1]
+    assert carga.chamadas == 1
+
+    cache.obter_df(_arquivo(tmp_path, "a.xlsx", b"planilha alterada"), "Tarifas", 1, carga)
+    assert carga.chamadas == 2
+    cache.obter_df(original, "Tarifas", 2, carga)
+    assert carga.chamadas == 3
+
+
+def test_variavel_de_ambiente_ignora_o_cache(tmp_path, monkeypatch):
+    cache = CacheDisco(str(tmp_path / "cache"))
+    carga = _Carga()
+    planilha = _arquivo(tmp_path, "a.xlsx")
+    monkeypatch.setenv(VARIAVEL_SEM_CACHE, "1")
+
+    cache.obter_df(planilha, "Tarifas", 1, carga)
+    assert list(cache.obter_blocos(planilha, "Tarifas", 1, 10, lambda: iter([carga()])))[0]["VALOR"].tolist() == [1]
+    cache.obter_df(planilha, "Tarifas", 1, carga)
+
+    assert carga.chamadas == 3
+    assert not os.path.exists(cache.pasta)
+
+
+def test_limite_descarta_as_entradas_usadas_ha_mais_tempo(tmp_path):
+    cache = CacheDisco(str(tmp_path / "cache"))
+    planilhas = [_arquivo(tmp_path, f"{indice}.xlsx", bytes([indice])) for indice in range(3)]
+    cache.obter_df(planilhas[0], "Tarifas", 1, _Carga(0))
+    (antiga, _, tamanho), = cache._entradas()
+    os.utime(antiga, (1, 1))
+    cache.obter_df(planilhas[1], "Tarifas", 1, _Carga(1))
+
+    # Cabem duas entradas: a terceira tira a usada há mais tempo
+    cache.limite_bytes = 2 * tamanho
+    cache.obter_df(planilhas[2], "Tarifas", 1, _Carga(2))
+
+    restantes = [caminho for caminho, _, _ in cache._entradas()]
+    assert len(restantes) == 2 and antiga not in restantes
+
+
+def test_mudanca_no_esquema_da_aba_nao_usa_o_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_disco, "pasta", str(tmp_path / "cache"))
+    leitor = LeitorTarifas(_arquivo(tmp_path, "a.xlsx"))
+    carga = _Carga()
+
+    leitor.ler_limpo(carga)
+    leitor.ler_limpo(carga)
+    assert carga.chamadas == 1
+
+    monkeypatch.setitem(esquemas.ESQUEMAS, leitor.aba, Esquema(
+        leitor.aba, {"CONTA": TEXTO, "DATA": TEXTO, "VALOR": NUMERO, "DESCRIÇÃO": TEXTO}))
+    leitor.ler_limpo(carga)
+    assert carga.chamadas == 2
+
+    monkeypatch.setattr(LeitorTarifas, "versao", LeitorTarifas.versao + 1)
+    leitor.ler_limpo(carga)
+    assert carga.chamadas == 3
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import pytest
+
+from src.db import repositorios_memoria
+from src.db.repositorios import VARIAVEL_BANCO, repositorio_contas_pagas, repositorio_parametros
+from src.readers.cache_disco import VARIAVEL_SEM_CACHE
+from src.services import consolidacao
+from src.services.pipeline import importar_em_lote
+
+LINHAS = [
+    "ACME;ENERGIA ELETRICA;0,10;01/09/2025;;1",
+    "ACME;ENERGIA ELETRICA;0,20;01/09/2025;;2",
+    "BETA;AGUA;10,05;01/09/2025;;3",
+    "ACME;ENERGIA ELETRICA;1234,56;02/09/2025;;4",
+    "ACME;ENERGIA ELETRICA;0,30;01/09/2025;;5",
+    "BETA;AGUA;0,01;01/09/2025;;6",
+]
+
+
+@pytest.fixture(autouse=True)
+def banco_memoria(monkeypatch):
+    monkeypatch.setenv(VARIAVEL_BANCO, "memoria")
+    monkeypatch.setenv(VARIAVEL_SEM_CACHE, "1")
+    repositorios_memoria.limpar_memoria()
+    repositorio_parametros().definir_parametro("conta_transitoria_pagamento", "600")
+    repositorio_contas_pagas().definir_muitas({
+        "ACME|ELETRICA ENERGIA": {"conta_despesa": "401", "fornecedor_norm": "ACME", "tokens": ["ENERGIA", "ELETRICA"]},
+        "BETA|AGUA": {"conta_despesa": "402", "fornecedor_norm": "BETA", "tokens": ["AGUA"]},
+    })
+    yield
+    repositorios_memoria.limpar_memoria()
+
+
+def _planilha(tmp_path):
+    caminho = tmp_path / "contas_pagas.csv"
+    cabecalho = "FORNECEDOR;DESCRIÇÃO DO SERVICO;VALOR PAGO;DATA MOVIMENTO;CONTA DE DÉBITO;DOCUMENTO"
+    caminho.write_text("\n".join([cabecalho] + LINHAS) + "\n", encoding="utf-8")
+    return str(caminho)
+
+
+def _importar(tmp_path, nome, consolidar):
+    saida = tmp_path / nome
+    resultado = importar_em_lote("contas_pagas", _planilha(tmp_path), str(saida), tamanho_bloco=2,
+                                 consolidar=consolidar)
+    assert resultado["gravado"]
+    return saida.read_text(encoding="cp1252").splitlines()
+
+
+def _total(linhas):
+    return sum(Decimal(linha.split(";")[3].replace(",", ".")) for linha in linhas)
+
+
+def test_total_consolidado_igual_ao_detalhado(tmp_path):
+    detalhadas = _importar(tmp_path, "detalhado.txt", None)
+    consolidadas = _importar(tmp_path, "consolidado.txt", [])
+
+    assert len(detalhadas) == 6
+    assert _total(consolidadas) == _total(detalhadas) == Decimal("1245.22")
+    # O histórico por documento não vale para linhas somadas: usa o modelo consolidado
+    assert consolidadas == [
+        "01/09/2025;401;600;0,60;;REFERENTE PAGAMENTOS - ACME;;;;",
+        "01/09/2025;402;600;10,06;;REFERENTE PAGAMENTOS - BETA;;;;",
+        "02/09/2025;401;600;1234,56;;REFERENTE PAGAMENTOS - ACME;;;;",
+    ]
+
+
+def test_conferencia_recusa_soma_adulterada(tmp_path, monkeypatch):
+    agrupar = consolidacao._agrupar
+
+    def agrupar_adulterado(df, chaves):
+        agrupado = agrupar(df, chaves)
+        agrupado.loc[0, "centavos"] += 1
+        return agrupado
+
+    monkeypatch.setattr(consolidacao, "_agrupar", agrupar_adulterado)
+    saida = tmp_path / "consolidado.txt"
+
+    with pytest.raises(ValueError, match="difere do total de origem"):
+        importar_em_lote("contas_pagas", _planilha(tmp_path), str(saida), consolidar=[])
+    assert not saida.exists()
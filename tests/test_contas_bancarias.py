@@ -0,0 +1,84 @@
+import mongomock
+import pytest
+
+from src.db import repositorios_memoria
+from src.db.repositorio_contas_bancarias import RepositorioContasBancarias
+from src.db.repositorios import VARIAVEL_BANCO, repositorio_contas_bancarias, repositorio_parametros
+from src.readers.cache_disco import VARIAVEL_SEM_CACHE
+from src.services.pendencias import ResolvedorInterativo
+from src.services.pipeline import importar
+
+
+class _ColecaoContada:
+    """Coleção do mongomock que conta as consultas find."""
+
+    def __init__(self, colecao):
+        self.colecao = colecao
+        self.consultas = []
+
+    def find(self, filtro, *args, **kwargs):
+        self.consultas.append(filtro)
+        return self.colecao.find(filtro, *args, **kwargs)
+
+    def __getattr__(self, nome):
+        return getattr(self.colecao, nome)
+
+
+class _ResolvedorContado(ResolvedorInterativo):
+    """Como o do menu, mas responde sozinho e anota cada pergunta."""
+
+    def __init__(self):
+        self.perguntas = []
+
+    def resolver_contas_bancarias(self, faltantes, repo_contas_bancarias):
+        self.perguntas.append(list(faltantes))
+        contas = {numero: "1.1.9" for numero in faltantes}
+        for numero, conta in contas.items():
+            repo_contas_bancarias.criar_contas_bancarias(numero, conta)
+        return contas
+
+
+def test_muitas_contas_numa_consulta_e_nao_cadastradas_em_cache():
+    repositorio = RepositorioContasBancarias()
+    colecao = _ColecaoContada(mongomock.MongoClient().db.contas_bancarias)
+    repositorio._collection = colecao
+    colecao.insert_one({"numero_conta": "0001", "conta_contabil_banco": "1.1.1"})
+
+    assert repositorio.obter_muitas_contas_bancarias(["0001", "9999", "0001"]) == {"0001": "1.1.1"}
+    assert colecao.consultas == [{"numero_conta": {"$in": ["0001", "9999"]}}]
+
+    # A não cadastrada fica em cache como None: não volta ao banco
+    colecao.insert_one({"numero_conta": "9999", "conta_contabil_banco": "1.1.2"})
+    assert repositorio.obter_muitas_contas_bancarias(["9999", "0001"]) == {"0001": "1.1.1"}
+    assert len(colecao.consultas) == 1
+
+
+@pytest.fixture
+def banco_memoria(monkeypatch):
+    monkeypatch.setenv(VARIAVEL_BANCO, "memoria")
+    monkeypatch.setenv(VARIAVEL_SEM_CACHE, "1")
+    repositorios_memoria.limpar_memoria()
+    repositorio_parametros().definir_parametro("conta_tarifas_bancarias", "3.1.1")
+    repositorio_contas_bancarias().definir_contas_bancarias("0001", "1.1.1")
+    yield
+    repositorios_memoria.limpar_memoria()
+
+
+def test_conta_nao_cadastrada_vai_ao_resolvedor_uma_vez(tmp_path, banco_memoria):
+    planilha = tmp_path / "tarifas.csv"
+    planilha.write_text("\n".join([
+        "CONTA;DATA;VALOR;DESCRIÇÃO",
+        "0001;01/09/2025;1,50;TARIFA",
+        "9999;01/09/2025;2,00;TARIFA",
+        "9999;02/09/2025;3,00;TARIFA",
+        "9999;03/09/2025;4,00;TARIFA",
+    ]) + "\n", encoding="utf-8")
+    resolvedor = _ResolvedorContado()
+    saida = tmp_path / "saida.txt"
+
+    linhas = importar("tarifas", str(planilha), str(saida), tamanho_bloco=2, resolvedor=resolvedor)
+
+    assert resolvedor.perguntas == [["9999"]]
+    assert linhas == 4
+    creditos = [linha.split(";")[2] for linha in saida.read_text(encoding="cp1252").splitlines()]
+    assert creditos == ["1.1.1", "1.1.9", "1.1.9", "1.1.9"]
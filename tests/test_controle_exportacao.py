@@ -0,0 +1,49 @@
+import pandas as pd
+
+from src.db.repositorios_memoria import RepositorioExportacoesMemoria, limpar_memoria
+from src.services.controle_exportacao import ControleExportacao
+
+COLUNAS = ["CONTA", "DATA", "VALOR"]
+
+
+def _bloco(valores):
+    return pd.DataFrame({
+        "CONTA": ["0001-1"] * len(valores),
+        "DATA": pd.to_datetime(["2025-09-01"] * len(valores)),
+        "VALOR": valores,
+    })
+
+
+def _impressao_da_primeira_linha(bloco):
+    limpar_memoria()
+    controle = ControleExportacao("cliente", "tarifas", RepositorioExportacoesMemoria())
+    return controle.calcular_impressoes(bloco, COLUNAS).iloc[0]
+
+
+def test_impressao_nao_depende_do_dtype_do_bloco():
+    so_inteiros = _bloco([9, 20])
+    com_decimais = _bloco([9, 10.5])
+    como_texto = _bloco(["9", "10,5"])
+
+    assert so_inteiros["VALOR"].dtype == "int64" and com_decimais["VALOR"].dtype == "float64"
+    impressao = _impressao_da_primeira_linha(so_inteiros)
+    assert _impressao_da_primeira_linha(com_decimais) == impressao
+    assert _impressao_da_primeira_linha(como_texto) == impressao
+
+
+def test_ocorrencias_continuam_entre_blocos_e_recomecam_ao_confirmar():
+    limpar_memoria()
+    repo = RepositorioExportacoesMemoria()
+    controle = ControleExportacao("cliente", "tarifas", repo)
+    primeiro = controle.calcular_impressoes(_bloco([9]), COLUNAS).iloc[0]
+    segundo = controle.calcular_impressoes(_bloco([9]), COLUNAS).iloc[0]
+    assert primeiro != segundo
+
+    controle.anotar(primeiro)
+    controle.anotar(segundo)
+    controle.confirmar()
+    assert controle._ocorrencias == {}
+    # Próximo arquivo: a mesma linha volta a ser a 1ª ocorrência, já exportada
+    assert controle.filtrar_novas(_bloco([9, 9, 9]), COLUNAS)["VALOR"].tolist() == [9]
+    assert controle.ignoradas == 2
+    limpar_memoria()
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from src.readers.esquemas import obter_esquema
+from src.readers.formatos import _dialeto_csv, ler_csv, ler_csv_em_blocos
+
+ESQUEMA = obter_esquema("Tarifas bancárias")
+
+
+def _csv(tmp_path, separador, valores):
+    linhas = [separador.join(["CONTA", "DATA", "VALOR", "DESCRIÇÃO"])]
+    linhas += [separador.join(["123", f"0{dia}/09/2025", valor, "TARIFA"]) for dia, valor in enumerate(valores, 1)]
+    caminho = tmp_path / "tarifas.csv"
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return caminho
+
+
+@pytest.mark.parametrize("separador, valores, decimal, esperados", [
+    (";", ["10.50", "1234.5", "7"], ".", [10.5, 1234.5, 7.0]),
+    ("\t", ["10.50", "1234.5", "7"], ".", [10.5, 1234.5, 7.0]),
+    (";", ["10,50", "1.234,5", "7"], ",", [10.5, 1234.5, 7.0]),
+    (",", ["10.50", "1234.5", "7"], ".", [10.5, 1234.5, 7.0]),
+])
+def test_separador_decimal_pelos_numeros_da_amostra(tmp_path, separador, valores, decimal, esperados):
+    caminho = _csv(tmp_path, separador, valores)
+
+    assert _dialeto_csv(caminho, ESQUEMA)["decimal"] == decimal
+    assert ler_csv(caminho, ESQUEMA)["VALOR"].tolist() == pytest.approx(esperados)
+    blocos = pd.concat(list(ler_csv_em_blocos(caminho, 2, ESQUEMA)))
+    assert blocos["VALOR"].tolist() == pytest.approx(esperados)
+
+
+def test_ponto_de_milhar_so_com_virgula_decimal_na_amostra(tmp_path):
+    assert _dialeto_csv(_csv(tmp_path, ";", ["10.50", "3"]), ESQUEMA)["milhar"] is None
+    assert _dialeto_csv(_csv(tmp_path, ";", ["1.234,50", "3"]), ESQUEMA)["milhar"] == "."
+
+
+def test_coluna_com_virgula_e_ponto_decimal(tmp_path):
+    caminho = _csv(tmp_path, ";", ["1.234,56", "10,50", "2,25", "10.50"])
+    esperados = [1234.56, 10.5, 2.25, 10.5]
+
+    assert ler_csv(caminho, ESQUEMA)["VALOR"].tolist() == pytest.approx(esperados)
+    blocos = pd.concat(list(ler_csv_em_blocos(caminho, 2, ESQUEMA)))
+    assert blocos["VALOR"].tolist() == pytest.approx(esperados)
+
+
+def test_texto_convertido_mantem_vazios():
+    df = pd.DataFrame({"CONTA": [123, 5], "DATA": pd.to_datetime(["2025-09-01"] * 2),
+                       "VALOR": [1.0, 2.0], "DESCRIÇÃO": pd.Series([None, 7], dtype=object)})
+
+    convertido = ESQUEMA.converter(df)
+
+    assert convertido["CONTA"].tolist() == ["123", "5"]
+    assert convertido["DESCRIÇÃO"].isna().tolist() == [True, False]
+    assert convertido["DESCRIÇÃO"].tolist()[1] == "7"
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from src.db import repositorios_memoria
+from src.db.repositorios import VARIAVEL_BANCO
+from src.readers.cache_disco import VARIAVEL_SEM_CACHE
+from src.services.pipeline import importar_em_lote
+
+
+@pytest.fixture(autouse=True)
+def banco_memoria(monkeypatch):
+    monkeypatch.setenv(VARIAVEL_BANCO, "memoria")
+    monkeypatch.setenv(VARIAVEL_SEM_CACHE, "1")
+    repositorios_memoria.limpar_memoria()
+    yield
+    repositorios_memoria.limpar_memoria()
+
+
+def _planilha(tmp_path, linhas):
+    from openpyxl import Workbook
+
+    planilha = Workbook()
+    aba = planilha.active
+    aba.title = "Apropriação"
+    aba.append(["DATA", "DEBITO", "CREDITO", "VALOR", "CD HIST", "HIST"])
+    for linha in linhas:
+        aba.append(linha)
+    caminho = tmp_path / "apropriacoes.xlsx"
+    planilha.save(caminho)
+    return str(caminho)
+
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 10])
+def test_codigo_vazio_e_numerico_no_txt(tmp_path, tamanho_bloco):
+    planilha = _planilha(tmp_path, [
+        [datetime(2025, 9, 1), 5, 10, 100.5, None, "ALUGUEL"],
+        [datetime(2025, 9, 2), 6, 10, 20, 7, None],
+    ])
+    saida = tmp_path / "saida.txt"
+
+    resultado = importar_em_lote("apropriacoes", planilha, str(saida), tamanho_bloco=tamanho_bloco)
+
+    assert resultado["gravado"]
+    assert saida.read_text(encoding="cp1252").splitlines() == [
+        "01/09/2025;5;10;100,50;;ALUGUEL;;;;",
+        "02/09/2025;6;10;20,00;7;;;;;",
+    ]
@@ -0,0 +1,94 @@
+import pytest
+
+from src.db import repositorios_memoria
+from src.db.repositorios import VARIAVEL_BANCO, repositorio_contas_pagas, repositorio_parametros
+from src.readers.cache_disco import VARIAVEL_SEM_CACHE
+from src.services.pendencias import ResolvedorLote
+from src.services.pipeline import importar_em_lote
+from src.services.processador_contas_pagas import ProcessadorContasPagas
+
+CABECALHO = "FORNECEDOR;DESCRIÇÃO DO SERVICO;VALOR PAGO;DATA MOVIMENTO;CONTA DE DÉBITO;DOCUMENTO"
+
+
+@pytest.fixture(autouse=True)
+def banco_memoria(monkeypatch):
+    monkeypatch.setenv(VARIAVEL_BANCO, "memoria")
+    monkeypatch.setenv(VARIAVEL_SEM_CACHE, "1")
+    repositorios_memoria.limpar_memoria()
+    repositorio_parametros().definir_parametro("conta_transitoria_pagamento", "600")
+    yield
+    repositorios_memoria.limpar_memoria()
+
+
+@pytest.fixture
+def gravacoes(monkeypatch):
+    chamadas = []
+    original = repositorios_memoria.RepositorioContasPagasMemoria.definir_muitas
+
+    def definir_muitas(self, itens):
+        chamadas.append(dict(itens))
+        return original(self, itens)
+
+    monkeypatch.setattr(repositorios_memoria.RepositorioContasPagasMemoria, "definir_muitas", definir_muitas)
+    return chamadas
+
+
+def _planilha(tmp_path, linhas):
+    caminho = tmp_path / "contas_pagas.csv"
+    caminho.write_text("\n".join([CABECALHO] + linhas) + "\n", encoding="utf-8")
+    return str(caminho)
+
+
+def test_vinculos_e_aplicacoes_gravados_uma_vez_ao_confirmar(tmp_path, gravacoes):
+    planilha = _planilha(tmp_path, [
+        "ACME;ENERGIA ELETRICA;10,00;01/09/2025;401;1",
+        "ACME;ENERGIA ELETRICA;30,00;03/09/2025;;2",
+        "BETA;AGUA;20,00;02/09/2025;402;3",
+        "ACME;ENERGIA ELETRICA;40,00;04/09/2025;;4",
+        "BETA;AGUA;50,00;05/09/2025;;5",
+    ])
+
+    resultado = importar_em_lote("contas_pagas", planilha, str(tmp_path / "saida.txt"), tamanho_bloco=2)
+
+    assert resultado["gravado"] and resultado["linhas"] == 5
+    # Os vínculos aprendidos em cada bloco classificam os seguintes e vão ao banco de uma vez
+    assert len(gravacoes) == 1
+    vinculos = {v["assinatura"]: v for v in repositorio_contas_pagas().carregar_vinculos()}
+    assert {v["conta_despesa"] for v in vinculos.values()} == {"401", "402"}
+    aplicacoes = {chave: repositorio_contas_pagas().obter_contas_pagas(chave)["stats"]["aplicacoes"]
+                  for chave in vinculos}
+    assert sorted(aplicacoes.values()) == [1, 2]
+
+
+def test_importacao_descartada_nao_grava_vinculos(tmp_path, gravacoes):
+    planilha = _planilha(tmp_path, [
+        "ACME;ENERGIA ELETRICA;10,00;01/09/2025;401;1",
+        "ACME;ENERGIA ELETRICA;30,00;03/09/2025;;2",
+        "DESCONHECIDO;SERVICO;50,00;05/09/2025;;3",
+    ])
+
+    resultado = importar_em_lote("contas_pagas", planilha, str(tmp_path / "saida.txt"), tamanho_bloco=2)
+
+    assert not resultado["gravado"]
+    assert resultado["pendencias"]["vinculos_contas_pagas"]
+    assert gravacoes == []
+    assert repositorio_contas_pagas().carregar_vinculos() == []
+
+
+def test_caminho_colunar_so_grava_vinculos_ao_confirmar(tmp_path, gravacoes):
+    planilha = _planilha(tmp_path, [
+        "ACME;ENERGIA ELETRICA;10,00;01/09/2025;401;1",
+        "ACME;ENERGIA ELETRICA;30,00;03/09/2025;;2",
+    ])
+    processador = ProcessadorContasPagas(planilha, ResolvedorLote())
+
+    resultado = processador.processar_contas_pagas_df()
+
+    assert resultado["conta_despesa"].tolist() == ["401", "401"]
+    # Descartada (quem chama não confirma), a importação não deixa nada no banco
+    assert gravacoes == []
+    assert repositorio_contas_pagas().carregar_vinculos() == []
+
+    processador.confirmar()
+    assert len(gravacoes) == 1
+    assert [v["conta_despesa"] for v in repositorio_contas_pagas().carregar_vinculos()] == ["401"]
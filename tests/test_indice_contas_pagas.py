@@ -0,0 +1,30 @@
+from src.db import repositorios_memoria
+from src.db.repositorios_memoria import RepositorioContasPagasMemoria
+from src.services.indice_contas_pagas import IndiceContasPagas
+
+
+def _vinculo(fornecedor, tokens, conta):
+    return {"conta_despesa": conta, "fornecedor_norm": fornecedor, "tokens": tokens, "origem": "teste"}
+
+
+def test_recarga_incremental_percebe_vinculo_excluido():
+    repositorios_memoria.limpar_memoria()
+    repo = RepositorioContasPagasMemoria()
+    repo.definir_muitas({
+        "ACME|ENERGIA": _vinculo("ACME", ["ENERGIA"], "401"),
+        "BETA|AGUA": _vinculo("BETA", ["AGUA"], "402"),
+    })
+    indice = IndiceContasPagas(repo)
+    indice.atualizar()
+    # Aprendido na importação, ainda não gravado
+    indice.registrar({"assinatura": "GAMA|GAS", "fornecedor_norm": "GAMA", "tokens": ["GAS"],
+                      "conta_despesa": "403"})
+    assert indice.classificar("ACME", ["ENERGIA"])["conta_despesa"] == "401"
+
+    del repo.vinculos["ACME|ENERGIA"]
+    indice.atualizar()
+
+    assert indice.classificar("ACME", ["ENERGIA"]) is None
+    assert indice.classificar("BETA", ["AGUA"])["conta_despesa"] == "402"
+    assert indice.classificar("GAMA", ["GAS"])["conta_despesa"] == "403"
+    repositorios_memoria.limpar_memoria()
@@ -0,0 +1,48 @@
+from src.db.indices import CONSULTAS_CRITICAS, verificar_planos
+
+PLANO_INDICE = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "uq_assinatura"}}
+PLANO_VARREDURA = {"stage": "COLLSCAN"}
+
+
+class _Cursor:
+    def __init__(self, plano):
+        self.plano = plano
+
+    def explain(self):
+        return {"queryPlanner": {"winningPlan": self.plano}}
+
+
+class _Colecao:
+    def __init__(self, nome, varridas):
+        self.nome = nome
+        self.varridas = varridas
+
+    def find(self, filtro):
+        return _Cursor(PLANO_VARREDURA if (self.nome, str(filtro)) in self.varridas else PLANO_INDICE)
+
+
+class _Banco:
+    """Só o find().explain() que verificar_planos usa, com planos prontos."""
+
+    def __init__(self, varridas=()):
+        self.varridas = set(varridas)
+
+    def __getitem__(self, nome):
+        return _Colecao(nome, self.varridas)
+
+
+def test_todas_as_consultas_criticas_sao_verificadas():
+    planos = verificar_planos(_Banco())
+
+    assert len(planos) == sum(len(consultas) for consultas in CONSULTAS_CRITICAS.values())
+    assert all(plano["usa_indice"] for plano in planos)
+    assert planos[0]["estagios"] == ["FETCH", "IXSCAN"]
+
+
+def test_varredura_da_colecao_e_apontada():
+    filtro = CONSULTAS_CRITICAS["contas_pagas"][0]
+    planos = verificar_planos(_Banco(varridas=[("contas_pagas", str(filtro))]))
+
+    varridas = [plano for plano in planos if not plano["usa_indice"]]
+    assert [(plano["colecao"], plano["filtro"]) for plano in varridas] == [("contas_pagas", filtro)]
+    assert varridas[0]["estagios"] == ["COLLSCAN"]
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from src.instrumentacao import instrumentacao, medir
+from src.models.lancamentos import LancamentoContaPaga
+
+
+def _lancamento(valor):
+    return LancamentoContaPaga(*([None] * len(LancamentoContaPaga._fields)))._replace(valor=valor)
+
+
+def test_gerador_conta_um_registro_por_lancamento_e_len_dos_blocos():
+    @medir("teste.registros")
+    def registros():
+        for valor in range(6):
+            yield _lancamento(valor)
+
+    @medir("teste.blocos")
+    def blocos():
+        yield [_lancamento(1), _lancamento(2)]
+        yield pd.DataFrame({"valor": [1, 2, 3]})
+
+    instrumentacao.ativar()
+    try:
+        assert len(list(registros())) == 6
+        assert len(list(blocos())) == 2
+        etapas = instrumentacao.relatorio()["etapas"]
+    finally:
+        instrumentacao.desativar()
+
+    assert etapas["teste.registros"]["linhas"] == 6
+    assert etapas["teste.blocos"]["linhas"] == 5
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import mongomock
+import pytest
+
+from src.db.repositorio_contas_pagas import RepositorioContasPagas
+
+
+@pytest.fixture
+def repositorio():
+    repositorio = RepositorioContasPagas()
+    repositorio._collection = mongomock.MongoClient().db.contas_pagas
+    fornecedores = ["BETA", None, "ALFA", None, "GAMA", "ALFA", None, "BETA", None]
+    for indice, fornecedor in enumerate(fornecedores):
+        valor = {"conta_despesa": "400"}
+        if fornecedor is not None:
+            valor["fornecedor_norm"] = fornecedor
+        repositorio.criar_contas_pagas(f"F{indice}|SERVICO", valor)
+    # Campo ausente ordena junto com os nulos
+    repositorio.collection.update_one({"assinatura": "F8|SERVICO"}, {"$unset": {"fornecedor_norm": ""}})
+    return repositorio
+
+
+def _todas_as_paginas(repositorio, **opcoes):
+    assinaturas, continuacao = [], None
+    while True:
+        pagina = repositorio.paginar_contas_pagas(limit=2, continuacao=continuacao, **opcoes)
+        assinaturas += [item["assinatura"] for item in pagina["items"]]
+        continuacao = pagina["proximo"]
+        if continuacao is None:
+            return assinaturas
+
+
+@pytest.mark.parametrize("descendente", [False, True])
+def test_paginacao_com_nulos_entrega_todos_os_documentos_na_ordem(repositorio, descendente):
+    esperado = [documento["assinatura"] for documento in repositorio.collection.find().sort(
+        [("fornecedor_norm", -1 if descendente else 1), ("_id", -1 if descendente else 1)])]
+
+    obtido = _todas_as_paginas(repositorio, ordenar_por="fornecedor_norm", descendente=descendente)
+
+    assert obtido == esperado
+    assert len(obtido) == 9
+
+
+def test_termo_filtra_por_prefixo_normalizado(repositorio):
+    assert _todas_as_paginas(repositorio, termo=" alfá") == ["F2|SERVICO", "F5|SERVICO"]
+    assert _todas_as_paginas(repositorio, termo="F1|") == ["F1|SERVICO"]
+    # Palavras no meio do texto ficam para buscar_contas_pagas
+    assert _todas_as_paginas(repositorio, termo="LFA") == []
+
+
+def test_listar_contas_pagas_esta_obsoleto(repositorio):
+    with pytest.deprecated_call():
+        assert len(repositorio.listar_contas_pagas(limit=3)) == 3
+
+
+def test_total_em_cache_acompanha_escritas_de_outros_processos(repositorio):
+    assert repositorio.paginar_contas_pagas(limit=2, retornar_total=True)["total"] == 9
+
+    # Gravações em lote deste processo esvaziam o cache
+    repositorio.definir_muitas({"NOVO|SERVICO": {"conta_despesa": "401"}})
+    assert repositorio.paginar_contas_pagas(limit=2, retornar_total=True)["total"] == 10
+
+    # As de outro processo não passam por este repositório: a marca da coleção muda
+    repositorio.collection.insert_one({"assinatura": "OUTRO|SERVICO", "updated_at": datetime.utcnow()})
+    assert repositorio.paginar_contas_pagas(limit=2, retornar_total=True)["total"] == 11
+    repositorio.collection.delete_one({"assinatura": "F0|SERVICO"})
+    assert repositorio.paginar_contas_pagas(limit=2, retornar_total=True)["total"] == 10
@@ -0,0 +1,28 @@
+import pytest
+
+from src.db.interfaces import BaseGestaoContasPagas, BaseRepositorioContasPagas
+from src.db.repositorios import VARIAVEL_BANCO, repositorio_gestao_contas_pagas
+from src.db.repositorio_contas_pagas import RepositorioContasPagas
+
+
+def test_interface_incompleta_nao_instancia():
+    class SoLeitura(BaseRepositorioContasPagas):
+        def obter_contas_pagas(self, chave):
+            return None
+
+    with pytest.raises(TypeError):
+        SoLeitura()
+
+
+@pytest.mark.parametrize("banco", ["sqlite", "memoria"])
+def test_gestao_recusa_banco_sem_suporte(monkeypatch, tmp_path, banco):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(VARIAVEL_BANCO, banco)
+    with pytest.raises(ValueError, match="gestão de contas pagas"):
+        repositorio_gestao_contas_pagas()
+
+
+def test_gestao_no_mongo(monkeypatch):
+    monkeypatch.setenv(VARIAVEL_BANCO, "mongo")
+    assert isinstance(repositorio_gestao_contas_pagas(), RepositorioContasPagas)
+    assert issubclass(RepositorioContasPagas, BaseGestaoContasPagas)